@@ -1,13 +1,34 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from sagetrade.utils.logging import log_event
+
+
+# evaluator(params, fraction) -> score (higher is better); `fraction` in (0, 1]
+# is the share of the backtest history the candidate is evaluated on.
+Evaluator = Callable[[Dict[str, Any], float], float]
 
 
 @dataclass
 class OptimizationRequest:
     strategy_name: str
     params: Dict[str, Any]
+    # {param: (low, high)} ranges or {param: [choices]}; None echoes `params`.
+    search_space: Optional[Dict[str, Any]] = None
+    symbols: List[str] = field(default_factory=list)
+    market_dir: str = "data/market"
+    day: Optional[str] = None
+    window: int = 20
+    initial_equity: float = 10_000.0
+    n_candidates: int = 27
+    eta: int = 3  # keep the top 1/eta candidates at each rung
+    min_fraction: float = 1.0 / 9.0  # history share used at the first rung
+    seed: Optional[int] = None
 
 
 @dataclass
@@ -15,19 +36,136 @@ class OptimizationResult:
     strategy_name: str
     suggested_params: Dict[str, Any]
     notes: str = ""
+    score: Optional[float] = None
+    evaluations: int = 0
+    evals_per_sec: float = 0.0
+    history: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _rung_fractions(min_fraction: float, eta: int) -> List[float]:
+    fractions: List[float] = []
+    f = min(1.0, max(min_fraction, 1e-6))
+    while f < 1.0:
+        fractions.append(f)
+        f *= eta
+    fractions.append(1.0)
+    return fractions
+
+
+def build_backtest_evaluator(request: OptimizationRequest) -> Evaluator:
+    """Default evaluator: Sharpe of a `VectorBacktestEngine` run over a history prefix.
+
+    Signals for each symbol are prepared once; every evaluation reuses them
+    and only simulates trades over the first `fraction` of the bars.
+    """
+    from sagetrade.backtest.data_loader import load_jsonl
+    from sagetrade.backtest.report import compute_metrics
+    from sagetrade.backtest.universe import resolve_market_paths
+    from sagetrade.backtest.vector_engine import BarArrays, VectorBacktestEngine
+
+    engine = VectorBacktestEngine(window=request.window, initial_equity=request.initial_equity)
+    paths = resolve_market_paths(request.symbols, request.market_dir, request.day)
+    if not paths:
+        raise ValueError(f"No market data found for symbols {request.symbols} under {request.market_dir}")
+    prepared = [engine.prepare(BarArrays.from_bars(sym, load_jsonl(p, limit=None))) for sym, p in paths.items()]
+
+    def evaluate(params: Dict[str, Any], fraction: float) -> float:
+        trades = []
+        for prep in prepared:
+            n = max(1, int(math.ceil(len(prep.bars) * fraction)))
+            trades.extend(engine.run_prepared(prep.head(n), {request.strategy_name: params}).trades)
+        trades.sort(key=lambda t: t.exit_time)
+        return float(compute_metrics(trades, request.initial_equity)["sharpe"])
+
+    return evaluate
 
 
 class AIOptimizer:
-    """Placeholder for AI-assisted hyperparameter optimization."""
+    """Budget-aware hyperparameter search using random sampling + successive halving.
+
+    `n_candidates` parameter sets are sampled from the search space and
+    scored on a short slice of history. Only the best 1/eta survive to the
+    next rung, which uses an eta-times longer slice, until the survivors are
+    scored on the full history. Poor candidates are therefore discarded
+    after cheap evaluations instead of full backtests.
+    """
+
+    def __init__(self, evaluator_factory: Optional[Callable[[OptimizationRequest], Evaluator]] = None) -> None:
+        self._evaluator_factory = evaluator_factory or build_backtest_evaluator
 
     def propose(self, request: OptimizationRequest) -> OptimizationResult:
-        # Stub: in the future, this can call an AI service and/or run backtests.
+        if not request.search_space:
+            return OptimizationResult(
+                strategy_name=request.strategy_name,
+                suggested_params=request.params,
+                notes="No search_space given; parameters are echoed unchanged.",
+            )
+
+        from sagetrade.backtest.param_search import sample_param_combinations
+
+        rng = random.Random(request.seed)
+        candidates = [
+            {**request.params, **combo}
+            for combo in sample_param_combinations(request.search_space, max(1, request.n_candidates), rng)
+        ]
+        evaluate = self._evaluator_factory(request)
+        eta = max(2, request.eta)
+
+        history: List[Dict[str, Any]] = []
+        evaluations = 0
+        started = time.perf_counter()
+        best_params: Dict[str, Any] = candidates[0]
+        best_score = -math.inf
+        scored: List[tuple] = []
+
+        for rung, fraction in enumerate(_rung_fractions(request.min_fraction, eta)):
+            scored = []
+            for params in candidates:
+                score = evaluate(params, fraction)
+                if score != score:  # NaN
+                    score = -math.inf
+                evaluations += 1
+                scored.append((score, params))
+                history.append({"rung": rung, "fraction": fraction, "score": score, "params": params})
+            scored.sort(key=lambda sp: sp[0], reverse=True)
+            best_score, best_params = scored[0]
+
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            log_event(
+                "optimizer_rung_finished",
+                strategy=request.strategy_name,
+                rung=rung,
+                fraction=fraction,
+                candidates=len(candidates),
+                evaluations=evaluations,
+                evals_per_sec=evaluations / elapsed,
+                best_so_far=best_score,
+            )
+
+            if fraction >= 1.0:
+                break
+            keep = max(1, len(candidates) // eta)
+            candidates = [p for _, p in scored[:keep]]
+
+        elapsed = max(time.perf_counter() - started, 1e-9)
         return OptimizationResult(
             strategy_name=request.strategy_name,
-            suggested_params=request.params,
-            notes="AIOptimizer is a stub; parameters are echoed unchanged.",
+            suggested_params=best_params,
+            notes=(
+                f"Successive halving over {request.n_candidates} sampled candidates "
+                f"(eta={eta}); best full-history Sharpe={best_score:.4f}."
+            ),
+            score=best_score,
+            evaluations=evaluations,
+            evals_per_sec=evaluations / elapsed,
+            history=history,
         )
 
 
-__all__ = ["OptimizationRequest", "OptimizationResult", "AIOptimizer"]
-
+__all__ = [
+    "AIOptimizer",
+    "Evaluator",
+    "OptimizationRequest",
+    "OptimizationResult",
+    "build_backtest_evaluator",
+]
@@ -6,6 +6,8 @@ from typing import Iterable, List
 import json
 import pandas as pd
 
+from sagetrade.utils.jsonl import tail_jsonl
+
 
 def load_jsonl(path: str | Path, limit: int | None = None) -> List[dict]:
     """Load JSONL file into list of dicts (optionally trimmed to last N)."""
@@ -13,6 +15,8 @@ def load_jsonl(path: str | Path, limit: int | None = None) -> List[dict]:
     p = Path(path)
     if not p.exists():
         return rows
+    if limit is not None and limit > 0:
+        return tail_jsonl(p, limit)
     with p.open("r", encoding="utf-8") as f:
         for line in f:
             line = line.strip()
@@ -22,8 +26,6 @@ def load_jsonl(path: str | Path, limit: int | None = None) -> List[dict]:
                 rows.append(json.loads(line))
             except Exception:
                 continue
-    if limit is not None and limit > 0:
-        return rows[-limit:]
     return rows
 
 
@@ -1,7 +1,21 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import random
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from itertools import product
-from typing import Dict, List
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from sagetrade.backtest.data_loader import load_jsonl
+from sagetrade.backtest.report import compute_metrics
+from sagetrade.backtest.universe import resolve_market_paths
+from sagetrade.utils.logging import log_event
 
 
 def generate_param_combinations(param_grid: Dict[str, List]) -> List[Dict[str, object]]:
@@ -14,5 +28,247 @@ def generate_param_combinations(param_grid: Dict[str, List]) -> List[Dict[str, o
     return combos
 
 
-__all__ = ["generate_param_combinations"]
+def sample_param_combinations(
+    param_space: Dict[str, Any],
+    n_samples: int,
+    rng: Optional[random.Random] = None,
+) -> List[Dict[str, object]]:
+    """Draw random combinations from a parameter space.
+
+    A tuple `(low, high)` is a range (uniform for floats, inclusive randint
+    for ints); a list is a set of discrete choices.
+    """
+    rng = rng or random.Random()
+    combos: List[Dict[str, object]] = []
+    for _ in range(n_samples):
+        combo: Dict[str, object] = {}
+        for name, spec in param_space.items():
+            if isinstance(spec, tuple) and len(spec) == 2:
+                low, high = spec
+                if isinstance(low, int) and isinstance(high, int) and not isinstance(low, bool):
+                    combo[name] = rng.randint(low, high)
+                else:
+                    combo[name] = rng.uniform(float(low), float(high))
+            else:
+                combo[name] = rng.choice(list(spec))
+        combos.append(combo)
+    return combos
+
+
+RANK_COLUMNS = ["sharpe", "return_pct", "max_drawdown"]
+
+# Per-process LRU of precomputed signals, keyed like the checkpoint rows:
+# (symbol, resolved path, size, mtime_ns, window) -> PreparedSignals. Every
+# combination a worker evaluates for a symbol reuses the same arrays, and a
+# file that has grown or been rewritten is prepared again.
+_PREPARED_CACHE: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+_PREPARED_CACHE_SIZE = 64
+
+
+def _file_fingerprint(symbol: str, path: str) -> List[object]:
+    """[symbol, resolved path, size, mtime_ns] of one input file."""
+    try:
+        st = os.stat(path)
+        size, mtime = st.st_size, st.st_mtime_ns
+    except OSError:
+        size, mtime = -1, -1
+    return [symbol, os.path.abspath(path), size, mtime]
+
+
+def _data_fingerprint(paths: Sequence[Tuple[str, str]]) -> List[List[object]]:
+    """Fingerprint of every input file, so new or rewritten data changes the key."""
+    return [_file_fingerprint(symbol, path) for symbol, path in sorted(paths)]
+
+
+def _combo_key(
+    strategy_name: str,
+    combo: Dict[str, object],
+    data: Sequence[Sequence[object]],
+    window: int,
+    initial_equity: float,
+) -> str:
+    payload = {
+        "strategy": strategy_name,
+        "params": combo,
+        "data": [list(d) for d in data],
+        "window": window,
+        "initial_equity": initial_equity,
+    }
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _prepared_for(symbol: str, path: str, window: int, initial_equity: float):
+    from sagetrade.backtest.vector_engine import BarArrays, VectorBacktestEngine
+
+    key = (*_file_fingerprint(symbol, path), window)
+    prepared = _PREPARED_CACHE.get(key)
+    if prepared is not None:
+        _PREPARED_CACHE.move_to_end(key)
+        return prepared
+    engine = VectorBacktestEngine(window=window, initial_equity=initial_equity)
+    prepared = engine.prepare(BarArrays.from_bars(symbol, load_jsonl(path, limit=None)))
+    _PREPARED_CACHE[key] = prepared
+    while len(_PREPARED_CACHE) > _PREPARED_CACHE_SIZE:
+        _PREPARED_CACHE.popitem(last=False)
+    return prepared
+
+
+def _evaluate_combos(
+    strategy_name: str,
+    combos: List[Tuple[str, Dict[str, object]]],
+    paths: List[Tuple[str, str]],
+    window: int,
+    initial_equity: float,
+) -> List[Dict[str, Any]]:
+    """Worker entry point: run every (key, combo) over all symbols and return metric rows."""
+    from sagetrade.backtest.vector_engine import VectorBacktestEngine
+
+    engine = VectorBacktestEngine(window=window, initial_equity=initial_equity)
+    rows: List[Dict[str, Any]] = []
+    for key, combo in combos:
+        trades = []
+        for symbol, path in paths:
+            prepared = _prepared_for(symbol, path, window, initial_equity)
+            if len(prepared.bars) == 0:
+                continue
+            trades.extend(engine.run_prepared(prepared, {strategy_name: combo}).trades)
+        trades.sort(key=lambda t: t.exit_time)
+        metrics = compute_metrics(trades, initial_equity)
+        row: Dict[str, Any] = {"key": key, "strategy": strategy_name, "params": json.dumps(combo, sort_keys=True, default=str)}
+        row.update(combo)
+        row.update({k: float(v) for k, v in metrics.items()})
+        row["trades"] = len(trades)
+        rows.append(row)
+    return rows
+
+
+def _load_checkpoint(path: Path) -> Dict[str, Dict[str, Any]]:
+    done: Dict[str, Dict[str, Any]] = {}
+    for row in load_jsonl(path, limit=None):
+        key = row.get("key")
+        if key:
+            done[str(key)] = row
+    return done
+
+
+def _write_table(df: pd.DataFrame, out_path: Path) -> None:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if out_path.suffix == ".parquet":
+        df.to_parquet(out_path, index=False)
+    else:
+        df.to_csv(out_path, index=False)
+
+
+def rank_results(df: pd.DataFrame) -> pd.DataFrame:
+    """Sort sweep results by Sharpe, then return, then (lower) drawdown, and add a 1-based rank."""
+    if df.empty:
+        return df
+    ranked = df.sort_values(RANK_COLUMNS, ascending=[False, False, True]).reset_index(drop=True)
+    ranked.insert(0, "rank", range(1, len(ranked) + 1))
+    return ranked
+
+
+def run_param_search_for_strategy(
+    strategy_name: str,
+    param_grid: Dict[str, List],
+    symbols: Sequence[str],
+    *,
+    market_dir: str | Path = "data/market",
+    day: Optional[str] = None,
+    initial_equity: float = 10_000.0,
+    window: int = 20,
+    out_path: str | Path = "reports/optimize/param_search.csv",
+    max_workers: Optional[int] = None,
+    chunk_size: int = 16,
+) -> pd.DataFrame:
+    """Backtest every combination of `param_grid` for one strategy and rank the results.
+
+    Combinations are evaluated with `VectorBacktestEngine` in chunks fanned
+    out over a `ProcessPoolExecutor`; each worker precomputes indicator
+    arrays once per symbol and reuses them for every combination it runs.
+
+    Finished rows are appended to `<out_path>.partial.jsonl` as they arrive.
+    A re-run with the same strategy/window and the same input files (path,
+    size and mtime) skips combinations already in that file, so an
+    interrupted sweep resumes where it stopped. The ranked table is written
+    to `out_path` (Parquet for `.parquet`, else CSV).
+    """
+    from sagetrade.backtest.runner import _build_strategies
+
+    combos = generate_param_combinations(param_grid)
+    if not combos:
+        raise ValueError("Empty parameter grid.")
+    # Fail fast on unknown strategies / parameter names.
+    if not _build_strategies({strategy_name: combos[0]}):
+        raise ValueError(f"Strategy does not support parameter sweeps: {strategy_name}")
+
+    paths = [(sym, str(p)) for sym, p in resolve_market_paths(symbols, market_dir, day).items()]
+    if not paths:
+        raise ValueError(f"No market data found for symbols {list(symbols)} under {market_dir}")
+
+    out_path = Path(out_path)
+    checkpoint = out_path.with_name(out_path.name + ".partial.jsonl")
+    done = _load_checkpoint(checkpoint)
+    data = _data_fingerprint(paths)
+
+    pending: List[Tuple[str, Dict[str, object]]] = []
+    rows: List[Dict[str, Any]] = []
+    for combo in combos:
+        key = _combo_key(strategy_name, combo, data, window, initial_equity)
+        if key in done:
+            rows.append(done[key])
+        else:
+            pending.append((key, combo))
+
+    workers = max_workers or os.cpu_count() or 1
+    log_event(
+        "param_search_started",
+        strategy=strategy_name,
+        combos=len(combos),
+        resumed=len(rows),
+        symbols=len(paths),
+        workers=workers,
+    )
+
+    chunks = [pending[i : i + chunk_size] for i in range(0, len(pending), max(1, chunk_size))]
+    checkpoint.parent.mkdir(parents=True, exist_ok=True)
+    with checkpoint.open("a", encoding="utf-8") as ckpt:
+
+        def _record(new_rows: List[Dict[str, Any]]) -> None:
+            for row in new_rows:
+                ckpt.write(json.dumps(row, default=str) + "\n")
+            ckpt.flush()
+            rows.extend(new_rows)
+
+        if workers <= 1:
+            for chunk in chunks:
+                _record(_evaluate_combos(strategy_name, chunk, paths, window, initial_equity))
+        elif chunks:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_evaluate_combos, strategy_name, chunk, paths, window, initial_equity)
+                    for chunk in chunks
+                ]
+                for fut in as_completed(futures):
+                    _record(fut.result())
+
+    ranked = rank_results(pd.DataFrame(rows).drop(columns=["key"], errors="ignore"))
+    _write_table(ranked, out_path)
+
+    log_event(
+        "param_search_finished",
+        strategy=strategy_name,
+        combos=len(ranked),
+        out_path=str(out_path),
+        best_sharpe=float(ranked.iloc[0]["sharpe"]) if not ranked.empty else 0.0,
+    )
+    return ranked
+
 
+__all__ = [
+    "generate_param_combinations",
+    "rank_results",
+    "run_param_search_for_strategy",
+    "sample_param_combinations",
+]
@@ -10,6 +10,7 @@ from sagetrade.signals.aggregator import aggregate
 from sagetrade.signals.nlp import get_signals as get_nlp_signals
 from sagetrade.signals.quant import get_signals_from_bars
 from sagetrade.strategy.registry import StrategyManager
+from sagetrade.utils.clock import SimulatedClock
 from sagetrade.utils.logging import log_event
 from sagetrade.utils.metrics import get_registry
 
@@ -100,6 +101,8 @@ def run_single_symbol_backtest(
     - On each bar (after warm-up window), computes quant + composite signals.
     - Feeds signals into StrategyManager -> RiskManager -> PaperBroker.
     - Closes positions when TP/SL hit on bar close.
+    - Broker and risk run on a `SimulatedClock` set to each bar's ts, so
+      opened_at/closed_at and trade durations are in data time.
     """
     if not bars:
         raise ValueError("No market bars provided.")
@@ -118,8 +121,9 @@ def run_single_symbol_backtest(
 
     nlp_sig = get_nlp_signals("market", news_items)
     manager = StrategyManager()
-    risk = RiskManager()
-    broker = PaperBroker(initial_balance=risk.cfg.initial_equity, account_id=f"backtest-{symbol}")
+    clock = SimulatedClock(float(bars_sorted[0].get("ts", 0.0)))
+    risk = RiskManager(clock=clock)
+    broker = PaperBroker(initial_balance=risk.cfg.initial_equity, account_id=f"backtest-{symbol}", clock=clock)
 
     equity_curve: List[Tuple[float, float]] = []
     trades: List[TradeLog] = []
@@ -129,6 +133,7 @@ def run_single_symbol_backtest(
     last_price: float = float(bars_sorted[-1]["c"])
 
     for bar in bars_sorted:
+        clock.set(float(bar.get("ts", 0.0)))
         window_bars.append(bar)
         if len(window_bars) < window:
             continue
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from sagetrade.backtest.data_loader import load_jsonl
+from sagetrade.backtest.report import compute_equity_curve, compute_metrics, summarize_by_strategy, summarize_by_symbol
+from sagetrade.backtest.trade_log import BacktestTradeRecord, TradeLog
+from sagetrade.utils.logging import log_event
+
+
+@dataclass
+class UniverseBacktestResult:
+    """Merged output of a multi-symbol backtest."""
+
+    trade_log: TradeLog
+    per_symbol: Dict[str, TradeLog]
+    equity_curve: pd.DataFrame
+    metrics: Dict[str, float]
+    metrics_by_symbol: Dict[str, Dict[str, float]]
+    by_strategy: pd.DataFrame
+    by_symbol: pd.DataFrame
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def resolve_market_paths(
+    symbols: Sequence[str],
+    market_dir: str | Path = "data/market",
+    day: Optional[str] = None,
+) -> Dict[str, Path]:
+    """Map each symbol to its JSONL file for `day` (default: latest day dir).
+
+    Symbols without a file are left out.
+    """
+    base = Path(market_dir)
+    if day is not None:
+        day_dir = base / day
+    else:
+        day_dirs = sorted(p for p in base.glob("*") if p.is_dir())
+        if not day_dirs:
+            return {}
+        day_dir = day_dirs[-1]
+    paths: Dict[str, Path] = {}
+    for sym in symbols:
+        p = day_dir / f"{sym}.jsonl"
+        if p.exists():
+            paths[sym] = p
+    return paths
+
+
+def _backtest_shard(
+    shard: List[Tuple[str, str]],
+    text_file: Optional[str],
+    initial_equity: float,
+    window: int,
+    strategy_params: Optional[Dict[str, Dict[str, Any]]],
+    engine: str,
+) -> Dict[str, Tuple[List[BacktestTradeRecord], Optional[str]]]:
+    """Worker entry point: load bars from disk and backtest each symbol in the shard.
+
+    Only file paths cross the process boundary; bars are read here.
+    Returns {symbol: (trades, error_message_or_None)}.
+    """
+    from sagetrade.backtest.runner import run_backtest
+
+    news_items = load_jsonl(text_file, limit=None) if text_file else []
+    vector_engine = None
+    if engine == "vector":
+        from sagetrade.backtest.vector_engine import VectorBacktestEngine
+
+        vector_engine = VectorBacktestEngine(window=window, initial_equity=initial_equity)
+
+    out: Dict[str, Tuple[List[BacktestTradeRecord], Optional[str]]] = {}
+    for symbol, path in shard:
+        try:
+            bars = load_jsonl(path, limit=None)
+            if not bars:
+                out[symbol] = ([], f"no bars at {path}")
+                continue
+            if vector_engine is not None:
+                log = vector_engine.run(symbol, bars, news_items, strategy_params=strategy_params)
+            else:
+                log = run_backtest(
+                    symbol,
+                    bars,
+                    news_items,
+                    initial_equity=initial_equity,
+                    window=window,
+                    strategy_params=strategy_params,
+                )
+            out[symbol] = (log.trades, None)
+        except Exception as exc:
+            out[symbol] = ([], f"{type(exc).__name__}: {exc}")
+    return out
+
+
+def _shard(items: List[Tuple[str, str]], n_shards: int) -> List[List[Tuple[str, str]]]:
+    n_shards = max(1, min(n_shards, len(items)))
+    return [items[i::n_shards] for i in range(n_shards)]
+
+
+def run_universe_backtest(
+    symbols: Sequence[str],
+    *,
+    market_dir: str | Path = "data/market",
+    day: Optional[str] = None,
+    text_file: Optional[str] = None,
+    initial_equity: float = 10_000.0,
+    window: int = 20,
+    strategy_params: Optional[Dict[str, Dict[str, Any]]] = None,
+    engine: str = "loop",
+    max_workers: Optional[int] = None,
+) -> UniverseBacktestResult:
+    """Backtest many symbols in parallel and merge the results.
+
+    Symbols are split into shards (a few per worker, to balance uneven file
+    sizes) and run in a `ProcessPoolExecutor`. Each worker receives file
+    paths only and reads its own bars. `max_workers=1` runs in-process.
+
+    engine: "loop" (`run_backtest`) or "vector" (`VectorBacktestEngine`).
+    """
+    if engine not in ("loop", "vector"):
+        raise ValueError(f"Unknown backtest engine: {engine}")
+
+    paths = resolve_market_paths(symbols, market_dir, day)
+    errors: Dict[str, str] = {s: "market file not found" for s in symbols if s not in paths}
+    items = [(sym, str(p)) for sym, p in paths.items()]
+
+    workers = max_workers or os.cpu_count() or 1
+    log_event(
+        "universe_backtest_started",
+        symbols=len(symbols),
+        with_data=len(items),
+        workers=workers,
+        engine=engine,
+    )
+
+    results: Dict[str, Tuple[List[BacktestTradeRecord], Optional[str]]] = {}
+    if items:
+        args = (text_file, initial_equity, window, strategy_params, engine)
+        if workers <= 1:
+            results.update(_backtest_shard(items, *args))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_backtest_shard, shard, *args) for shard in _shard(items, workers * 4)]
+                for fut in as_completed(futures):
+                    results.update(fut.result())
+
+    per_symbol: Dict[str, TradeLog] = {}
+    merged = TradeLog()
+    all_trades: List[BacktestTradeRecord] = []
+    for sym in symbols:
+        if sym not in results:
+            continue
+        trades, err = results[sym]
+        if err:
+            errors[sym] = err
+        log = TradeLog()
+        for t in trades:
+            log.add_trade(t)
+        per_symbol[sym] = log
+        all_trades.extend(trades)
+
+    all_trades.sort(key=lambda t: t.exit_time)
+    for t in all_trades:
+        merged.add_trade(t)
+
+    result = UniverseBacktestResult(
+        trade_log=merged,
+        per_symbol=per_symbol,
+        equity_curve=compute_equity_curve(merged.trades, initial_equity),
+        metrics=compute_metrics(merged.trades, initial_equity),
+        metrics_by_symbol={sym: compute_metrics(log.trades, initial_equity) for sym, log in per_symbol.items()},
+        by_strategy=summarize_by_strategy(merged.trades),
+        by_symbol=summarize_by_symbol(merged.trades),
+        errors=errors,
+    )
+
+    log_event(
+        "universe_backtest_finished",
+        symbols=len(per_symbol),
+        trades=len(merged.trades),
+        errors=len(errors),
+    )
+    return result
+
+
+__all__ = ["UniverseBacktestResult", "resolve_market_paths", "run_universe_backtest"]
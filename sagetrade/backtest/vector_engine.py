@@ -0,0 +1,518 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except Exception as exc:  # pragma: no cover - import guard
+    raise ImportError("numpy package not installed. `pip install numpy`.") from exc
+
+from sagetrade.backtest.runner import _build_strategies
+from sagetrade.backtest.trade_log import BacktestTradeRecord, TradeLog
+from sagetrade.brokers.backtest import BacktestBroker
+from sagetrade.risk.manager import RiskManager
+from sagetrade.signals.aggregator import CompositeSignal
+from sagetrade.signals.aggregator_vector import (
+    DIR_FLAT,
+    DIR_LONG,
+    DIR_SHORT,
+    DIRECTION_LABELS,
+    CompositeWeights,
+    composite_scores,
+)
+from sagetrade.signals.nlp import NLPSignals
+from sagetrade.signals.nlp_news import compute_nlp_news_signals
+from sagetrade.signals.quant_vector import (
+    REGIME_HIGH_VOL,
+    REGIME_LABELS,
+    REGIME_LOW_VOL,
+    REGIME_NORMAL,
+    IndicatorFrame,
+    compute_indicator_frame,
+)
+from sagetrade.signals.social import SocialSignals, compute_social_signals
+from sagetrade.strategy.base import Strategy
+from sagetrade.strategy.registry import StrategyManager
+from sagetrade.utils.config import get_settings
+from sagetrade.utils.logging import log_event
+
+
+@dataclass
+class BarArrays:
+    """Columnar OHLC data for one symbol, sorted by timestamp."""
+
+    symbol: str
+    ts: np.ndarray
+    closes: np.ndarray
+    highs: np.ndarray
+    lows: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.closes.shape[0])
+
+    def head(self, n: int) -> "BarArrays":
+        return BarArrays(
+            symbol=self.symbol,
+            ts=self.ts[:n],
+            closes=self.closes[:n],
+            highs=self.highs[:n],
+            lows=self.lows[:n],
+        )
+
+    @classmethod
+    def from_columns(cls, symbol: str, cols: Any) -> "BarArrays":
+        """Wrap `storage.columnar.BarColumns` (already ts-ordered) without copying."""
+        return cls(symbol=symbol, ts=cols.ts, closes=cols.c, highs=cols.h, lows=cols.l)
+
+    @classmethod
+    def from_bars(cls, symbol: str, bars: Sequence[dict]) -> "BarArrays":
+        ts = np.fromiter((float(b.get("ts", b.get("timestamp", 0.0))) for b in bars), dtype=np.float64, count=len(bars))
+        closes = np.fromiter((float(b["c"]) for b in bars), dtype=np.float64, count=len(bars))
+        highs = np.fromiter((float(b.get("h", b["c"])) for b in bars), dtype=np.float64, count=len(bars))
+        lows = np.fromiter((float(b.get("l", b["c"])) for b in bars), dtype=np.float64, count=len(bars))
+        order = np.argsort(ts, kind="stable")
+        return cls(symbol=symbol, ts=ts[order], closes=closes[order], highs=highs[order], lows=lows[order])
+
+
+@dataclass
+class PreparedSignals:
+    """Indicator and composite-score columns shared by every strategy run on one symbol."""
+
+    bars: BarArrays
+    frame: IndicatorFrame
+    nlp: NLPSignals
+    social: Optional[SocialSignals]
+    score: np.ndarray
+    direction: np.ndarray  # int8: DIR_LONG / DIR_SHORT / DIR_FLAT
+    confidence: np.ndarray
+
+    def head(self, n: int) -> "PreparedSignals":
+        """First `n` bars as views; valid because every column is causal."""
+        f = self.frame
+        return PreparedSignals(
+            bars=self.bars.head(n),
+            frame=IndicatorFrame(
+                window=f.window,
+                sma=f.sma[:n],
+                ema=f.ema[:n],
+                rsi=f.rsi[:n],
+                atr=f.atr[:n],
+                volatility=f.volatility[:n],
+                regime=f.regime[:n],
+            ),
+            nlp=self.nlp,
+            social=self.social,
+            score=self.score[:n],
+            direction=self.direction[:n],
+            confidence=self.confidence[:n],
+        )
+
+    def composite_at(self, i: int) -> CompositeSignal:
+        """Materialize a `CompositeSignal` for bar `i` (only done at candidate entries)."""
+        symbol = self.bars.symbol
+        return CompositeSignal(
+            symbol=symbol,
+            quant=self.frame.row(i, symbol),
+            nlp=self.nlp,
+            score=float(self.score[i]),
+            direction=DIRECTION_LABELS[int(self.direction[i])],
+            confidence=float(self.confidence[i]),
+            social=self.social,
+        )
+
+
+# Entry rules -------------------------------------------------------------
+#
+# Each rule mirrors the strategy's `on_new_signal` as a column-wise side
+# array (+1 buy, -1 sell, 0 none). Masks are only a pre-filter: candidate bars
+# are confirmed with the strategy itself, so a rule may be looser than the
+# strategy but must never be stricter.
+
+SideRule = Callable[[Any, PreparedSignals], np.ndarray]
+
+
+def _sides(buy: np.ndarray, sell: np.ndarray) -> np.ndarray:
+    out = np.zeros(buy.shape[0], dtype=np.int8)
+    out[sell] = -1
+    out[buy] = 1
+    return out
+
+
+def _momentum_scalper_rule(strat: Any, p: PreparedSignals) -> np.ndarray:
+    cfg = strat.cfg
+    rsi = p.frame.rsi
+    gate = (p.confidence >= cfg.min_confidence) & (p.frame.regime != REGIME_LOW_VOL)
+    buy = gate & (p.direction == DIR_LONG) & (rsi <= cfg.max_rsi_for_long)
+    sell = gate & (p.direction == DIR_SHORT) & (rsi >= cfg.min_rsi_for_short)
+    return _sides(buy, sell)
+
+
+def _mean_reversion_scalper_rule(strat: Any, p: PreparedSignals) -> np.ndarray:
+    cfg = strat.cfg
+    rsi = p.frame.rsi
+    regime = p.frame.regime
+    gate = (p.confidence >= cfg.min_confidence) & ((regime == REGIME_NORMAL) | (regime == REGIME_HIGH_VOL))
+    sell = gate & (rsi >= cfg.overbought_rsi)
+    buy = gate & ~sell & (rsi <= cfg.oversold_rsi)
+    return _sides(buy, sell)
+
+
+def _news_quick_trade_rule(strat: Any, p: PreparedSignals) -> np.ndarray:
+    params = strat.params
+    nlp = p.nlp
+    n = len(p.bars)
+    if (
+        nlp.impact_score < params.min_impact_score
+        or abs(nlp.sentiment) < params.min_abs_sentiment
+    ):
+        return np.zeros(n, dtype=np.int8)
+    gate = (p.direction != DIR_FLAT) & (p.confidence >= params.min_confidence)
+    if params.require_high_vol_regime:
+        gate &= p.frame.regime == REGIME_HIGH_VOL
+    if nlp.sentiment > 0:
+        return _sides(gate, np.zeros(n, dtype=bool))
+    return _sides(np.zeros(n, dtype=bool), gate)
+
+
+def _trend_follow_rule(strat: Any, p: PreparedSignals) -> np.ndarray:
+    params = strat.params
+    f = p.frame
+    gate = p.confidence >= params.min_confidence
+    buy = gate & (f.ema > f.sma) & (params.rsi_long_min < f.rsi) & (f.rsi < params.rsi_long_max)
+    sell = gate & ~buy & (f.ema < f.sma) & (params.rsi_short_min < f.rsi) & (f.rsi < params.rsi_short_max)
+    return _sides(buy, sell)
+
+
+ENTRY_RULES: Dict[str, SideRule] = {
+    "momentum_scalper": _momentum_scalper_rule,
+    "mean_reversion_scalper": _mean_reversion_scalper_rule,
+    "news_quick_trade": _news_quick_trade_rule,
+    "trend_follow": _trend_follow_rule,
+}
+
+
+def _selection_mask(manager: StrategyManager, name: str, p: PreparedSignals) -> np.ndarray:
+    """Column-wise equivalent of `StrategyManager.select_for_signal` for one strategy."""
+    n = len(p.bars)
+    cfg = manager.configs.get(name)
+    if not cfg or not cfg.enabled:
+        return np.zeros(n, dtype=bool)
+    settings = get_settings()
+    per_symbol = settings.strategies.per_symbol or {}
+    if name not in per_symbol.get(p.bars.symbol, settings.strategies.enabled):
+        return np.zeros(n, dtype=bool)
+    mask = p.confidence >= cfg.min_confidence
+    if cfg.allowed_regimes is not None:
+        allowed = [REGIME_LABELS.index(r) for r in cfg.allowed_regimes if r in REGIME_LABELS]
+        mask &= np.isin(p.frame.regime, allowed)
+    return mask
+
+
+def _find_exit(
+    closes: np.ndarray,
+    start: int,
+    side: str,
+    take_profit: Optional[float],
+    stop_loss: Optional[float],
+) -> int:
+    """Return the first index >= start whose close hits TP or SL, or -1.
+
+    Scans forward in doubling chunks so short holds stay cheap while long
+    holds still cost O(hold) vectorized work.
+    """
+    n = closes.shape[0]
+    chunk = 64
+    lo = start
+    while lo < n:
+        hi = min(n, lo + chunk)
+        seg = closes[lo:hi]
+        hit = np.zeros(seg.shape[0], dtype=bool)
+        if side == "long":
+            if take_profit is not None:
+                hit |= seg >= take_profit
+            if stop_loss is not None:
+                hit |= seg <= stop_loss
+        else:
+            if take_profit is not None:
+                hit |= seg <= take_profit
+            if stop_loss is not None:
+                hit |= seg >= stop_loss
+        if hit.any():
+            return lo + int(np.argmax(hit))
+        lo = hi
+        chunk *= 2
+    return -1
+
+
+def _utc(ts: float) -> datetime:
+    return datetime.utcfromtimestamp(ts)
+
+
+class VectorBacktestEngine:
+    """Columnar single-symbol backtester.
+
+    Indicators and composite scores are computed for all bars at once
+    (`prepare`), strategy entry rules are evaluated as side arrays, and only
+    bars where a rule fires are materialized into `CompositeSignal` objects
+    and confirmed with the strategy itself. Positions are closed when a bar
+    close crosses the decision's TP/SL levels (one open position per symbol,
+    as in `BacktestBroker`), or at the last bar.
+
+    Unlike `run_backtest`, which closes every trade on its entry bar and
+    recomputes signals on a `window`-sized slice, indicators here use the
+    full history up to each bar (see `compute_indicator_frame`).
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        initial_equity: float = 10_000.0,
+        *,
+        quant_weight: float = 0.5,
+        news_weight: float = 0.3,
+        social_weight: float = 0.2,
+        threshold: float = 0.05,
+    ) -> None:
+        self.window = window
+        self.initial_equity = initial_equity
+        self.quant_weight = quant_weight
+        self.news_weight = news_weight
+        self.social_weight = social_weight
+        self.threshold = threshold
+
+    def prepare(
+        self,
+        bars: BarArrays,
+        nlp: Optional[NLPSignals] = None,
+        social: Optional[SocialSignals] = None,
+    ) -> PreparedSignals:
+        """Precompute indicator + composite columns; reusable across strategy params."""
+        if nlp is None:
+            nlp = compute_nlp_news_signals("market")
+        if social is None:
+            social = compute_social_signals(bars.symbol)
+        frame = compute_indicator_frame(bars.closes, bars.highs, bars.lows, self.window)
+
+        # Same scoring as `build_composite_signal`, column-wise.
+        combined, direction, confidence = composite_scores(
+            frame.rsi,
+            nlp.sentiment * max(0.0, nlp.impact_score) if nlp is not None else 0.0,
+            social.sentiment * max(social.buzz_score, 0.0) if social is not None else 0.0,
+            CompositeWeights(self.quant_weight, self.news_weight, self.social_weight, self.threshold),
+        )
+
+        return PreparedSignals(
+            bars=bars,
+            frame=frame,
+            nlp=nlp,
+            social=social,
+            score=combined,
+            direction=direction,
+            confidence=confidence,
+        )
+
+    def run(
+        self,
+        symbol: str,
+        bars: Sequence[dict],
+        news_items: Sequence[dict] = (),
+        strategy_params: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> TradeLog:
+        """Drop-in counterpart of `run_backtest` taking bar dicts."""
+        if not bars:
+            raise ValueError("No bars provided for backtest.")
+        prepared = self.prepare(BarArrays.from_bars(symbol, bars))
+        return self.run_prepared(prepared, strategy_params)
+
+    def run_prepared(
+        self,
+        prepared: PreparedSignals,
+        strategy_params: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> TradeLog:
+        """Simulate trades over precomputed signals.
+
+        strategy_params: optional dict {strategy_name: {param: value}}; None
+        uses the configured `StrategyManager` selection, as in `run_backtest`.
+        """
+        bars = prepared.bars
+        n = len(bars)
+        trade_log = TradeLog()
+        if n == 0:
+            return trade_log
+
+        strategies, sides = self._entry_sides(prepared, strategy_params)
+        if not strategies:
+            return trade_log
+
+        warm_up = max(0, self.window - 1)
+        any_side = np.zeros(n, dtype=bool)
+        for s in sides:
+            any_side |= s != 0
+        any_side[:warm_up] = False
+        candidates = np.flatnonzero(any_side)
+
+        symbol = bars.symbol
+        broker = BacktestBroker(initial_equity=self.initial_equity)
+        risk = RiskManager()
+        risk.state.equity = self.initial_equity
+        risk.state.equity_start = self.initial_equity
+
+        k = 0
+        while k < candidates.shape[0]:
+            i = int(candidates[k])
+            exit_idx = self._try_entry(i, prepared, strategies, sides, broker, risk, trade_log)
+            if exit_idx is None:
+                k += 1
+                continue
+            if exit_idx < 0:
+                break  # held to the end of the data
+            # One position per symbol: skip candidates until after the exit bar.
+            k = int(np.searchsorted(candidates, exit_idx + 1, side="left"))
+
+        # Close any remaining position at the last price.
+        if symbol in broker._positions:
+            self._close(prepared, n - 1, broker, risk, trade_log)
+
+        return trade_log
+
+    def _entry_sides(
+        self,
+        prepared: PreparedSignals,
+        strategy_params: Optional[Dict[str, Dict[str, Any]]],
+    ) -> Tuple[List[Strategy], List[np.ndarray]]:
+        strategies = _build_strategies(strategy_params)
+        manager: Optional[StrategyManager] = None
+        if strategies is None:
+            manager = StrategyManager()
+            strategies = list(manager.strategies.values())
+
+        n = len(prepared.bars)
+        sides: List[np.ndarray] = []
+        for strat in strategies:
+            rule = ENTRY_RULES.get(strat.name)
+            if rule is not None:
+                side = rule(strat, prepared)
+            else:
+                # Unknown plugin: every bar is a candidate, confirmed per bar.
+                side = np.ones(n, dtype=np.int8)
+            if manager is not None:
+                side = np.where(_selection_mask(manager, strat.name, prepared), side, 0).astype(np.int8)
+            sides.append(side)
+        return strategies, sides
+
+    def _try_entry(
+        self,
+        i: int,
+        prepared: PreparedSignals,
+        strategies: List[Strategy],
+        sides: List[np.ndarray],
+        broker: BacktestBroker,
+        risk: RiskManager,
+        trade_log: TradeLog,
+    ) -> Optional[int]:
+        """Open a position at bar `i` if a strategy confirms; return its exit index.
+
+        Returns None when nothing was opened, -1 when the position stays open
+        until the end of the data.
+        """
+        bars = prepared.bars
+        symbol = bars.symbol
+        price = float(bars.closes[i])
+        comp: Optional[CompositeSignal] = None
+
+        for strat, side in zip(strategies, sides):
+            if side[i] == 0:
+                continue
+            if comp is None:
+                comp = prepared.composite_at(i)
+            decision = strat.on_new_signal(comp)
+            if decision is None:
+                continue
+
+            allowed, reason = risk.can_open(decision, price)
+            if not allowed:
+                log_event("bt_trade_blocked", reason=reason, symbol=symbol, strategy=strat.name)
+                continue
+
+            qty = decision.qty if hasattr(decision, "qty") else decision.size_pct * (risk.state.equity / price)
+            pos = broker.submit_market_order(
+                symbol=symbol,
+                side=decision.side,
+                qty=qty,
+                price=price,
+                ts=_utc(float(bars.ts[i])),
+                strategy_name=strat.name,
+            )
+            pos.meta["entry_idx"] = i
+            risk.on_open(decision, price)
+
+            tp: Optional[float] = None
+            sl: Optional[float] = None
+            if pos.side == "long":
+                if decision.take_profit_pct != 0:
+                    tp = price * (1 + decision.take_profit_pct)
+                if decision.stop_loss_pct != 0:
+                    sl = price * (1 - decision.stop_loss_pct)
+            else:
+                if decision.take_profit_pct != 0:
+                    tp = price * (1 - decision.take_profit_pct)
+                if decision.stop_loss_pct != 0:
+                    sl = price * (1 + decision.stop_loss_pct)
+
+            exit_idx = _find_exit(bars.closes, i + 1, pos.side, tp, sl)
+            if exit_idx >= 0:
+                self._close(prepared, exit_idx, broker, risk, trade_log)
+            return exit_idx
+        return None
+
+    def _close(
+        self,
+        prepared: PreparedSignals,
+        exit_idx: int,
+        broker: BacktestBroker,
+        risk: RiskManager,
+        trade_log: TradeLog,
+    ) -> None:
+        bars = prepared.bars
+        exit_price = float(bars.closes[exit_idx])
+        exit_dt = _utc(float(bars.ts[exit_idx]))
+        pos, notional = broker.close_position(bars.symbol, exit_price, exit_dt)
+        risk.on_close(pos.symbol, notional, pos.realized_pnl)
+
+        # Excursions over the holding period, in account currency.
+        entry_idx = int(pos.meta.get("entry_idx", exit_idx))
+        hold_hi = float(bars.highs[entry_idx : exit_idx + 1].max())
+        hold_lo = float(bars.lows[entry_idx : exit_idx + 1].min())
+        if pos.side == "long":
+            mfe = (hold_hi - pos.entry_price) * pos.qty
+            mae = (pos.entry_price - hold_lo) * pos.qty
+        else:
+            mfe = (pos.entry_price - hold_lo) * pos.qty
+            mae = (hold_hi - pos.entry_price) * pos.qty
+
+        trade_log.add_trade(
+            BacktestTradeRecord(
+                trade_id=pos.id,
+                symbol=pos.symbol,
+                strategy_name=pos.strategy_name or "unknown",
+                side=pos.side,
+                qty=pos.qty,
+                entry_time=pos.opened_at,
+                exit_time=pos.closed_at or exit_dt,
+                entry_price=pos.entry_price,
+                exit_price=exit_price,
+                realized_pnl=pos.realized_pnl,
+                max_favorable_excursion=max(0.0, mfe),
+                max_adverse_excursion=max(0.0, mae),
+            )
+        )
+
+
+__all__ = [
+    "BarArrays",
+    "ENTRY_RULES",
+    "PreparedSignals",
+    "VectorBacktestEngine",
+]
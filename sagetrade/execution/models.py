@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import time
 import uuid
 from dataclasses import dataclass, field
 from typing import Dict, Optional
 
+from sagetrade.utils.clock import Clock, get_clock
+
 
 def _now_ts() -> float:
-    return time.time()
+    return get_clock().time()
 
 
 def _new_id(prefix: str) -> str:
@@ -52,8 +53,14 @@ class AccountState:
     positions: Dict[str, Position] = field(default_factory=dict)
 
 
-def create_market_order(symbol: str, side: str, qty: float, limit_price: Optional[float] = None) -> Order:
-    now = _now_ts()
+def create_market_order(
+    symbol: str,
+    side: str,
+    qty: float,
+    limit_price: Optional[float] = None,
+    clock: Optional[Clock] = None,
+) -> Order:
+    now = clock.time() if clock is not None else _now_ts()
     return Order(
         id=_new_id("ord"),
         symbol=symbol,
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import time
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 from sagetrade.brokers import BrokerBase
 from sagetrade.execution.models import AccountState, Order, Position, create_market_order
 from sagetrade.storage.trade_log import append_trade
 from sagetrade.strategy.base import Decision
+from sagetrade.utils.clock import Clock, get_clock
 from sagetrade.utils.logging import get_logger
 
 
@@ -22,6 +23,8 @@ class PaperBroker(BrokerBase):
 
     - Assumes immediate fills at current price +/- slippage.
     - Tracks account balance and open positions.
+    - Timestamps come from `clock` (default: the process clock), so a
+      simulated clock gives data-time trade durations.
     """
 
     def __init__(
@@ -29,8 +32,10 @@ class PaperBroker(BrokerBase):
         initial_balance: float = 10_000.0,
         cfg: PaperBrokerConfig | None = None,
         account_id: str = "paper-default",
+        clock: Optional[Clock] = None,
     ) -> None:
         self.cfg = cfg or PaperBrokerConfig()
+        self.clock = clock
         self.account = AccountState(balance=initial_balance, equity=initial_balance)
         self.orders: Dict[str, Order] = {}
         self.account_id = account_id
@@ -38,6 +43,9 @@ class PaperBroker(BrokerBase):
         self._decision_meta: Dict[str, Decision] = {}
         self._logger = get_logger(__name__)
 
+    def _now(self) -> float:
+        return (self.clock or get_clock()).time()
+
     def _apply_commission(self, notional: float) -> float:
         return notional * self.cfg.commission_pct
 
@@ -50,7 +58,7 @@ class PaperBroker(BrokerBase):
 
         qty = notional / max(price, 1e-8)
         side = decision.side
-        order = create_market_order(decision.symbol, side, qty)
+        order = create_market_order(decision.symbol, side, qty, clock=self.clock or get_clock())
 
         # Slippage: move price slightly against us.
         slip = self.cfg.slippage_pct
@@ -64,7 +72,7 @@ class PaperBroker(BrokerBase):
         order.status = "filled"
         order.filled_qty = qty
         order.avg_fill_price = fill_price
-        order.updated_at = time.time()
+        order.updated_at = self._now()
         self.orders[order.id] = order
 
         # Commission and account update (balance reduced by commissions only; PnL realized on close).
@@ -141,7 +149,7 @@ class PaperBroker(BrokerBase):
         self.account.realized_pnl += pnl
         self.account.equity = self.account.balance
 
-        closed_ts = time.time()
+        closed_ts = self._now()
         pos.closed_at = closed_ts
         pos.realized_pnl = pnl
 
@@ -0,0 +1,281 @@
+"""Event-driven paper trading on top of the message queue.
+
+`PaperTradingEngine` subscribes to `market.bars` and reacts to each bar as
+it arrives: the bar is pushed into that symbol's ring buffer and
+`IncrementalQuantState`, TP/SL is checked at the new price, and the
+strategy -> risk -> broker chain runs for that symbol only. Nothing is
+re-read from disk and other symbols are not touched, so work per bar is
+constant and total CPU follows the bar rate rather than the universe size.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sagetool.kill_switch import is_enabled as kill_switch_enabled
+from sagetrade.execution.models import Order, Position
+from sagetrade.messaging.partition import PartitionConsumer
+from sagetrade.messaging.queue import MessageQueue
+from sagetrade.risk.manager import RiskManager
+from sagetrade.signals.aggregator import CompositeSignal, aggregate
+from sagetrade.signals.nlp import NLPSignals
+from sagetrade.signals.nlp_stream import NewsSignalAggregator
+from sagetrade.signals.quant import IncrementalQuantState
+from sagetrade.signals.resample import BarResampler
+from sagetrade.strategy.registry import StrategyManager
+from sagetrade.utils.clock import Clock, SimulatedClock
+from sagetrade.utils.logging import get_logger, log_event
+from sagetrade.utils.metrics import get_registry
+
+
+@dataclass
+class BarOutcome:
+    """What handling one bar did (for callers that print or test the loop)."""
+
+    symbol: str
+    price: float
+    signal: Optional[CompositeSignal] = None
+    skipped: str = ""
+    opened: Optional[List[Tuple[str, Order, Position]]] = None
+    closed: Optional[Dict[str, Tuple[Position, float]]] = None
+    latency_ms: float = 0.0
+
+
+class PaperTradingEngine:
+    """Per-bar paper trading driven by `market.bars` messages.
+
+    Each symbol keeps a deque of its last `bars_limit` bars (all of them if
+    `bars_limit` <= 0) and an `IncrementalQuantState`, so a new bar costs
+    O(1) to turn into signals.
+    `nlp` is the market-wide NLP snapshot combined with the quant signals; it
+    can be replaced at any time with `set_nlp`, which also takes per-symbol
+    snapshots (e.g. from `EntityIndex`) that override it for that symbol.
+    With a streaming `news` aggregator, each bar instead reads that symbol's
+    recency-weighted signals as of the bar's timestamp (O(1) per bar).
+    With `timeframes` (e.g. ("5m", "1h")) the bars also feed a
+    `BarResampler` and each `CompositeSignal` carries the higher-timeframe
+    quant signals in `timeframes`.
+    """
+
+    def __init__(
+        self,
+        broker: Any,
+        risk: Optional[RiskManager] = None,
+        manager: Optional[StrategyManager] = None,
+        nlp: Optional[NLPSignals] = None,
+        *,
+        symbols: Optional[Iterable[str]] = None,
+        window: int = 20,
+        bars_limit: int = 500,
+        kill_switch: Callable[[], bool] = kill_switch_enabled,
+        clock: Optional[Clock] = None,
+        news: Optional[NewsSignalAggregator] = None,
+        timeframes: Optional[Sequence[str]] = None,
+    ) -> None:
+        self.broker = broker
+        self.risk = risk or RiskManager()
+        self.manager = manager or StrategyManager()
+        self.nlp = nlp
+        self.nlp_by_symbol: Dict[str, NLPSignals] = {}
+        self.news = news
+        self.resampler = BarResampler(timeframes, window=window) if timeframes else None
+        self._resampled_ts: Dict[str, float] = {}
+        self.symbols = set(symbols) if symbols else None
+        self.window = window
+        self.bars_limit: Optional[int] = bars_limit if bars_limit > 0 else None
+        self._kill_switch = kill_switch
+        # A SimulatedClock is moved to each bar's ts (pass the same clock to
+        # the broker/risk manager for data-time stamps in simulations).
+        self.clock = clock
+        self.bars: Dict[str, Deque[Dict[str, Any]]] = {}
+        self.states: Dict[str, IncrementalQuantState] = {}
+        self.last_price: Dict[str, float] = {}
+        self._running = False
+        self._logger = get_logger(__name__)
+
+        registry = get_registry()
+        self._bars_total = registry.counter("paper_engine_bars_total", "Bars processed by the paper engine")
+        self._orders_total = registry.counter("paper_engine_orders_total", "Orders placed by the paper engine")
+        self._latency = registry.gauge("paper_engine_last_latency_ms", "Bar-to-decision latency of the last bar")
+
+    def set_nlp(self, nlp: Optional[NLPSignals], symbol: Optional[str] = None) -> None:
+        if symbol is None:
+            self.nlp = nlp
+        elif nlp is None:
+            self.nlp_by_symbol.pop(symbol, None)
+        else:
+            self.nlp_by_symbol[symbol] = nlp
+
+    def _state_for(self, symbol: str) -> Tuple[Deque[Dict[str, Any]], IncrementalQuantState]:
+        buf = self.bars.get(symbol)
+        if buf is None:
+            buf = deque(maxlen=self.bars_limit)
+            self.bars[symbol] = buf
+            self.states[symbol] = IncrementalQuantState(symbol, window=self.window)
+        return buf, self.states[symbol]
+
+    def warmup(self, symbol: str, bars: Iterable[Dict[str, Any]]) -> int:
+        """Feed historical bars into the signal state without trading on them."""
+        buf, state = self._state_for(symbol)
+        n = 0
+        for bar in bars:
+            buf.append(bar)
+            state.update(bar)
+            self._resample(bar, symbol)
+            n += 1
+        if buf:
+            self.last_price[symbol] = float(buf[-1]["c"])
+        return n
+
+    def _resample(self, bar: Dict[str, Any], symbol: str) -> None:
+        """Feed the resampler once per bar time (warmup history may overlap the live bars)."""
+        if self.resampler is None or "ts" not in bar:
+            return
+        ts = float(bar["ts"])
+        if ts <= self._resampled_ts.get(symbol, float("-inf")):
+            return
+        self._resampled_ts[symbol] = ts
+        self.resampler.update(bar, symbol)
+
+    def _sync_risk(self) -> None:
+        if hasattr(self.broker, "summary"):
+            summary = self.broker.summary()
+            self.risk.state.equity = summary.get("equity", self.risk.state.equity)
+            self.risk.state.realized_pnl = summary.get("realized_pnl", self.risk.state.realized_pnl)
+
+    def on_bar(self, bar: Dict[str, Any], symbol: Optional[str] = None) -> Optional[BarOutcome]:
+        """Process one bar; returns None if the bar is not for a traded symbol."""
+        started = time.perf_counter()
+        symbol = symbol or bar.get("symbol")
+        if not symbol or (self.symbols is not None and symbol not in self.symbols):
+            return None
+        try:
+            price = float(bar["c"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        if isinstance(self.clock, SimulatedClock) and "ts" in bar:
+            self.clock.set(float(bar["ts"]))
+
+        buf, state = self._state_for(symbol)
+        buf.append(bar)
+        q_sig = state.update(bar)
+        self._resample(bar, symbol)
+        self.last_price[symbol] = price
+        self._bars_total.inc()
+        out = BarOutcome(symbol=symbol, price=price)
+
+        # Exits first, at the new price of this symbol only.
+        closed = self.broker.check_tp_sl({symbol: price})
+        if closed:
+            for pos_id, (pos, notional) in closed.items():
+                self.risk.on_close(pos.symbol, notional, pos.realized_pnl)
+            out.closed = closed
+            self._sync_risk()
+
+        if self.news is not None:
+            nlp: Optional[NLPSignals] = self.news.signals_for(symbol, now=float(bar["ts"]) if "ts" in bar else None)
+        else:
+            nlp = self.nlp_by_symbol.get(symbol, self.nlp)
+        if state.count < self.window:
+            out.skipped = "warming_up"
+        elif self.risk.state.open_notional_by_symbol.get(symbol, 0.0) > 0.0:
+            out.skipped = "open_exposure"
+        elif nlp is None:
+            out.skipped = "no_nlp"
+        else:
+            comp = aggregate(symbol, q_sig, nlp)
+            if self.resampler is not None:
+                comp.timeframes = self.resampler.quant_all(symbol)
+            out.signal = comp
+            if self._kill_switch():
+                out.skipped = "kill_switch"
+            else:
+                out.opened = self._act(comp, price)
+
+        out.latency_ms = (time.perf_counter() - started) * 1000.0
+        self._latency.set(out.latency_ms)
+        return out
+
+    def _act(self, comp: CompositeSignal, price: float) -> List[Tuple[str, Order, Position]]:
+        opened: List[Tuple[str, Order, Position]] = []
+        for strat in self.manager.select_for_signal(comp):
+            decision = strat.on_new_signal(comp)
+            if decision is None:
+                continue
+            allowed, reason = self.risk.can_open(decision, price)
+            if not allowed:
+                continue
+            order, position = self.broker.execute_decision(decision, price)
+            self.risk.on_open(decision, price)
+            self._orders_total.inc()
+            opened.append((strat.name, order, position))
+            log_event(
+                "paper_engine_order",
+                symbol=comp.symbol,
+                strategy=strat.name,
+                side=decision.side,
+                price=price,
+                score=comp.score,
+            )
+        if opened:
+            self._sync_risk()
+        return opened
+
+    def run(
+        self,
+        queue: MessageQueue,
+        topic: str = "market.bars",
+        timeout_ms: int = 1000,
+        max_messages: Optional[int] = None,
+        on_outcome: Optional[Callable[[BarOutcome], None]] = None,
+        partitions: Optional[Sequence[int]] = None,
+    ) -> int:
+        """Consume `topic` and handle every bar until `stop()` or `max_messages`.
+
+        With `partitions`, only those partitions of a partitioned topic
+        (`{topic}.{p}`) are read, so each worker sees a fixed subset of symbols.
+        """
+        self._running = True
+        handled = 0
+        log_event(
+            "paper_engine_started",
+            topic=topic,
+            partitions=list(partitions) if partitions else None,
+            symbols=sorted(self.symbols) if self.symbols else "*",
+            window=self.window,
+        )
+        if partitions:
+            messages = PartitionConsumer(queue, topic, partitions).consume(timeout_ms=timeout_ms)
+        else:
+            messages = queue.consume(topic, timeout_ms=timeout_ms)
+        try:
+            for msg in messages:
+                try:
+                    outcome = self.on_bar(msg.data)
+                except Exception as exc:
+                    self._logger.exception(
+                        "paper_engine_bar_failed event=paper_engine_bar_failed symbol=%s error=%s",
+                        msg.data.get("symbol"),
+                        exc,
+                    )
+                    outcome = None
+                if outcome is not None and on_outcome is not None:
+                    on_outcome(outcome)
+                handled += 1
+                if not self._running or (max_messages is not None and handled >= max_messages):
+                    break
+        finally:
+            self._running = False
+            log_event("paper_engine_stopped", topic=topic, handled=handled)
+        return handled
+
+    def stop(self) -> None:
+        """Ask `run` to return after the bar it is currently handling."""
+        self._running = False
+
+
+__all__ = ["BarOutcome", "PaperTradingEngine"]
@@ -0,0 +1,264 @@
+"""asyncio counterparts of the message queues.
+
+`AsyncMessageQueue` exposes `await publish(...)` and `async for msg in
+consume(topic)` so many topic streams, Telegram and broker I/O can share
+one event loop instead of one thread per blocking consumer.
+
+- `AsyncInMemoryQueue`: each `consume` call gets its own bounded
+  `asyncio.Queue`; `publish` fans the message out to all of them.
+- `AsyncRedisQueue`: Redis Streams through `redis.asyncio`, using the same
+  entry layout and codecs as `RedisQueue`, so sync and async processes can
+  share streams.
+- `AsyncQueueAdapter`: wraps any existing sync `MessageQueue`, running its
+  blocking calls in worker threads and fanning each topic out to all of
+  its subscriptions.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from sagetrade.messaging.codec import CodecRegistry
+from sagetrade.messaging.queue import Message, MessageQueue, RedisQueue
+
+
+class AsyncMessageQueue:
+    _codecs: Optional[CodecRegistry] = None
+
+    @property
+    def codecs(self) -> CodecRegistry:
+        if self._codecs is None:
+            self._codecs = CodecRegistry()
+        return self._codecs
+
+    def set_codec(self, topic: str, codec: str) -> None:
+        self.codecs.set(topic, codec)
+
+    async def publish(self, topic: str, data: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def publish_many(self, topic: str, records: Iterable[Dict[str, Any]]) -> int:
+        n = 0
+        for data in records:
+            await self.publish(topic, data)
+            n += 1
+        return n
+
+    def consume(self, topic: str, timeout_ms: int = 1000) -> AsyncIterator[Message]:
+        """Async iterator over messages published to `topic` after subscribing."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+class AsyncInMemoryQueue(AsyncMessageQueue):
+    """Fan-out queue: every subscriber gets every message published after it subscribed.
+
+    Each subscriber buffers at most `maxsize` messages; a subscriber that
+    falls further behind loses its oldest messages rather than blocking
+    publishers (`dropped` counts them per topic).
+    """
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self.maxsize = maxsize
+        self._subs: Dict[str, Set[asyncio.Queue]] = {}
+        self.dropped: Dict[str, int] = {}
+
+    def _deliver(self, topic: str, msg: Message) -> None:
+        for q in self._subs.get(topic, ()):
+            if q.full():
+                q.get_nowait()
+                self.dropped[topic] = self.dropped.get(topic, 0) + 1
+            q.put_nowait(msg)
+
+    async def publish(self, topic: str, data: Dict[str, Any]) -> None:
+        self._deliver(topic, Message(topic, data, time.time()))
+
+    async def publish_many(self, topic: str, records: Iterable[Dict[str, Any]]) -> int:
+        n = 0
+        for data in records:
+            self._deliver(topic, Message(topic, data, time.time()))
+            n += 1
+        return n
+
+    def subscribers(self, topic: str) -> int:
+        return len(self._subs.get(topic, ()))
+
+    def consume(self, topic: str, timeout_ms: int = 1000) -> AsyncIterator[Message]:
+        # Subscribe now, not on the first `__anext__`, so nothing published
+        # between this call and the first iteration is missed.
+        q: asyncio.Queue = asyncio.Queue(maxsize=self.maxsize)
+        self._subs.setdefault(topic, set()).add(q)
+        return self._iter(topic, q)
+
+    async def _iter(self, topic: str, q: asyncio.Queue) -> AsyncIterator[Message]:
+        try:
+            while True:
+                yield await q.get()
+        finally:
+            subs = self._subs.get(topic)
+            if subs is not None:
+                subs.discard(q)
+
+
+class AsyncRedisQueue(AsyncMessageQueue):
+    """Redis Streams queue on `redis.asyncio`; entry format matches `RedisQueue`."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 6379,
+        db: int = 0,
+        namespace: str = "sagetrade",
+        maxlen: int = 10_000,
+        codecs: Optional[CodecRegistry] = None,
+    ) -> None:
+        try:
+            import redis.asyncio as aioredis  # type: ignore
+        except Exception as e:
+            raise ImportError("redis package not installed. `pip install redis`.") from e
+        self._redis = aioredis.Redis(host=host, port=port, db=db, decode_responses=False)
+        self._codecs = codecs
+        self._ns = namespace
+        self.maxlen = maxlen
+
+    def _key(self, topic: str) -> str:
+        return f"{self._ns}:{topic}"
+
+    def _fields(self, topic: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        codec = self.codecs.for_topic(topic)
+        return {"c": codec.name, "d": codec.encode(data), "ts": repr(time.time())}
+
+    async def publish(self, topic: str, data: Dict[str, Any]) -> None:
+        await self._redis.xadd(self._key(topic), self._fields(topic, data), maxlen=self.maxlen, approximate=True)
+
+    async def publish_many(self, topic: str, records: Iterable[Dict[str, Any]], chunk_size: int = 500) -> int:
+        key = self._key(topic)
+        n = 0
+        pending = 0
+        pipe = self._redis.pipeline(transaction=False)
+        for data in records:
+            pipe.xadd(key, self._fields(topic, data), maxlen=self.maxlen, approximate=True)
+            pending += 1
+            if pending >= chunk_size:
+                await pipe.execute()
+                n += pending
+                pending = 0
+        if pending:
+            await pipe.execute()
+            n += pending
+        return n
+
+    async def consume(self, topic: str, timeout_ms: int = 1000) -> AsyncIterator[Message]:
+        key = self._key(topic)
+        # Resolve "$" once so entries added between two XREADs are not skipped.
+        entries = await self._redis.xrevrange(key, count=1)
+        last_id: Any = entries[0][0] if entries else "0-0"
+        while True:
+            resp = await self._redis.xread({key: last_id}, count=100, block=timeout_ms)
+            if not resp:
+                continue
+            _stream_key, entries = resp[0]
+            for msg_id, fields in entries:
+                last_id = msg_id
+                yield RedisQueue._decode(topic, fields, msg_id)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class AsyncQueueAdapter(AsyncMessageQueue):
+    """Use a sync `MessageQueue` from asyncio code.
+
+    Blocking calls run via `asyncio.to_thread`. Subscriptions get fan-out
+    semantics like `AsyncInMemoryQueue`: one poller task per topic calls
+    `consume_batch` and copies each batch into every subscription's own
+    bounded buffer, so two `consume` calls on a topic both see every
+    message (the adapter owns the sync queue's anonymous cursor; do not
+    `consume_batch` the same queue object elsewhere).
+
+    Limits: each poll parks a thread of the default executor for up to
+    `timeout_ms`, i.e. one thread per subscribed topic, and the executor
+    has min(32, cpu_count + 4) threads; with more topics than that, polls
+    queue up behind each other and latency grows. Use `AsyncRedisQueue` /
+    `AsyncInMemoryQueue` (native asyncio, no threads) for many topics.
+    """
+
+    def __init__(self, queue: MessageQueue, batch_size: int = 100, maxsize: int = 10_000) -> None:
+        self.queue = queue
+        self.batch_size = batch_size
+        self._fanout = AsyncInMemoryQueue(maxsize=maxsize)
+        self._pollers: Dict[str, "asyncio.Task[None]"] = {}
+
+    @property
+    def codecs(self) -> CodecRegistry:
+        return self.queue.codecs
+
+    @property
+    def dropped(self) -> Dict[str, int]:
+        """Messages lost per topic by subscriptions that fell more than `maxsize` behind."""
+        return self._fanout.dropped
+
+    async def publish(self, topic: str, data: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.queue.publish, topic, data)
+
+    async def publish_many(self, topic: str, records: Iterable[Dict[str, Any]]) -> int:
+        return await asyncio.to_thread(self.queue.publish_many, topic, list(records))
+
+    def consume(self, topic: str, timeout_ms: int = 1000) -> AsyncIterator[Message]:
+        return self._iter(topic, self._fanout.consume(topic), timeout_ms)
+
+    async def _iter(self, topic: str, sub: AsyncIterator[Message], timeout_ms: int) -> AsyncIterator[Message]:
+        poller = self._pollers.get(topic)
+        if poller is None or poller.done():
+            self._pollers[topic] = asyncio.create_task(self._poll(topic, timeout_ms))
+        try:
+            async for msg in sub:
+                yield msg
+        finally:
+            await sub.aclose()  # type: ignore[attr-defined]
+
+    async def _poll(self, topic: str, timeout_ms: int) -> None:
+        """Feed every subscription of `topic` until the last one goes away."""
+        try:
+            while self._fanout.subscribers(topic):
+                batch: List[Message] = await asyncio.to_thread(
+                    self.queue.consume_batch, topic, self.batch_size, timeout_ms
+                )
+                for msg in batch:
+                    self._fanout._deliver(topic, msg)
+        finally:
+            if self._pollers.get(topic) is asyncio.current_task():
+                del self._pollers[topic]
+
+    async def close(self) -> None:
+        for task in list(self._pollers.values()):
+            task.cancel()
+        self._pollers.clear()
+
+
+def build_async_queue_from_env() -> AsyncMessageQueue:
+    """Async twin of `build_queue_from_env` (MSG_BACKEND, MSG_NAMESPACE, REDIS_*, MSG_CODEC[S])."""
+    backend = (os.environ.get("MSG_BACKEND") or "memory").strip().lower()
+    if backend == "redis":
+        return AsyncRedisQueue(
+            host=os.environ.get("REDIS_HOST", "127.0.0.1"),
+            port=int(os.environ.get("REDIS_PORT", "6379")),
+            db=int(os.environ.get("REDIS_DB", "0")),
+            namespace=os.environ.get("MSG_NAMESPACE") or "sagetrade",
+            codecs=CodecRegistry.from_spec(os.environ.get("MSG_CODEC") or "json", os.environ.get("MSG_CODECS")),
+        )
+    return AsyncInMemoryQueue(maxsize=int(os.environ.get("MSG_MEMORY_CAPACITY", "10000")))
+
+
+__all__ = [
+    "AsyncInMemoryQueue",
+    "AsyncMessageQueue",
+    "AsyncQueueAdapter",
+    "AsyncRedisQueue",
+    "build_async_queue_from_env",
+]
@@ -0,0 +1,162 @@
+"""Message payload codecs.
+
+A codec turns a message dict into bytes and back. `json` is always
+available; `orjson` and `msgpack` are used when their packages are
+installed. Redis entries carry the codec name next to the payload, so a
+consumer decodes each entry with whatever codec its producer chose.
+"""
+
+from __future__ import annotations
+
+import json
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, List, Optional
+
+
+class Codec:
+    name = "base"
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    name = "json"
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        return json.loads(payload)
+
+
+class OrjsonCodec(Codec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        try:
+            import orjson  # type: ignore
+        except Exception as e:
+            raise ImportError("orjson package not installed. `pip install orjson`.") from e
+        self._orjson = orjson
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        return self._orjson.dumps(data, option=self._orjson.OPT_SERIALIZE_NUMPY)
+
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        return self._orjson.loads(payload)
+
+
+class MsgpackCodec(Codec):
+    name = "msgpack"
+
+    def __init__(self) -> None:
+        try:
+            import msgpack  # type: ignore
+        except Exception as e:
+            raise ImportError("msgpack package not installed. `pip install msgpack`.") from e
+        self._packer = msgpack.Packer(use_bin_type=True)
+        self._msgpack = msgpack
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        return self._packer.pack(data)
+
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        return self._msgpack.unpackb(payload, raw=False)
+
+
+_FACTORIES: Dict[str, Callable[[], Codec]] = {
+    "json": JsonCodec,
+    "orjson": OrjsonCodec,
+    "msgpack": MsgpackCodec,
+}
+# Fastest first; used by `get_codec("auto")`.
+PREFERENCE = ("msgpack", "orjson", "json")
+_INSTANCES: Dict[str, Codec] = {}
+
+
+def get_codec(name: str = "json") -> Codec:
+    """Return a shared codec instance by name ("auto" = fastest installed)."""
+    name = (name or "json").strip().lower()
+    if name == "auto":
+        for candidate in PREFERENCE:
+            try:
+                return get_codec(candidate)
+            except ImportError:
+                continue
+    codec = _INSTANCES.get(name)
+    if codec is None:
+        factory = _FACTORIES.get(name)
+        if factory is None:
+            raise ValueError(f"Unknown codec: {name}")
+        codec = factory()
+        _INSTANCES[name] = codec
+    return codec
+
+
+def available_codecs() -> List[str]:
+    out = []
+    for name in _FACTORIES:
+        try:
+            get_codec(name)
+        except ImportError:
+            continue
+        out.append(name)
+    return out
+
+
+class CodecRegistry:
+    """Per-topic codec choice for producers.
+
+    Topics are matched exactly first, then against glob patterns in the
+    order they were registered (e.g. "market.bars*"), then the default.
+    """
+
+    def __init__(self, default: str = "json") -> None:
+        self.default = get_codec(default)
+        self._exact: Dict[str, Codec] = {}
+        self._patterns: List[tuple] = []
+        self._resolved: Dict[str, Codec] = {}
+
+    def set(self, topic_or_pattern: str, codec: str) -> None:
+        c = get_codec(codec)
+        if any(ch in topic_or_pattern for ch in "*?["):
+            self._patterns = [(p, x) for p, x in self._patterns if p != topic_or_pattern]
+            self._patterns.append((topic_or_pattern, c))
+        else:
+            self._exact[topic_or_pattern] = c
+        self._resolved.clear()
+
+    def for_topic(self, topic: str) -> Codec:
+        c = self._resolved.get(topic)
+        if c is None:
+            c = self._exact.get(topic)
+            if c is None:
+                c = next((codec for pattern, codec in self._patterns if fnmatchcase(topic, pattern)), self.default)
+            self._resolved[topic] = c
+        return c
+
+    @classmethod
+    def from_spec(cls, default: str = "json", spec: Optional[str] = None) -> "CodecRegistry":
+        """Build from "topic=codec,pattern*=codec" (the MSG_CODECS env format)."""
+        reg = cls(default)
+        for part in (spec or "").split(","):
+            if "=" in part:
+                topic, codec = part.split("=", 1)
+                if topic.strip():
+                    reg.set(topic.strip(), codec.strip())
+        return reg
+
+
+__all__ = [
+    "Codec",
+    "CodecRegistry",
+    "JsonCodec",
+    "MsgpackCodec",
+    "OrjsonCodec",
+    "available_codecs",
+    "get_codec",
+]
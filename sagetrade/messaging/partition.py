@@ -0,0 +1,91 @@
+"""Key-partitioned topics.
+
+A partitioned topic such as `market.bars` is spread over
+`market.bars.0` ... `market.bars.{n-1}`. Each record goes to the partition
+given by a stable hash of its key (the symbol for bars), so all bars of a
+symbol land in one partition, in publish order. Workers claim a set of
+partitions and can keep per-symbol state local to their process.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sagetrade.messaging.queue import Message, MessageQueue
+
+
+def partition_for(key: str, n_partitions: int) -> int:
+    """Stable key -> partition mapping (CRC32, identical across processes and runs)."""
+    if n_partitions <= 1:
+        return 0
+    return zlib.crc32(str(key).encode("utf-8")) % n_partitions
+
+
+def partition_topic(topic: str, partition: int) -> str:
+    return f"{topic}.{partition}"
+
+
+def assign_partitions(worker_index: int, n_workers: int, n_partitions: int) -> List[int]:
+    """Round-robin share of partitions for worker `worker_index` of `n_workers`."""
+    if n_workers <= 0 or not 0 <= worker_index < n_workers:
+        raise ValueError(f"Invalid worker {worker_index} of {n_workers}.")
+    return [p for p in range(n_partitions) if p % n_workers == worker_index]
+
+
+class PartitionConsumer:
+    """Consume a claimed set of partitions of one topic.
+
+    Partitions are drained round-robin so a busy partition cannot starve the
+    others. When all are empty the consumer waits on all of them at once
+    (`MessageQueue.consume_batch_many`: one multi-stream XREAD on Redis, a
+    shared wake-up in memory); `poll_ms` only applies to backends without
+    a multi-topic wait.
+    """
+
+    def __init__(
+        self,
+        queue: "MessageQueue",
+        topic: str,
+        partitions: Sequence[int],
+        poll_ms: int = 20,
+    ) -> None:
+        if not partitions:
+            raise ValueError("PartitionConsumer needs at least one partition.")
+        self.queue = queue
+        self.topic = topic
+        self.partitions = list(partitions)
+        self.topics = [partition_topic(topic, p) for p in self.partitions]
+        self.poll_ms = max(1, poll_ms)
+        self._next = 0
+
+    def consume_batch(self, max_n: int = 100, timeout_ms: int = 1000) -> List["Message"]:
+        order = self.topics[self._next :] + self.topics[: self._next]
+        self._next = (self._next + 1) % len(self.topics)
+        return self.queue.consume_batch_many(order, max_n, timeout_ms, self.poll_ms)
+
+    def consume(self, timeout_ms: int = 1000, max_n: int = 100) -> Iterator["Message"]:
+        while True:
+            for msg in self.consume_batch(max_n, timeout_ms):
+                yield msg
+
+
+def parse_partition_spec(spec: Optional[str]) -> Iterable[tuple]:
+    """Parse "topic=n[:key],..." (the MSG_PARTITIONS env format) into (topic, n, key) tuples."""
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        topic, rest = part.split("=", 1)
+        n, _, key = rest.partition(":")
+        if topic.strip() and n.strip():
+            yield topic.strip(), int(n), key.strip() or "symbol"
+
+
+__all__ = [
+    "PartitionConsumer",
+    "assign_partitions",
+    "parse_partition_spec",
+    "partition_for",
+    "partition_topic",
+]
@@ -1,9 +1,13 @@
 import json
 import os
+import socket
 import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sagetrade.messaging.codec import CodecRegistry, get_codec
+from sagetrade.messaging.partition import parse_partition_spec, partition_for, partition_topic
 
 
 @dataclass
@@ -11,69 +15,455 @@ class Message:
     topic: str
     data: Dict[str, Any]
     ts: float
+    id: Optional[str] = None  # backend message id (Redis stream entry id), used for acks
 
 
 class MessageQueue:
+    _codecs: Optional[CodecRegistry] = None
+    # topic -> (n_partitions, key field); see `set_partitions`.
+    _partitioning: Optional[Dict[str, Tuple[int, str]]] = None
+
+    @property
+    def codecs(self) -> CodecRegistry:
+        """Per-topic payload codecs used by serializing backends (JSON unless configured)."""
+        if self._codecs is None:
+            self._codecs = CodecRegistry()
+        return self._codecs
+
+    def set_codec(self, topic: str, codec: str) -> None:
+        """Choose the codec ("json", "orjson", "msgpack", "auto") for a topic or glob pattern.
+
+        In-process queues hand dicts over as-is and ignore it.
+        """
+        self.codecs.set(topic, codec)
+
+    def set_partitions(self, topic: str, n_partitions: int, key_field: str = "symbol") -> None:
+        """Partition `topic`: publishes go to `{topic}.{p}` with p = stable hash of data[key_field].
+
+        Consumers read the partition topics (see `PartitionConsumer`).
+        """
+        if self._partitioning is None:
+            self._partitioning = {}
+        if n_partitions <= 1:
+            self._partitioning.pop(topic, None)
+        else:
+            self._partitioning[topic] = (n_partitions, key_field)
+
+    def route(self, topic: str, data: Dict[str, Any]) -> str:
+        """Topic a record is actually published to (the partition topic if partitioned)."""
+        part = self._partitioning.get(topic) if self._partitioning else None
+        if part is None:
+            return topic
+        n, key_field = part
+        return partition_topic(topic, partition_for(data.get(key_field, ""), n))
+
+    def _publish_partitioned(self, topic: str, records: Iterable[Dict[str, Any]]) -> int:
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for data in records:
+            groups.setdefault(self.route(topic, data), []).append(data)
+        return sum(self._publish_routed(topic, t, group) for t, group in groups.items())
+
+    def _publish_routed(self, topic: str, routed: str, records: List[Dict[str, Any]]) -> int:
+        """Publish records of logical `topic` to its partition topic `routed`."""
+        return self.publish_many(routed, records)
+
     def publish(self, topic: str, data: Dict[str, Any]) -> None:
         raise NotImplementedError
 
     def consume(self, topic: str, timeout_ms: int = 1000) -> Iterator[Message]:
         raise NotImplementedError
 
+    def publish_many(self, topic: str, records: Iterable[Dict[str, Any]]) -> int:
+        """Publish several records; returns how many were sent."""
+        if self._partitioning and topic in self._partitioning:
+            return self._publish_partitioned(topic, records)
+        n = 0
+        for data in records:
+            self.publish(topic, data)
+            n += 1
+        return n
+
+    def consume_batch(self, topic: str, max_n: int = 100, timeout_ms: int = 1000) -> List[Message]:
+        """Return up to `max_n` pending messages, waiting up to `timeout_ms` for the first one.
+
+        Successive calls on the same queue object continue where the previous
+        call stopped. An empty list means nothing arrived before the timeout.
+        """
+        raise NotImplementedError
+
+    def consume_batch_many(
+        self, topics: List[str], max_n: int = 100, timeout_ms: int = 1000, poll_ms: int = 20
+    ) -> List[Message]:
+        """`consume_batch` over several topics, waiting up to `timeout_ms` for the first message.
+
+        Topics are swept without blocking, in the given order. Backends that
+        can wait on several topics at once override this with one blocking
+        wait; this fallback blocks on one topic at a time in `poll_ms` slices.
+        """
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        i = 0
+        while True:
+            out = self._sweep(topics, max_n)
+            if out:
+                return out
+            remaining_ms = int((deadline - time.monotonic()) * 1000.0)
+            if remaining_ms <= 0:
+                return out
+            out = self.consume_batch(topics[i % len(topics)], max_n, min(max(1, poll_ms), remaining_ms))
+            i += 1
+            if out:
+                return out
+
+    def _sweep(self, topics: List[str], max_n: int) -> List[Message]:
+        """Non-blocking `consume_batch` on each topic until `max_n` messages are collected."""
+        out: List[Message] = []
+        for t in topics:
+            out.extend(self.consume_batch(t, max_n - len(out), 0))
+            if len(out) >= max_n:
+                break
+        return out
+
+
+class QueueFullError(RuntimeError):
+    """Raised by `InMemoryQueue.publish` under the "error" overflow policy."""
+
+
+OVERFLOW_POLICIES = ("drop_oldest", "block", "error")
+
+
+class _TopicBuffer:
+    """Fixed-capacity ring of messages addressed by a monotonically growing sequence number."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.slots: List[Optional[Message]] = [None] * capacity
+        self.next_seq = 0  # sequence number the next published message gets
+        self.dropped = 0
+        self.cond = threading.Condition()
+        # Named consumers -> next sequence number they will read.
+        self.offsets: Dict[str, int] = {}
+        # Events of `consume_batch_many` calls waiting on this topic among others.
+        self.waiters: set = set()
+
+    def wake(self) -> None:
+        """Notify same-topic consumers and multi-topic waiters; caller holds `cond`."""
+        self.cond.notify_all()
+        for ev in self.waiters:
+            ev.set()
+
+    @property
+    def first_seq(self) -> int:
+        return max(0, self.next_seq - self.capacity)
+
+    def __len__(self) -> int:
+        return self.next_seq - self.first_seq
+
+    def get(self, seq: int) -> Message:
+        return self.slots[seq % self.capacity]  # type: ignore[return-value]
+
+    def oldest_needed(self) -> bool:
+        """True if a named consumer has not read the oldest retained message yet."""
+        first = self.first_seq
+        return any(off <= first for off in self.offsets.values())
+
 
 class InMemoryQueue(MessageQueue):
-    def __init__(self) -> None:
-        self._topics: Dict[str, list] = {}
-        self._conds: Dict[str, threading.Condition] = {}
+    """Process-local queue with bounded per-topic retention.
 
-    def _get_cond(self, topic: str) -> threading.Condition:
-        if topic not in self._conds:
-            self._conds[topic] = threading.Condition()
-        return self._conds[topic]
+    Each topic keeps at most `capacity` messages in a ring buffer. Consumers
+    given a `consumer` name have their offset stored on the queue, so a
+    later `consume` with the same name resumes where the previous one
+    stopped, and `lag()` reports how far behind each one is. Anonymous
+    consumers start at the oldest retained message and are not tracked.
+
+    `overflow` decides what happens when a topic is full and a named
+    consumer still has to read its oldest message:
+      - "drop_oldest": overwrite it; the consumer skips ahead (counted in `stats`).
+      - "block": wait (up to `block_timeout_ms`, None = forever) for consumers to catch up.
+      - "error": raise `QueueFullError`.
+    Without named consumers the oldest message is always overwritten.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10_000,
+        overflow: str = "drop_oldest",
+        block_timeout_ms: Optional[int] = None,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive.")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.capacity = capacity
+        self.overflow = overflow
+        self.block_timeout_ms = block_timeout_ms
+        self._topics: Dict[str, _TopicBuffer] = {}
+        self._cursors: Dict[str, int] = {}  # anonymous consume_batch position per topic
+        self._lock = threading.Lock()
+
+    def _topic(self, topic: str) -> _TopicBuffer:
+        buf = self._topics.get(topic)
+        if buf is None:
+            with self._lock:
+                buf = self._topics.setdefault(topic, _TopicBuffer(self.capacity))
+        return buf
+
+    def _append(self, buf: _TopicBuffer, topic: str, data: Dict[str, Any]) -> None:
+        """Append one message; caller holds `buf.cond`."""
+        if len(buf) >= buf.capacity and buf.oldest_needed():
+            if self.overflow == "error":
+                raise QueueFullError(f"Topic {topic!r} is full ({buf.capacity} messages).")
+            if self.overflow == "block":
+                timeout = None if self.block_timeout_ms is None else self.block_timeout_ms / 1000.0
+                if not buf.cond.wait_for(lambda: not buf.oldest_needed(), timeout=timeout):
+                    raise QueueFullError(f"Timed out waiting for consumers of {topic!r}.")
+        if len(buf) >= buf.capacity and buf.oldest_needed():
+            buf.dropped += 1
+        buf.slots[buf.next_seq % buf.capacity] = Message(topic, data, time.time())
+        buf.next_seq += 1
 
     def publish(self, topic: str, data: Dict[str, Any]) -> None:
-        cond = self._get_cond(topic)
-        with cond:
-            self._topics.setdefault(topic, []).append(Message(topic, data, time.time()))
-            cond.notify_all()
+        topic = self.route(topic, data)
+        buf = self._topic(topic)
+        with buf.cond:
+            self._append(buf, topic, data)
+            buf.wake()
 
-    def consume(self, topic: str, timeout_ms: int = 1000) -> Iterator[Message]:
-        cond = self._get_cond(topic)
-        idx = 0
+    def publish_many(self, topic: str, records: Iterable[Dict[str, Any]]) -> int:
+        """Publish records under a single lock acquisition and wake consumers once."""
+        if self._partitioning and topic in self._partitioning:
+            return self._publish_partitioned(topic, records)
+        buf = self._topic(topic)
+        n = 0
+        with buf.cond:
+            try:
+                for data in records:
+                    if self.overflow == "block" and len(buf) >= buf.capacity and buf.oldest_needed():
+                        buf.cond.notify_all()  # let consumers drain what is already there
+                    self._append(buf, topic, data)
+                    n += 1
+            finally:
+                if n:
+                    buf.wake()
+        return n
+
+    def consume(
+        self,
+        topic: str,
+        timeout_ms: int = 1000,
+        consumer: Optional[str] = None,
+        start: str = "earliest",
+    ) -> Iterator[Message]:
+        """Yield messages of `topic` forever.
+
+        A named `consumer` resumes from its stored offset; a new name starts at
+        `start` ("earliest" retained message or "latest"). The offset is
+        advanced as each message is handed out.
+        """
+        buf = self._topic(topic)
+        # Register eagerly (not on first `next`) so retention and lag see the
+        # consumer as soon as it subscribes.
+        with buf.cond:
+            if consumer is not None and consumer in buf.offsets:
+                seq = buf.offsets[consumer]
+            else:
+                seq = buf.first_seq if start == "earliest" else buf.next_seq
+                if consumer is not None:
+                    buf.offsets[consumer] = seq
+        return self._iter(buf, seq, timeout_ms, consumer)
+
+    def _iter(self, buf: _TopicBuffer, seq: int, timeout_ms: int, consumer: Optional[str]) -> Iterator[Message]:
         while True:
-            with cond:
-                if topic not in self._topics:
-                    self._topics[topic] = []
-                q = self._topics[topic]
-                if idx < len(q):
-                    m = q[idx]
-                    idx += 1
-                    yield m
+            with buf.cond:
+                if seq < buf.first_seq:
+                    seq = buf.first_seq  # overwritten before we read it
+                if seq >= buf.next_seq:
+                    buf.cond.wait(timeout=timeout_ms / 1000.0)
                     continue
-                cond.wait(timeout=timeout_ms / 1000.0)
+                m = buf.get(seq)
+                seq += 1
+                if consumer is not None:
+                    buf.offsets[consumer] = seq
+                    if self.overflow == "block":
+                        buf.cond.notify_all()
+            yield m
+
+    def consume_batch(
+        self,
+        topic: str,
+        max_n: int = 100,
+        timeout_ms: int = 1000,
+        consumer: Optional[str] = None,
+        start: str = "earliest",
+    ) -> List[Message]:
+        """Return up to `max_n` messages, waiting up to `timeout_ms` for the first.
+
+        Named consumers share offsets with `consume`; anonymous calls use a
+        per-topic cursor on this queue object.
+        """
+        buf = self._topic(topic)
+        with buf.cond:
+            cursors = buf.offsets if consumer is not None else self._cursors
+            key = consumer if consumer is not None else topic
+            seq = cursors.get(key)
+            if seq is None:
+                seq = buf.first_seq if start == "earliest" else buf.next_seq
+            if seq >= buf.next_seq and timeout_ms > 0:
+                buf.cond.wait_for(lambda: buf.next_seq > seq, timeout=timeout_ms / 1000.0)
+            seq = max(seq, buf.first_seq)
+            stop = min(buf.next_seq, seq + max(0, max_n))
+            batch = [buf.get(i) for i in range(seq, stop)]
+            cursors[key] = stop
+            if consumer is not None and batch and self.overflow == "block":
+                buf.cond.notify_all()
+        return batch
+
+    def consume_batch_many(
+        self, topics: List[str], max_n: int = 100, timeout_ms: int = 1000, poll_ms: int = 20
+    ) -> List[Message]:
+        """Sweep `topics` without blocking, then wait once for a publish to any of them."""
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        bufs = [self._topic(t) for t in topics]
+        event = threading.Event()
+        for buf in bufs:
+            with buf.cond:
+                buf.waiters.add(event)
+        try:
+            while True:
+                # Registered before sweeping, so a publish racing the sweep still sets the event.
+                event.clear()
+                out = self._sweep(topics, max_n)
+                remaining = deadline - time.monotonic()
+                if out or remaining <= 0:
+                    return out
+                event.wait(remaining)
+        finally:
+            for buf in bufs:
+                with buf.cond:
+                    buf.waiters.discard(event)
+
+    def commit(self, topic: str, consumer: str, offset: int) -> None:
+        """Set a named consumer's next offset explicitly (e.g. to rewind)."""
+        buf = self._topic(topic)
+        with buf.cond:
+            buf.offsets[consumer] = max(0, min(offset, buf.next_seq))
+            buf.cond.notify_all()
+
+    def remove_consumer(self, topic: str, consumer: str) -> None:
+        """Forget a named consumer so it no longer holds back retention."""
+        buf = self._topic(topic)
+        with buf.cond:
+            buf.offsets.pop(consumer, None)
+            buf.cond.notify_all()
+
+    def lag(self, topic: str, consumer: Optional[str] = None) -> Dict[str, int]:
+        """Unread message count per named consumer (or just `consumer`)."""
+        buf = self._topic(topic)
+        with buf.cond:
+            names = [consumer] if consumer is not None else list(buf.offsets)
+            return {
+                name: buf.next_seq - max(buf.offsets.get(name, buf.next_seq), buf.first_seq)
+                for name in names
+            }
+
+    def stats(self, topic: str) -> Dict[str, int]:
+        buf = self._topic(topic)
+        with buf.cond:
+            return {
+                "capacity": buf.capacity,
+                "size": len(buf),
+                "first_offset": buf.first_seq,
+                "next_offset": buf.next_seq,
+                "dropped": buf.dropped,
+                "consumers": len(buf.offsets),
+            }
 
 
 class RedisQueue(MessageQueue):
     """Redis Streams backed queue.
 
     Uses stream per topic: key = f"{namespace}:{topic}"
+    Each entry holds the codec name ("c"), the encoded payload ("d") and the
+    publish time ("ts"); consumers decode with the codec named in the entry.
     Requires `redis` package. If not available, raises ImportError on init.
     """
 
-    def __init__(self, host: str = "127.0.0.1", port: int = 6379, db: int = 0, namespace: str = "sagetrade") -> None:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 6379,
+        db: int = 0,
+        namespace: str = "sagetrade",
+        maxlen: int = 10_000,
+        codecs: Optional[CodecRegistry] = None,
+    ) -> None:
         try:
             import redis  # type: ignore
         except Exception as e:
             raise ImportError("redis package not installed. `pip install redis`.") from e
-        self._redis = redis.Redis(host=host, port=port, db=db, decode_responses=True)
+        # Binary-safe client: payloads may be msgpack.
+        self._redis = redis.Redis(host=host, port=port, db=db, decode_responses=False)
+        self._codecs = codecs
         self._ns = namespace
+        self.maxlen = maxlen
+        self._batch_ids: Dict[str, Any] = {}  # topic key -> last stream id returned
 
     def _key(self, topic: str) -> str:
         return f"{self._ns}:{topic}"
 
+    def _fields(self, topic: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Entry fields; `topic` is the logical topic, so codecs set for it also apply to its partitions."""
+        codec = self.codecs.for_topic(topic)
+        return {"c": codec.name, "d": codec.encode(data), "ts": repr(time.time())}
+
+    @staticmethod
+    def _decode(topic: str, fields: Dict[bytes, bytes], msg_id: Any = None) -> Message:
+        data = {}
+        try:
+            payload = fields.get(b"d")
+            if payload is not None:
+                data = get_codec(fields.get(b"c", b"json").decode()).decode(payload)
+            else:  # entries written before codecs were introduced
+                data = json.loads(fields.get(b"json", b"{}"))
+        except Exception:
+            pass
+        ts = float(fields.get(b"ts", time.time()))
+        if isinstance(msg_id, bytes):
+            msg_id = msg_id.decode()
+        return Message(topic=topic, data=data, ts=ts, id=msg_id)
+
     def publish(self, topic: str, data: Dict[str, Any]) -> None:
-        payload = {"json": json.dumps(data), "ts": str(time.time())}
-        self._redis.xadd(self._key(topic), payload, maxlen=10_000, approximate=True)
+        routed = self.route(topic, data)
+        self._redis.xadd(self._key(routed), self._fields(topic, data), maxlen=self.maxlen, approximate=True)
+
+    def publish_many(self, topic: str, records: Iterable[Dict[str, Any]], chunk_size: int = 500) -> int:
+        """XADD records through a non-transactional pipeline, one round trip per `chunk_size`."""
+        if self._partitioning and topic in self._partitioning:
+            return self._publish_partitioned(topic, records)
+        return self._xadd_many(topic, topic, records, chunk_size)
+
+    def _publish_routed(self, topic: str, routed: str, records: List[Dict[str, Any]]) -> int:
+        return self._xadd_many(routed, topic, records)
+
+    def _xadd_many(
+        self, routed: str, topic: str, records: Iterable[Dict[str, Any]], chunk_size: int = 500
+    ) -> int:
+        """Pipeline XADDs to the stream of `routed`, encoding with the codec of logical `topic`."""
+        key = self._key(routed)
+        n = 0
+        pipe = self._redis.pipeline(transaction=False)
+        pending = 0
+        for data in records:
+            pipe.xadd(key, self._fields(topic, data), maxlen=self.maxlen, approximate=True)
+            pending += 1
+            if pending >= chunk_size:
+                pipe.execute()
+                n += pending
+                pending = 0
+        if pending:
+            pipe.execute()
+            n += pending
+        return n
 
     def consume(self, topic: str, timeout_ms: int = 1000) -> Iterator[Message]:
         last_id = "$"  # start from new messages only
@@ -85,22 +475,242 @@ class RedisQueue(MessageQueue):
             stream_key, entries = resp[0]
             for msg_id, fields in entries:
                 last_id = msg_id
-                data = {}
-                try:
-                    data = json.loads(fields.get("json", "{}"))
-                except Exception:
-                    pass
-                ts = float(fields.get("ts", time.time()))
-                yield Message(topic=topic, data=data, ts=ts)
+                yield self._decode(topic, fields, msg_id)
+
+    def _last_id(self, key: str) -> Any:
+        """Id of the newest entry in `key` ("0-0" if empty), so batches start after it."""
+        entries = self._redis.xrevrange(key, count=1)
+        return entries[0][0] if entries else "0-0"
+
+    def consume_batch(self, topic: str, max_n: int = 100, timeout_ms: int = 1000) -> List[Message]:
+        """XREAD up to `max_n` entries in one call.
+
+        The first call on a topic starts after the newest existing entry (like
+        `consume`); later calls continue from the last id returned.
+        """
+        key = self._key(topic)
+        last_id = self._batch_ids.get(key)
+        if last_id is None:
+            last_id = self._last_id(key)
+            self._batch_ids[key] = last_id
+        resp = self._redis.xread({key: last_id}, count=max_n, block=timeout_ms if timeout_ms > 0 else None)
+        if not resp:
+            return []
+        _stream_key, entries = resp[0]
+        if entries:
+            self._batch_ids[key] = entries[-1][0]
+        return [self._decode(topic, fields, msg_id) for msg_id, fields in entries]
+
+    def consume_batch_many(
+        self, topics: List[str], max_n: int = 100, timeout_ms: int = 1000, poll_ms: int = 20
+    ) -> List[Message]:
+        """One multi-stream XREAD over all `topics` (same cursors as `consume_batch`)."""
+        keys = {self._key(t): t for t in topics}
+        streams = {}
+        for key in keys:
+            if key not in self._batch_ids:
+                self._batch_ids[key] = self._last_id(key)
+            streams[key] = self._batch_ids[key]
+        resp = self._redis.xread(streams, count=max_n, block=timeout_ms if timeout_ms > 0 else None)
+        out: List[Message] = []
+        for stream_key, entries in resp or []:
+            key = stream_key.decode() if isinstance(stream_key, bytes) else stream_key
+            # XREAD's count is per stream; take what fits and leave the rest for the next call.
+            entries = entries[: max_n - len(out)]
+            if entries:
+                self._batch_ids[key] = entries[-1][0]
+                out.extend(self._decode(keys[key], fields, msg_id) for msg_id, fields in entries)
+        return out
+
+
+class RedisGroupQueue(RedisQueue):
+    """Redis Streams consumer-group queue (XREADGROUP / XACK / XAUTOCLAIM).
+
+    All instances sharing `group` split a topic's stream between them: each
+    entry is delivered to one consumer. Delivered entries stay pending until
+    acknowledged, so nothing is lost when a worker dies:
+      - on start a consumer first re-reads its own pending entries (same
+        `consumer` name after a restart);
+      - every `claim_interval_ms` it takes over entries another consumer has
+        left pending for longer than `claim_idle_ms`.
+    With `auto_ack` an entry is acknowledged once the caller asks for the
+    next one (`consume`) or the next batch (`consume_batch`), i.e. after it
+    has been processed; otherwise call `ack`. Delivery is at-least-once.
+    """
+
+    def __init__(
+        self,
+        group: str,
+        consumer: Optional[str] = None,
+        *,
+        claim_idle_ms: int = 60_000,
+        claim_interval_ms: int = 5_000,
+        auto_ack: bool = True,
+        start_id: str = "$",
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.group = group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.claim_idle_ms = claim_idle_ms
+        self.claim_interval_ms = claim_interval_ms
+        self.auto_ack = auto_ack
+        self.start_id = start_id  # where a newly created group starts reading
+        self._groups_ready: set = set()
+        self._recover_from: Dict[str, Any] = {}
+        self._last_claim: Dict[str, float] = {}
+        self._unacked: Dict[str, List[str]] = {}
+
+    def _ensure_group(self, key: str) -> None:
+        if key in self._groups_ready:
+            return
+        try:
+            self._redis.xgroup_create(key, self.group, id=self.start_id, mkstream=True)
+        except Exception as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._groups_ready.add(key)
+        self._recover_from.setdefault(key, "0")
+
+    def _read(self, key: str, count: int, timeout_ms: int) -> List[Tuple[Any, Optional[Dict[bytes, bytes]]]]:
+        self._ensure_group(key)
+
+        # 1. Entries delivered to this consumer name before a restart.
+        cursor = self._recover_from.get(key)
+        if cursor is not None:
+            resp = self._redis.xreadgroup(self.group, self.consumer, {key: cursor}, count=count)
+            entries = resp[0][1] if resp else []
+            if entries:
+                self._recover_from[key] = entries[-1][0]
+                return entries
+            self._recover_from[key] = None
+
+        # 2. Entries abandoned by crashed consumers.
+        now = time.monotonic()
+        if (now - self._last_claim.get(key, 0.0)) * 1000.0 >= self.claim_interval_ms:
+            self._last_claim[key] = now
+            resp = self._redis.xautoclaim(
+                key, self.group, self.consumer, min_idle_time=self.claim_idle_ms, start_id="0-0", count=count
+            )
+            claimed = resp[1] if resp and len(resp) > 1 else []
+            if claimed:
+                return claimed
+
+        # 3. New entries.
+        resp = self._redis.xreadgroup(
+            self.group, self.consumer, {key: ">"}, count=count, block=timeout_ms if timeout_ms > 0 else None
+        )
+        return resp[0][1] if resp else []
+
+    def ack(self, topic: str, ids: Iterable[str]) -> int:
+        """Acknowledge processed entries so they leave the pending list."""
+        ids = [i for i in ids if i]
+        if not ids:
+            return 0
+        return int(self._redis.xack(self._key(topic), self.group, *ids))
+
+    def pending(self, topic: str) -> Dict[str, Any]:
+        """XPENDING summary for the group: total, id range and per-consumer counts."""
+        key = self._key(topic)
+        self._ensure_group(key)
+        info = self._redis.xpending(key, self.group)
+
+        def text(v: Any) -> Any:
+            return v.decode() if isinstance(v, bytes) else v
+
+        return {
+            "pending": int(info.get("pending", 0)),
+            "min": text(info.get("min")),
+            "max": text(info.get("max")),
+            "consumers": {text(c["name"]): int(c["pending"]) for c in info.get("consumers", [])},
+        }
+
+    def consume(self, topic: str, timeout_ms: int = 1000) -> Iterator[Message]:
+        key = self._key(topic)
+        done: List[str] = []
+        try:
+            while True:
+                for msg_id, fields in self._read(key, 100, timeout_ms):
+                    if fields is None:  # trimmed from the stream while pending
+                        done.append(msg_id)
+                        continue
+                    yield self._decode(topic, fields, msg_id)
+                    if self.auto_ack:
+                        done.append(msg_id)
+                if done:
+                    self.ack(topic, done)
+                    done = []
+        finally:
+            if done:
+                self.ack(topic, done)
+
+    def consume_batch(self, topic: str, max_n: int = 100, timeout_ms: int = 1000) -> List[Message]:
+        key = self._key(topic)
+        if self.auto_ack and self._unacked.get(key):
+            self.ack(topic, self._unacked.pop(key))
+        out: List[Message] = []
+        stale: List[str] = []
+        for msg_id, fields in self._read(key, max_n, timeout_ms):
+            if fields is None:
+                stale.append(msg_id)
+            else:
+                out.append(self._decode(topic, fields, msg_id))
+        if stale:
+            self.ack(topic, stale)
+        if self.auto_ack and out:
+            self._unacked[key] = [m.id for m in out if m.id]
+        return out
+
+    def consume_batch_many(
+        self, topics: List[str], max_n: int = 100, timeout_ms: int = 1000, poll_ms: int = 20
+    ) -> List[Message]:
+        """Non-blocking sweep (recovery, claims, acks per topic), then one multi-stream XREADGROUP."""
+        out = self._sweep(topics, max_n)
+        if out or timeout_ms <= 0:
+            return out
+        keys = {self._key(t): t for t in topics}
+        resp = self._redis.xreadgroup(
+            self.group, self.consumer, {key: ">" for key in keys}, count=max_n, block=timeout_ms
+        )
+        for stream_key, entries in resp or []:
+            key = stream_key.decode() if isinstance(stream_key, bytes) else stream_key
+            msgs = [self._decode(keys[key], fields, msg_id) for msg_id, fields in entries if fields is not None]
+            if self.auto_ack and msgs:
+                self._unacked[key] = [m.id for m in msgs if m.id]
+            out.extend(msgs)
+        return out
 
 
 def build_queue_from_env() -> MessageQueue:
+    queue = _queue_from_env()
+    # e.g. MSG_PARTITIONS="market.bars=8" or "market.bars=8:symbol"
+    for topic, n, key_field in parse_partition_spec(os.environ.get("MSG_PARTITIONS")):
+        queue.set_partitions(topic, n, key_field)
+    return queue
+
+
+def _queue_from_env() -> MessageQueue:
     backend = (os.environ.get("MSG_BACKEND") or "memory").strip().lower()
     namespace = os.environ.get("MSG_NAMESPACE") or "sagetrade"
     if backend == "redis":
         host = os.environ.get("REDIS_HOST", "127.0.0.1")
         port = int(os.environ.get("REDIS_PORT", "6379"))
         db = int(os.environ.get("REDIS_DB", "0"))
-        return RedisQueue(host=host, port=port, db=db, namespace=namespace)
-    return InMemoryQueue()
+        codecs = CodecRegistry.from_spec(os.environ.get("MSG_CODEC") or "json", os.environ.get("MSG_CODECS"))
+        group = os.environ.get("MSG_GROUP")
+        if group:
+            return RedisGroupQueue(
+                group,
+                os.environ.get("MSG_CONSUMER") or None,
+                claim_idle_ms=int(os.environ.get("MSG_CLAIM_IDLE_MS", "60000")),
+                host=host,
+                port=port,
+                db=db,
+                namespace=namespace,
+                codecs=codecs,
+            )
+        return RedisQueue(host=host, port=port, db=db, namespace=namespace, codecs=codecs)
+    capacity = int(os.environ.get("MSG_MEMORY_CAPACITY", "10000"))
+    overflow = (os.environ.get("MSG_OVERFLOW") or "drop_oldest").strip().lower()
+    return InMemoryQueue(capacity=capacity, overflow=overflow)
 
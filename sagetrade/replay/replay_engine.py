@@ -1,10 +1,15 @@
 import glob
+import heapq
 import json
 import os
 import time
-from typing import Iterator
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from sagetrade.messaging.queue import MessageQueue
+from sagetrade.utils.logging import log_event
+
+
+REPLAY_MODES = ("realtime", "max", "step")
 
 
 def read_jsonl(path: str) -> Iterator[dict]:
@@ -19,11 +24,201 @@ def read_jsonl(path: str) -> Iterator[dict]:
                 continue
 
 
-def replay_market_day(day_dir: str, queue: MessageQueue, topic: str = "market.bars", speed: float = 1.0) -> None:
-    files = sorted(glob.glob(os.path.join(day_dir, "*.jsonl")))
-    for fp in files:
-        for rec in read_jsonl(fp):
-            queue.publish(topic, rec)
-            if speed > 0:
-                time.sleep(0.001 / speed)
+def list_day_dirs(base_dir: str, start_day: Optional[str] = None, end_day: Optional[str] = None) -> List[str]:
+    """Day directories (YYYY-MM-DD) under `base_dir` within [start_day, end_day], in order."""
+    out = []
+    for d in sorted(glob.glob(os.path.join(base_dir, "*"))):
+        day = os.path.basename(d)
+        if not os.path.isdir(d):
+            continue
+        if start_day and day < start_day:
+            continue
+        if end_day and day > end_day:
+            continue
+        out.append(d)
+    return out
+
+
+def _symbol_stream(path: str, symbol: str) -> Iterator[Tuple[float, dict]]:
+    for rec in read_jsonl(path):
+        rec.setdefault("symbol", symbol)
+        yield float(rec.get("ts", 0.0)), rec
+
+
+def iter_merged(day_dirs: Sequence[str], symbols: Optional[Iterable[str]] = None) -> Iterator[Tuple[float, dict]]:
+    """Yield (ts, record) for all symbol files of `day_dirs`, merged by ts.
+
+    Days are replayed in order; within a day the per-symbol files (each
+    already in ts order) are k-way merged with a heap, reading every file
+    lazily, so memory stays O(number of files). Records missing a
+    `symbol` field get it from the file name.
+    """
+    wanted = set(symbols) if symbols else None
+    for day_dir in day_dirs:
+        streams = []
+        for fp in sorted(glob.glob(os.path.join(day_dir, "*.jsonl"))):
+            symbol = os.path.splitext(os.path.basename(fp))[0]
+            if wanted is not None and symbol not in wanted:
+                continue
+            streams.append(_symbol_stream(fp, symbol))
+        yield from heapq.merge(*streams, key=lambda item: item[0])
+
+
+class MarketReplay:
+    """Publish historical bars to a queue in timestamp order.
+
+    Modes:
+      - "max": publish as fast as possible in `batch_size` batches.
+      - "realtime": keep the original spacing between timestamps, divided
+        by `speed` (speed=60 replays an hour of bars in a minute). Records
+        that are due are published together in one batch.
+      - "step": publish one timestamp group (all records sharing the next
+        ts) per `step()` call; `run` calls `on_step` between groups.
+
+    `on_time(ts)` is called with the latest published timestamp after every
+    batch, e.g. to advance a simulated clock.
+    """
 
+    def __init__(
+        self,
+        queue: MessageQueue,
+        topic: str = "market.bars",
+        *,
+        mode: str = "max",
+        speed: float = 1.0,
+        batch_size: int = 500,
+        on_time: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Unknown replay mode: {mode}")
+        if mode == "realtime" and speed <= 0:
+            raise ValueError("Realtime replay needs speed > 0.")
+        self.queue = queue
+        self.topic = topic
+        self.mode = mode
+        self.speed = speed
+        self.batch_size = max(1, batch_size)
+        self.on_time = on_time
+        self.published = 0
+        self._stream: Optional[Iterator[Tuple[float, dict]]] = None
+        self._pending: Optional[Tuple[float, dict]] = None
+
+    def open(self, day_dirs: Sequence[str], symbols: Optional[Iterable[str]] = None) -> "MarketReplay":
+        self._stream = iter_merged(day_dirs, symbols)
+        self._pending = None
+        self.published = 0
+        return self
+
+    def _next(self) -> Optional[Tuple[float, dict]]:
+        if self._pending is not None:
+            item, self._pending = self._pending, None
+            return item
+        if self._stream is None:
+            return None
+        return next(self._stream, None)
+
+    def _flush(self, batch: List[dict], ts: float) -> None:
+        if not batch:
+            return
+        self.queue.publish_many(self.topic, batch)
+        self.published += len(batch)
+        if self.on_time is not None:
+            self.on_time(ts)
+
+    def step(self) -> List[dict]:
+        """Publish every record with the next timestamp; [] when the replay is done."""
+        first = self._next()
+        if first is None:
+            return []
+        ts, rec = first
+        group = [rec]
+        while True:
+            item = self._next()
+            if item is None:
+                break
+            if item[0] != ts:
+                self._pending = item
+                break
+            group.append(item[1])
+        self._flush(group, ts)
+        return group
+
+    def run(self, on_step: Optional[Callable[[float, List[dict]], None]] = None) -> Dict[str, float]:
+        """Replay everything opened with `open`; returns counts and throughput."""
+        started = time.perf_counter()
+        if self.mode == "step":
+            while True:
+                group = self.step()
+                if not group:
+                    break
+                if on_step is not None:
+                    on_step(float(group[0].get("ts", 0.0)), group)
+        elif self.mode == "max":
+            batch: List[dict] = []
+            last_ts = 0.0
+            while True:
+                item = self._next()
+                if item is None:
+                    break
+                last_ts, rec = item
+                batch.append(rec)
+                if len(batch) >= self.batch_size:
+                    self._flush(batch, last_ts)
+                    batch = []
+            self._flush(batch, last_ts)
+        else:
+            self._run_realtime()
+
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        stats = {"records": float(self.published), "elapsed_sec": elapsed, "records_per_sec": self.published / elapsed}
+        log_event("replay_finished", topic=self.topic, mode=self.mode, speed=self.speed, **stats)
+        return stats
+
+    def _run_realtime(self) -> None:
+        item = self._next()
+        if item is None:
+            return
+        t0_data = item[0]
+        t0_wall = time.monotonic()
+        batch: List[dict] = []
+        batch_ts = item[0]
+        while item is not None:
+            ts, rec = item
+            due = t0_wall + (ts - t0_data) / self.speed
+            now = time.monotonic()
+            if due > now:
+                # Publish what is due before waiting for the next record.
+                self._flush(batch, batch_ts)
+                batch = []
+                time.sleep(due - now)
+            batch.append(rec)
+            batch_ts = ts
+            if len(batch) >= self.batch_size:
+                self._flush(batch, batch_ts)
+                batch = []
+            item = self._next()
+        self._flush(batch, batch_ts)
+
+
+def replay_market_range(
+    base_dir: str,
+    queue: MessageQueue,
+    start_day: Optional[str] = None,
+    end_day: Optional[str] = None,
+    *,
+    topic: str = "market.bars",
+    mode: str = "max",
+    speed: float = 1.0,
+    batch_size: int = 500,
+    symbols: Optional[Iterable[str]] = None,
+) -> Dict[str, float]:
+    """Replay every day directory of `base_dir` in [start_day, end_day]."""
+    replay = MarketReplay(queue, topic, mode=mode, speed=speed, batch_size=batch_size)
+    replay.open(list_day_dirs(base_dir, start_day, end_day), symbols)
+    return replay.run()
+
+
+def replay_market_day(day_dir: str, queue: MessageQueue, topic: str = "market.bars", speed: float = 1.0) -> None:
+    """Replay one day directory merged by ts; `speed` scales realtime pacing, <= 0 means max speed."""
+    mode = "realtime" if speed > 0 else "max"
+    MarketReplay(queue, topic, mode=mode, speed=speed).open([day_dir]).run()
@@ -7,6 +7,7 @@ from sagetrade.brokers import BrokerBase
 from sagetrade.risk.state import RiskState
 from sagetrade.utils.config import get_settings
 from sagetrade.strategy.base import Decision
+from sagetrade.utils.clock import Clock, get_clock
 from sagetrade.utils.logging import get_logger
 
 
@@ -32,6 +33,7 @@ class RiskManager:
         cfg: RiskConfig | None = None,
         broker: Optional[BrokerBase] = None,
         state: Optional[RiskState] = None,
+        clock: Optional[Clock] = None,
     ) -> None:
         if cfg is None:
             settings = get_settings()
@@ -47,10 +49,16 @@ class RiskManager:
                 max_daily_loss_pct=rs.max_daily_loss_pct * 100.0,
             )
         self.cfg = cfg
-        self.state = state or RiskState(
-            equity_start=self.cfg.initial_equity,
-            equity=self.cfg.initial_equity,
-        )
+        self.clock = clock
+        if state is None:
+            now = (clock or get_clock()).time()
+            state = RiskState(
+                equity_start=self.cfg.initial_equity,
+                equity=self.cfg.initial_equity,
+                last_equity_update_ts=now,
+                session_start_ts=now,
+            )
+        self.state = state
         self._broker = broker
         self._logger = get_logger(__name__)
 
@@ -73,9 +81,7 @@ class RiskManager:
         self.state.open_trades = open_positions
         self.state.open_notional_by_symbol = per_symbol_notional
 
-        from time import time as _time
-
-        self.state.last_equity_update_ts = _time()
+        self.state.last_equity_update_ts = (self.clock or get_clock()).time()
 
         self._logger.debug(
             "risk_state_updated event=risk_state_updated equity=%.2f realized_pnl=%.2f "
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from typing import Dict
-import time
+
+from sagetrade.utils.clock import get_clock
 
 
 @dataclass
@@ -18,8 +19,8 @@ class RiskState:
     realized_pnl: float = 0.0
     open_trades: int = 0
     open_notional_by_symbol: Dict[str, float] = field(default_factory=dict)
-    last_equity_update_ts: float = field(default_factory=lambda: time.time())
-    session_start_ts: float = field(default_factory=lambda: time.time())
+    last_equity_update_ts: float = field(default_factory=lambda: get_clock().time())
+    session_start_ts: float = field(default_factory=lambda: get_clock().time())
 
     @property
     def daily_pnl(self) -> float:
@@ -1,15 +1,95 @@
+import os
+import threading
+import time
 from dataclasses import dataclass
 from typing import Dict, Optional
 
 from sagetrade.signals.quant import QuantSignals
 from sagetrade.signals.nlp import NLPSignals
 from sagetrade.signals.social import SocialSignals
-from sagetrade.utils.logging import get_logger
+from sagetrade.utils.logging import get_logger, log_event
+from sagetrade.utils.metrics import get_registry
 
 
 logger = get_logger(__name__)
 
 
+class CompositeTelemetry:
+    """Aggregated telemetry for composite signals.
+
+    Replaces a formatted log line per signal: every signal only bumps
+    counters; one in `sample_every` signals is logged in full, and a
+    `composite_signal_summary` event with per-direction counts and mean
+    confidence is emitted at most every `summary_interval_sec`.
+    """
+
+    def __init__(self, sample_every: int = 1000, summary_interval_sec: float = 60.0) -> None:
+        self.sample_every = max(1, sample_every)
+        self.summary_interval_sec = summary_interval_sec
+        registry = get_registry()
+        self._total = registry.counter("composite_signals_total", "Composite signals built")
+        self._by_direction = {
+            d: registry.counter(f"composite_signals_{d}_total", f"Composite signals with direction={d}")
+            for d in ("long", "short", "flat")
+        }
+        self._lock = threading.Lock()
+        self._seen = 0
+        self._window = {"long": 0, "short": 0, "flat": 0}
+        self._conf_sum = 0.0
+        self._last_summary = time.monotonic()
+
+    def record_counts(self, n_long: int, n_short: int, n_flat: int, confidence_sum: float) -> None:
+        n = n_long + n_short + n_flat
+        if n <= 0:
+            return
+        self._total.inc(n)
+        self._by_direction["long"].inc(n_long)
+        self._by_direction["short"].inc(n_short)
+        self._by_direction["flat"].inc(n_flat)
+        with self._lock:
+            self._seen += n
+            self._window["long"] += n_long
+            self._window["short"] += n_short
+            self._window["flat"] += n_flat
+            self._conf_sum += confidence_sum
+            now = time.monotonic()
+            if now - self._last_summary < self.summary_interval_sec:
+                return
+            counts = dict(self._window)
+            conf_sum = self._conf_sum
+            self._window = {"long": 0, "short": 0, "flat": 0}
+            self._conf_sum = 0.0
+            self._last_summary = now
+        total = sum(counts.values())
+        log_event(
+            "composite_signal_summary",
+            signals=total,
+            long=counts["long"],
+            short=counts["short"],
+            flat=counts["flat"],
+            mean_confidence=conf_sum / total,
+        )
+
+    def record(self, comp: "CompositeSignal") -> None:
+        d = comp.direction
+        self.record_counts(int(d == "long"), int(d == "short"), int(d == "flat"), comp.confidence)
+        if self.sample_every == 1 or self._seen % self.sample_every == 1:
+            logger.info(
+                "composite_signal event=composite_signal symbol=%s direction=%s score=%.4f "
+                "confidence=%.3f regime=%s rsi=%.2f sampled=1/%d",
+                comp.symbol,
+                comp.direction,
+                comp.score,
+                comp.confidence,
+                comp.quant.regime,
+                comp.quant.rsi,
+                self.sample_every,
+            )
+
+
+telemetry = CompositeTelemetry(sample_every=int(os.getenv("COMPOSITE_LOG_SAMPLE", "1000")))
+
+
 @dataclass
 class CompositeSignal:
     symbol: str
@@ -19,6 +99,8 @@ class CompositeSignal:
     direction: str
     confidence: float
     social: Optional[SocialSignals] = None
+    # Higher-timeframe quant signals keyed by timeframe ("15m", "1h"), when available.
+    timeframes: Optional[Dict[str, QuantSignals]] = None
 
     def as_dict(self) -> Dict[str, object]:
         payload: Dict[str, object] = {
@@ -35,6 +117,8 @@ class CompositeSignal:
                 "buzz_score": self.social.buzz_score,
                 "volume_score": self.social.volume_score,
             }
+        if self.timeframes:
+            payload["timeframes"] = {tf: q.as_dict() for tf, q in self.timeframes.items()}
         return payload
 
 
@@ -101,17 +185,7 @@ def build_composite_signal(
         social=social,
     )
 
-    logger.info(
-        "composite_signal event=composite_signal symbol=%s direction=%s score=%.4f "
-        "confidence=%.3f regime=%s rsi=%.2f",
-        symbol,
-        direction,
-        combined,
-        confidence,
-        quant.regime,
-        quant.rsi,
-    )
-
+    telemetry.record(comp)
     return comp
 
 
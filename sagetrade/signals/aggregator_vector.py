@@ -0,0 +1,271 @@
+"""Vectorized (NumPy) counterpart of `build_composite_signal`.
+
+`build_composite_signals_batch` scores many symbols (or many bars of one
+symbol) at once and returns a `CompositeBatch` of score / direction /
+confidence arrays. No `CompositeSignal` objects are created up front:
+`batch.signal(i)` materializes one on demand, typically only for the
+non-flat entries a strategy actually looks at. Telemetry is recorded once
+per batch (counts per direction) instead of a log line per signal.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except Exception as exc:  # pragma: no cover - import guard
+    raise ImportError("numpy package not installed. `pip install numpy`.") from exc
+
+from sagetrade.signals.aggregator import CompositeSignal, telemetry
+from sagetrade.signals.nlp import EVENT_KEYWORDS, NLPSignals
+from sagetrade.signals.quant import QuantSignals
+from sagetrade.signals.quant_vector import IndicatorFrame
+from sagetrade.signals.social import SocialSignals
+
+
+DIR_FLAT = 0
+DIR_LONG = 1
+DIR_SHORT = -1
+
+DIRECTION_LABELS = {DIR_FLAT: "flat", DIR_LONG: "long", DIR_SHORT: "short"}
+
+
+@dataclass(frozen=True)
+class CompositeWeights:
+    """Weights/threshold of `build_composite_signal` (same defaults)."""
+
+    quant: float = 0.5
+    news: float = 0.3
+    social: float = 0.2
+    threshold: float = 0.05
+
+
+def composite_scores(
+    rsi: Any,
+    nlp_score: Any = 0.0,
+    social_score: Any = 0.0,
+    weights: Optional[CompositeWeights] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Column-wise `build_composite_signal` scoring -> (score, direction int8, confidence).
+
+    `nlp_score` is sentiment * max(0, impact) and `social_score` is
+    sentiment * max(0, buzz); both may be scalars or arrays.
+    """
+    w = weights or CompositeWeights()
+    rsi = np.asarray(rsi, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        q_score = np.where(np.isnan(rsi), 0.0, np.clip((rsi - 50.0) / 50.0, -1.0, 1.0))
+    combined = np.clip(w.quant * q_score + w.news * nlp_score + w.social * social_score, -1.0, 1.0)
+    combined = np.asarray(combined, dtype=np.float64)
+    direction = np.zeros(combined.shape[0], dtype=np.int8)
+    direction[combined > w.threshold] = DIR_LONG
+    direction[combined < -w.threshold] = DIR_SHORT
+    return combined, direction, np.abs(combined)
+
+
+@dataclass(frozen=True)
+class NLPArrays:
+    """Column form of `NLPSignals` for a batch (scalars broadcast)."""
+
+    sentiment: Any
+    impact_score: Any
+
+    @classmethod
+    def from_signals(cls, signals: Sequence[Optional[NLPSignals]]) -> "NLPArrays":
+        return cls(
+            sentiment=np.array([s.sentiment if s is not None else 0.0 for s in signals], dtype=np.float64),
+            impact_score=np.array([s.impact_score if s is not None else 0.0 for s in signals], dtype=np.float64),
+        )
+
+    def score(self) -> Any:
+        impact = np.maximum(np.asarray(self.impact_score, dtype=np.float64), 0.0)
+        return np.asarray(self.sentiment, dtype=np.float64) * impact
+
+
+@dataclass(frozen=True)
+class SocialArrays:
+    """Column form of `SocialSignals` for a batch (scalars broadcast)."""
+
+    sentiment: Any
+    buzz_score: Any
+    volume_score: Any = 0.0
+
+    @classmethod
+    def from_signals(cls, signals: Sequence[Optional[SocialSignals]]) -> "SocialArrays":
+        return cls(
+            sentiment=np.array([s.sentiment if s is not None else 0.0 for s in signals], dtype=np.float64),
+            buzz_score=np.array([s.buzz_score if s is not None else 0.0 for s in signals], dtype=np.float64),
+            volume_score=np.array([s.volume_score if s is not None else 0.0 for s in signals], dtype=np.float64),
+        )
+
+    def score(self) -> Any:
+        buzz = np.maximum(np.asarray(self.buzz_score, dtype=np.float64), 0.0)
+        return np.asarray(self.sentiment, dtype=np.float64) * buzz
+
+
+def _at(values: Any, i: int) -> float:
+    arr = np.asarray(values)
+    return float(arr if arr.ndim == 0 else arr[i])
+
+
+class CompositeBatch:
+    """Scores of one batch plus lazy `CompositeSignal` views.
+
+    `quant` is what the scores were computed from: a `UniverseSignals`, an
+    `IndicatorFrame` (one symbol over time) or a list of `QuantSignals`.
+    `nlp` / `social` are a single snapshot, a per-entry list, or
+    `NLPArrays` / `SocialArrays` (materialized into neutral-flag snapshots).
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        score: np.ndarray,
+        direction: np.ndarray,
+        confidence: np.ndarray,
+        quant: Any,
+        nlp: Any = None,
+        social: Any = None,
+    ) -> None:
+        self.symbols = symbols
+        self.score = score
+        self.direction = direction
+        self.confidence = confidence
+        self.quant = quant
+        self.nlp = nlp
+        self.social = social
+
+    def __len__(self) -> int:
+        return int(self.score.shape[0])
+
+    def _symbol(self, i: int) -> str:
+        return self.symbols[0] if len(self.symbols) == 1 else self.symbols[i]
+
+    def _quant_row(self, i: int) -> QuantSignals:
+        q = self.quant
+        if isinstance(q, IndicatorFrame):
+            return q.row(i, self._symbol(i))
+        if hasattr(q, "row"):
+            return q.row(i)
+        return q[i]
+
+    def _nlp_row(self, i: int) -> NLPSignals:
+        n = self.nlp
+        if isinstance(n, NLPSignals):
+            return n
+        if isinstance(n, NLPArrays):
+            return NLPSignals(
+                entity=self._symbol(i),
+                sentiment=_at(n.sentiment, i),
+                event_flags={k: False for k in EVENT_KEYWORDS.keys()},
+                impact_score=_at(n.impact_score, i),
+                language=None,
+            )
+        if n is None:
+            return NLPSignals(
+                entity=self._symbol(i),
+                sentiment=0.0,
+                event_flags={k: False for k in EVENT_KEYWORDS.keys()},
+                impact_score=0.0,
+                language=None,
+            )
+        return n[i]
+
+    def _social_row(self, i: int) -> Optional[SocialSignals]:
+        s = self.social
+        if s is None or isinstance(s, SocialSignals):
+            return s
+        if isinstance(s, SocialArrays):
+            return SocialSignals(
+                symbol=self._symbol(i),
+                sentiment=_at(s.sentiment, i),
+                buzz_score=_at(s.buzz_score, i),
+                volume_score=_at(s.volume_score, i),
+            )
+        return s[i]
+
+    def direction_label(self, i: int) -> str:
+        return DIRECTION_LABELS[int(self.direction[i])]
+
+    def signal(self, i: int) -> CompositeSignal:
+        """Materialize entry `i` as a `CompositeSignal`."""
+        return CompositeSignal(
+            symbol=self._symbol(i),
+            quant=self._quant_row(i),
+            nlp=self._nlp_row(i),
+            score=float(self.score[i]),
+            direction=self.direction_label(i),
+            confidence=float(self.confidence[i]),
+            social=self._social_row(i),
+        )
+
+    def active(self, min_confidence: float = 0.0) -> np.ndarray:
+        """Indices of non-flat entries with confidence >= `min_confidence`."""
+        return np.flatnonzero((self.direction != DIR_FLAT) & (self.confidence >= min_confidence))
+
+    def signals(self, indices: Optional[Any] = None) -> Iterator[CompositeSignal]:
+        """Materialize the given entries (default: all non-flat ones)."""
+        for i in self.active() if indices is None else indices:
+            yield self.signal(int(i))
+
+
+def _score_of(src: Any, arrays_cls: Any) -> Any:
+    if src is None:
+        return 0.0
+    if isinstance(src, arrays_cls):
+        return src.score()
+    if isinstance(src, NLPSignals):
+        return src.sentiment * max(0.0, src.impact_score)
+    if isinstance(src, SocialSignals):
+        return src.sentiment * max(src.buzz_score, 0.0)
+    return arrays_cls.from_signals(src).score()
+
+
+def build_composite_signals_batch(
+    quant_arrays: Any,
+    nlp_arrays: Any = None,
+    social_arrays: Any = None,
+    weights: Optional[CompositeWeights] = None,
+    *,
+    symbols: Optional[Sequence[str]] = None,
+) -> CompositeBatch:
+    """Score a whole batch like `build_composite_signal`, without per-entry objects.
+
+    `quant_arrays` is a `UniverseSignals` (symbols at one time), an
+    `IndicatorFrame` (one symbol over time; pass `symbols=[symbol]`) or a
+    list of `QuantSignals`. Scores equal `build_composite_signal` entry by
+    entry.
+    """
+    if isinstance(quant_arrays, (list, tuple)):
+        rsi = np.array([q.rsi for q in quant_arrays], dtype=np.float64)
+        symbols = symbols or [q.symbol for q in quant_arrays]
+    else:
+        rsi = quant_arrays.rsi
+        symbols = symbols or list(getattr(quant_arrays, "symbols", [""]))
+
+    score, direction, confidence = composite_scores(
+        rsi,
+        _score_of(nlp_arrays, NLPArrays),
+        _score_of(social_arrays, SocialArrays),
+        weights,
+    )
+    n_long = int((direction == DIR_LONG).sum())
+    n_short = int((direction == DIR_SHORT).sum())
+    telemetry.record_counts(n_long, n_short, len(direction) - n_long - n_short, float(confidence.sum()))
+    return CompositeBatch(symbols, score, direction, confidence, quant_arrays, nlp_arrays, social_arrays)
+
+
+__all__ = [
+    "CompositeBatch",
+    "CompositeWeights",
+    "DIRECTION_LABELS",
+    "DIR_FLAT",
+    "DIR_LONG",
+    "DIR_SHORT",
+    "NLPArrays",
+    "SocialArrays",
+    "build_composite_signals_batch",
+    "composite_scores",
+]
@@ -0,0 +1,282 @@
+"""Link news items to universe symbols.
+
+`EntityIndex` is built once from `config/universe.json` (plus Alpaca asset
+names when available) and maps a headline to the symbols it mentions in a
+single pass over its tokens:
+
+- tickers match as upper-case tokens ("AAPL", "BRK.B") or cashtags
+  ("$F"); very short tickers and common acronyms ("CEO", "AI") match only
+  as cashtags so ordinary headlines do not light up half the universe.
+  In an all-caps sentence ("STOCKS RALLY AS FED HOLDS") upper case says
+  nothing, so only cashtags match there;
+- company / asset names match case-insensitively through a token trie
+  ("apple", "advanced micro devices", "bitcoin").
+
+Linked items are kept in bounded per-symbol buckets, so the NLP signal of a
+symbol is computed from its own items only instead of scanning every item
+for every symbol.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from sagetrade.signals.nlp import NLPSignals, _normalize_token, clean_text, get_signals
+from sagetrade.utils.logging import get_logger
+
+# Tokens keep inner "." "&" "-" and apostrophes ("BRK.B", "AT&T", "Coca-Cola");
+# group 1 captures a cashtag "$".
+_ENTITY_TOKEN_RE = re.compile(r"(\$)?([^\W_]+(?:[.&'’\-][^\W_]+)*)")
+
+# Upper-case words that are tickers of some listing but almost always mean
+# something else in a headline.
+COMMON_ACRONYMS = {
+    "A", "AI", "ALL", "ARE", "AT", "BE", "CEO", "CFO", "CPI", "ECB", "EPS", "ETF", "EU", "FDA", "FED", "FOMC",
+    "GDP", "IPO", "IT", "M&A", "NEW", "NOW", "NYSE", "ON", "ONE", "OPEN", "PMI", "Q1", "Q2", "Q3", "Q4", "SEC",
+    "SO", "TV", "UK", "UN", "US", "USA", "USD", "WELL",
+}
+
+# Name words that carry no identity ("Apple Inc. Common Stock" -> "apple").
+_NAME_CUT_WORDS = {
+    "common", "class", "ordinary", "american", "depositary", "depository", "warrant", "warrants", "unit", "units",
+    "right", "rights", "preferred", "series", "shares", "share", "notes", "sponsored", "adr", "ads",
+}
+_NAME_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited", "plc", "holding",
+    "holdings", "group", "sa", "ag", "nv", "se", "llc", "lp", "the", "trust", "fund", "etf", "and", "&",
+}
+
+# Crypto bases are usually written by name, which the universe does not carry.
+CRYPTO_NAMES: Dict[str, Tuple[str, ...]] = {
+    "BTC": ("bitcoin", "بيتكوين"),
+    "ETH": ("ethereum", "ether", "إيثريوم"),
+    "SOL": ("solana",),
+    "XRP": ("ripple",),
+    "DOGE": ("dogecoin",),
+    "LTC": ("litecoin",),
+    "ADA": ("cardano",),
+    "DOT": ("polkadot",),
+    "AVAX": ("avalanche",),
+    "LINK": ("chainlink",),
+}
+
+_QUOTES = ("USDT", "USDC", "USD", "BTC", "EUR")
+_SENTENCE_BREAK_RE = re.compile(r"[.!?:;|\n]\s")
+# A sentence with at least this many words, more than half of them upper
+# case, is treated as shouting.
+_SHOUT_MIN_WORDS = 2
+_END = "\0"
+
+
+def _norm(token: str) -> str:
+    token = _normalize_token(token)
+    for suffix in ("'s", "’s"):
+        if token.endswith(suffix):
+            return token[: -len(suffix)]
+    return token
+
+
+def name_aliases(name: str) -> List[str]:
+    """Searchable alias for an asset name ("Tesla, Inc. Common Stock" -> ["tesla"])."""
+    name = name.split(" / ")[0]  # crypto pairs: "Bitcoin / US Dollar"
+    words: List[str] = []
+    for _cash, tok in _ENTITY_TOKEN_RE.findall(name):
+        norm = _norm(tok)
+        if norm in _NAME_CUT_WORDS:
+            break
+        words.append(norm)
+    while words and words[-1] in _NAME_SUFFIXES:
+        words.pop()
+    while words and words[0] == "the":
+        words.pop(0)
+    if not words or (len(words) == 1 and len(words[0]) < 3):
+        return []
+    return [" ".join(words)]
+
+
+def base_ticker(symbol: str, strip_quote: bool = False) -> str:
+    """Ticker as written in news: "BTC/USD" -> "BTC", "AAPL" -> "AAPL".
+
+    With `strip_quote`, a glued pair is split too ("BTCUSD" -> "BTC"); only
+    use it for symbols known to be pairs.
+    """
+    if "/" in symbol:
+        return symbol.split("/", 1)[0]
+    if strip_quote:
+        for quote in _QUOTES:
+            if symbol.endswith(quote) and len(symbol) > len(quote) + 1:
+                return symbol[: -len(quote)]
+    return symbol
+
+
+class EntityIndex:
+    """Ticker/alias index with per-symbol item buckets.
+
+    Each bucket keeps the last `bucket_size` items linked to the symbol.
+    """
+
+    def __init__(self, bucket_size: int = 200, min_bare_ticker_len: int = 2) -> None:
+        self.bucket_size = max(1, bucket_size)
+        self.min_bare_ticker_len = min_bare_ticker_len
+        self._tickers: Dict[str, Set[str]] = {}
+        self._cashtag_only: Set[str] = set()
+        self._trie: Dict[str, dict] = {}
+        self._buckets: Dict[str, Deque[Dict[str, object]]] = {}
+        self.linked_items = 0
+        self.unlinked_items = 0
+
+    # -- building ---------------------------------------------------------
+
+    def add_symbol(
+        self,
+        symbol: str,
+        aliases: Iterable[str] = (),
+        name: Optional[str] = None,
+        ticker: Optional[str] = None,
+    ) -> None:
+        ticker = (ticker or base_ticker(symbol)).upper()
+        self._tickers.setdefault(ticker, set()).add(symbol)
+        if len(ticker) < self.min_bare_ticker_len or ticker in COMMON_ACRONYMS:
+            self._cashtag_only.add(ticker)
+        names = list(aliases) + list(CRYPTO_NAMES.get(ticker, ()))
+        if name:
+            names.extend(name_aliases(name))
+        for alias in names:
+            self.add_alias(alias, symbol)
+
+    def add_alias(self, alias: str, symbol: str) -> None:
+        tokens = [_norm(tok) for _cash, tok in _ENTITY_TOKEN_RE.findall(alias)]
+        if not tokens:
+            return
+        node = self._trie
+        for tok in tokens:
+            node = node.setdefault(tok, {})
+        node.setdefault(_END, set()).add(symbol)
+
+    @classmethod
+    def from_universe(
+        cls,
+        path: str = "config/universe.json",
+        *,
+        names: Optional[Dict[str, str]] = None,
+        symbols: Optional[Iterable[str]] = None,
+        **kwargs: int,
+    ) -> "EntityIndex":
+        """Index every universe symbol (and any extra `symbols`).
+
+        Names come from the universe entries' `name` / `aliases` fields
+        (written by `scripts/update_universe_from_alpaca.py`) or from `names`,
+        e.g. `{a.symbol: a.name for a in AlpacaAssetsClient().list_assets()}`.
+        """
+        index = cls(**kwargs)
+        names = names or {}
+        raw: Dict[str, dict] = {}
+        p = Path(path)
+        if p.exists():
+            raw = json.loads(p.read_text(encoding="utf-8")).get("symbols", {})
+        for sym, cfg in raw.items():
+            index.add_symbol(sym, cfg.get("aliases") or (), names.get(sym) or cfg.get("name"))
+        for sym in symbols or ():
+            if sym not in raw:
+                index.add_symbol(sym, (), names.get(sym), ticker=base_ticker(sym, strip_quote=True))
+        logger = get_logger(__name__)
+        logger.info("event=entity_index_built symbols=%d tickers=%d path=%s", len(raw), len(index._tickers), path)
+        if raw and not names and not any(cfg.get("name") or cfg.get("aliases") for cfg in raw.values()):
+            logger.warning(
+                "event=entity_index_no_names path=%s hint=run scripts/update_universe_from_alpaca.py to add names",
+                path,
+            )
+        return index
+
+    # -- linking ----------------------------------------------------------
+
+    @staticmethod
+    def _shouting(text: str, matches: List["re.Match[str]"]) -> List[bool]:
+        """Per token: does it sit in a sentence written mostly in upper case?"""
+        out: List[bool] = []
+        start = 0
+        prev_end = 0
+        words = upper = 0
+        for i, m in enumerate(matches):
+            if i and _SENTENCE_BREAK_RE.search(text, prev_end, m.start() + 1):
+                shout = words >= _SHOUT_MIN_WORDS and upper * 2 > words
+                out.extend([shout] * (i - start))
+                start, words, upper = i, 0, 0
+            tok = m.group(2)
+            if any(ch.isalpha() for ch in tok):
+                words += 1
+                if tok.isupper():
+                    upper += 1
+            prev_end = m.end()
+        shout = words >= _SHOUT_MIN_WORDS and upper * 2 > words
+        out.extend([shout] * (len(matches) - start))
+        return out
+
+    def link(self, text: str) -> Set[str]:
+        """Symbols mentioned in `text` (one pass over its tokens)."""
+        found: Set[str] = set()
+        matches = list(_ENTITY_TOKEN_RE.finditer(text))
+        tokens = [m.groups() for m in matches]
+        norms = [_norm(tok) for _cash, tok in tokens]
+        shouting = self._shouting(text, matches)
+        trie = self._trie
+        for i, (cash, tok) in enumerate(tokens):
+            if cash or (tok.isupper() and not shouting[i]):
+                ticker = tok.upper()
+                syms = self._tickers.get(ticker)
+                if syms is not None and (cash or ticker not in self._cashtag_only):
+                    found.update(syms)
+            node = trie.get(norms[i])
+            j = i + 1
+            while node is not None:
+                if _END in node:
+                    found.update(node[_END])
+                if j >= len(norms):
+                    break
+                node = node.get(norms[j])
+                j += 1
+        return found
+
+    def add(self, item: Dict[str, object]) -> Set[str]:
+        """Link one item and append it to the bucket of every symbol it mentions."""
+        title = str(item.get("title", "") or "")
+        desc = str(item.get("description", "") or "")
+        symbols = self.link(clean_text(f"{title}. {desc}"))
+        for sym in symbols:
+            bucket = self._buckets.get(sym)
+            if bucket is None:
+                bucket = deque(maxlen=self.bucket_size)
+                self._buckets[sym] = bucket
+            bucket.append(item)
+        if symbols:
+            self.linked_items += 1
+        else:
+            self.unlinked_items += 1
+        return symbols
+
+    def update(self, items: Iterable[Dict[str, object]]) -> Set[str]:
+        """Add items; returns the symbols whose buckets changed."""
+        touched: Set[str] = set()
+        for item in items:
+            touched |= self.add(item)
+        return touched
+
+    def items_for(self, symbol: str) -> List[Dict[str, object]]:
+        return list(self._buckets.get(symbol, ()))
+
+    def symbols_with_news(self) -> List[str]:
+        return sorted(self._buckets)
+
+    def signals(self, symbol: str) -> Optional[NLPSignals]:
+        """NLP signals over the symbol's own items; None if nothing mentions it."""
+        bucket = self._buckets.get(symbol)
+        if not bucket:
+            return None
+        return get_signals(symbol, bucket)
+
+
+__all__ = ["COMMON_ACRONYMS", "CRYPTO_NAMES", "EntityIndex", "base_ticker", "name_aliases"]
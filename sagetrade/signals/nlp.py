@@ -1,41 +1,185 @@
+import hashlib
 import math
 import re
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sagetrade.signals.nlp_cache import NLPResultCache
 
 
 ARABIC_RANGE = re.compile(r"[\u0600-\u06FF]")
 
 POSITIVE_WORDS = {
     "profit",
+    "profits",
     "surge",
+    "surges",
+    "surged",
     "gain",
+    "gains",
+    "gained",
     "bull",
+    "bullish",
     "upgrade",
+    "upgraded",
     "positive",
     "rally",
+    "rallies",
+    "rallied",
     "upswing",
-    "gains",
+    # Arabic
+    "ربح",
+    "أرباح",
+    "مكاسب",
+    "ارتفاع",
+    "صعود",
+    "نمو",
+    "إيجابي",
+    "قفزة",
 }
 
 NEGATIVE_WORDS = {
     "loss",
+    "losses",
     "drop",
+    "drops",
+    "dropped",
     "fall",
+    "falls",
+    "fell",
     "bear",
+    "bearish",
     "downgrade",
+    "downgraded",
     "negative",
     "selloff",
-    "losses",
+    "sell-off",
     "decline",
+    "declines",
+    "declined",
+    # Arabic
+    "خسارة",
+    "خسائر",
+    "انخفاض",
+    "هبوط",
+    "تراجع",
+    "سلبي",
+    "انهيار",
 }
 
 EVENT_KEYWORDS = {
-    "earnings": {"earnings", "results", "quarter", "q1", "q2", "q3", "q4"},
-    "ma": {"m&a", "merger", "acquisition"},
-    "guidance": {"guidance", "forecast", "outlook"},
+    "earnings": {"earnings", "results", "quarter", "q1", "q2", "q3", "q4", "نتائج", "الربع", "فصلية"},
+    "ma": {"m&a", "merger", "acquisition", "اندماج", "استحواذ"},
+    "guidance": {"guidance", "forecast", "outlook", "توقعات", "توجيهات"},
 }
 
+# Words, keeping inner "&" / apostrophes ("m&a", "company's"); "_" is a separator.
+_TOKEN_RE = re.compile(r"[^\W_]+(?:[&'’][^\W_]+)*")
+_ARABIC_MARKS = re.compile(r"[\u064B-\u065F\u0670\u0640]")  # harakat, dagger alef, tatweel
+_ARABIC_CHAR_MAP = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ة": "ه"})
+# Clitic prefixes stripped when a token does not match as-is (longest first).
+_ARABIC_PREFIXES = ("وال", "بال", "فال", "كال", "لل", "ال", "و", "ف", "ب", "ل", "ك")
+
+
+def _normalize_token(token: str) -> str:
+    token = token.lower()
+    if ARABIC_RANGE.search(token):
+        token = _ARABIC_MARKS.sub("", token).translate(_ARABIC_CHAR_MAP)
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens; Arabic tokens are normalized (diacritics, alef/yaa/taa forms)."""
+    return [_normalize_token(t) for t in _TOKEN_RE.findall(text)]
+
+
+def _arabic_stems(token: str) -> List[str]:
+    return [token[len(p):] for p in _ARABIC_PREFIXES if token.startswith(p) and len(token) - len(p) >= 2]
+
+
+class KeywordMatcher:
+    """Whole-word / phrase matcher over a labelled lexicon, compiled once.
+
+    Every lexicon entry is tokenized like the text, so entries match on
+    token boundaries only ("gain" does not match "again") and multi-word
+    entries match as consecutive tokens. Matching is one pass over the
+    text's tokens with dict lookups, independent of lexicon size. Arabic
+    tokens that do not match as-is are retried without clitic prefixes
+    ("والأرباح" -> "أرباح").
+    """
+
+    def __init__(self, lexicon: Dict[str, Iterable[str]]) -> None:
+        self._index: Dict[Tuple[str, ...], Set[str]] = {}
+        self.max_len = 1
+        for label, entries in lexicon.items():
+            for entry in entries:
+                key = tuple(tokenize(entry))
+                if not key:
+                    continue
+                self._index.setdefault(key, set()).add(label)
+                self.max_len = max(self.max_len, len(key))
+
+    def match(self, text: str) -> Dict[str, Set[Tuple[str, ...]]]:
+        """Return {label: distinct lexicon entries found in `text`}."""
+        tokens = tokenize(text)
+        index = self._index
+        found: Dict[str, Set[Tuple[str, ...]]] = {}
+        n_tokens = len(tokens)
+        for i, tok in enumerate(tokens):
+            key: Tuple[str, ...] = (tok,)
+            labels = index.get(key)
+            if labels is None and ARABIC_RANGE.search(tok):
+                for stem in _arabic_stems(tok):
+                    labels = index.get((stem,))
+                    if labels is not None:
+                        key = (stem,)
+                        break
+            if labels is not None:
+                for label in labels:
+                    found.setdefault(label, set()).add(key)
+            for n in range(2, min(self.max_len, n_tokens - i) + 1):
+                phrase = tuple(tokens[i : i + n])
+                labels = index.get(phrase)
+                if labels is not None:
+                    for label in labels:
+                        found.setdefault(label, set()).add(phrase)
+        return found
+
+
+_MATCHER: Optional[KeywordMatcher] = None
+_MATCHER_SIGNATURE: Optional[Tuple[int, ...]] = None
+
+
+def _lexicon_signature() -> Tuple[int, ...]:
+    return (len(POSITIVE_WORDS), len(NEGATIVE_WORDS)) + tuple(len(v) for v in EVENT_KEYWORDS.values()) + (
+        len(EVENT_KEYWORDS),
+    )
+
+
+def lexicon_version() -> str:
+    """Content hash of the sentiment/event lexicons; persisted scores are only valid for the same one."""
+    h = hashlib.sha1()
+    for label, entries in [("+", POSITIVE_WORDS), ("-", NEGATIVE_WORDS)] + sorted(EVENT_KEYWORDS.items()):
+        h.update(label.encode("utf-8") + b"\0")
+        for entry in sorted(entries):
+            h.update(entry.encode("utf-8") + b"\0")
+        h.update(b"\1")
+    return h.hexdigest()
+
+
+def get_matcher() -> KeywordMatcher:
+    """Matcher for the module lexicons, rebuilt if they were extended."""
+    global _MATCHER, _MATCHER_SIGNATURE
+    signature = _lexicon_signature()
+    if _MATCHER is None or signature != _MATCHER_SIGNATURE:
+        lexicon: Dict[str, Iterable[str]] = {"+": POSITIVE_WORDS, "-": NEGATIVE_WORDS}
+        for name, kws in EVENT_KEYWORDS.items():
+            lexicon["event:" + name] = kws
+        _MATCHER = KeywordMatcher(lexicon)
+        _MATCHER_SIGNATURE = signature
+    return _MATCHER
+
 
 def clean_text(text: str) -> str:
     text = text.replace("\n", " ").replace("\r", " ")
@@ -49,23 +193,28 @@ def detect_language(text: str) -> str:
     return "en"
 
 
+def analyze_text(text: str) -> Tuple[float, Dict[str, bool]]:
+    """Sentiment in [-1, 1] and event flags from a single matcher pass.
+
+    Sentiment is (pos - neg) / (pos + neg) over the distinct positive and
+    negative lexicon entries present in the text.
+    """
+    found = get_matcher().match(text)
+    pos = len(found.get("+", ()))
+    neg = len(found.get("-", ()))
+    score = 0.0
+    if pos or neg:
+        score = max(-1.0, min(1.0, (pos - neg) / float(pos + neg)))
+    events = {name: ("event:" + name) in found for name in EVENT_KEYWORDS}
+    return score, events
+
+
 def sentiment_score(text: str) -> float:
-    text_l = text.lower()
-    pos = sum(1 for w in POSITIVE_WORDS if w in text_l)
-    neg = sum(1 for w in NEGATIVE_WORDS if w in text_l)
-    if pos == 0 and neg == 0:
-        return 0.0
-    total = pos + neg
-    score = (pos - neg) / float(total)
-    return max(-1.0, min(1.0, score))
+    return analyze_text(text)[0]
 
 
 def detect_events(text: str) -> Dict[str, bool]:
-    t = text.lower()
-    events: Dict[str, bool] = {}
-    for name, kws in EVENT_KEYWORDS.items():
-        events[name] = any(kw.lower() in t for kw in kws)
-    return events
+    return analyze_text(text)[1]
 
 
 @dataclass
@@ -86,34 +235,40 @@ class NLPSignals:
         }
 
 
-def get_signals(entity: str, items: Iterable[Dict[str, object]]) -> NLPSignals:
-    """Aggregate sentiment/events for a given entity over a list of text items.
+@dataclass(frozen=True)
+class ItemScore:
+    """NLP result for one text item (what the cache stores)."""
 
-    For MVP, `entity` is informational only; items are assumed already filtered.
-    Each item is expected to have `title` and/or `description` fields.
-    """
-    sentiments: List[float] = []
-    agg_events: Dict[str, int] = {k: 0 for k in EVENT_KEYWORDS.keys()}
-    lang_counts: Dict[str, int] = {}
+    sentiment: float
+    events: Tuple[str, ...]  # names of the EVENT_KEYWORDS groups present
+    language: str
+
+
+def item_text(item: Dict[str, object]) -> str:
+    """Cleaned "title. description" text of an item ("" if both are empty)."""
+    title = str(item.get("title", "") or "")
+    desc = str(item.get("description", "") or "")
+    return clean_text(f"{title}. {desc}").strip()
 
-    for item in items:
-        title = str(item.get("title", "") or "")
-        desc = str(item.get("description", "") or "")
-        text = clean_text(f"{title}. {desc}").strip()
-        if not text:
-            continue
 
-        lang = detect_language(text)
-        lang_counts[lang] = lang_counts.get(lang, 0) + 1
+def score_text(text: str) -> ItemScore:
+    s, events = analyze_text(text)
+    return ItemScore(
+        sentiment=s,
+        events=tuple(name for name, hit in events.items() if hit),
+        language=detect_language(text),
+    )
 
-        s = sentiment_score(text)
-        sentiments.append(s)
-        events = detect_events(text)
-        for k, v in events.items():
-            if v:
-                agg_events[k] += 1
 
-    if not sentiments:
+def summarize_scores(
+    entity: str,
+    count: int,
+    sentiment_sum: float,
+    event_counts: Dict[str, int],
+    lang_counts: Dict[str, int],
+) -> NLPSignals:
+    """Build `NLPSignals` from running totals (shared by `get_signals` and the window aggregator)."""
+    if count <= 0:
         return NLPSignals(
             entity=entity,
             sentiment=0.0,
@@ -122,17 +277,15 @@ def get_signals(entity: str, items: Iterable[Dict[str, object]]) -> NLPSignals:
             language=None,
         )
 
-    avg_sent = sum(sentiments) / float(len(sentiments))
-    max_event_count = max(agg_events.values()) if agg_events else 0
-    event_present = max_event_count > 0
-
+    avg_sent = sentiment_sum / float(count)
+    flags = {k: event_counts.get(k, 0) > 0 for k in EVENT_KEYWORDS.keys()}
+    event_present = any(flags.values())
     impact_score = min(1.0, abs(avg_sent) * 0.7 + (0.3 if event_present else 0.0))
 
     dominant_lang = None
-    if lang_counts:
-        dominant_lang = max(lang_counts.items(), key=lambda kv: kv[1])[0]
-
-    flags = {k: v > 0 for k, v in agg_events.items()}
+    live_langs = [kv for kv in lang_counts.items() if kv[1] > 0]
+    if live_langs:
+        dominant_lang = max(live_langs, key=lambda kv: kv[1])[0]
 
     return NLPSignals(
         entity=entity,
@@ -141,3 +294,37 @@ def get_signals(entity: str, items: Iterable[Dict[str, object]]) -> NLPSignals:
         impact_score=impact_score,
         language=dominant_lang,
     )
+
+
+def get_signals(
+    entity: str, items: Iterable[Dict[str, object]], cache: Optional["NLPResultCache"] = None
+) -> NLPSignals:
+    """Aggregate sentiment/events for a given entity over a list of text items.
+
+    For MVP, `entity` is informational only; items are assumed already filtered.
+    Each item is expected to have `title` and/or `description` fields.
+    Per-item results come from `cache` (default: the process-wide
+    `NLPResultCache`), so items seen before are not re-scored.
+    """
+    if cache is None:
+        from sagetrade.signals.nlp_cache import get_default_cache
+
+        cache = get_default_cache()
+
+    count = 0
+    sentiment_sum = 0.0
+    agg_events: Dict[str, int] = {k: 0 for k in EVENT_KEYWORDS.keys()}
+    lang_counts: Dict[str, int] = {}
+
+    for item in items:
+        text = item_text(item)
+        if not text:
+            continue
+        score = cache.score_text(text)
+        count += 1
+        sentiment_sum += score.sentiment
+        lang_counts[score.language] = lang_counts.get(score.language, 0) + 1
+        for name in score.events:
+            agg_events[name] = agg_events.get(name, 0) + 1
+
+    return summarize_scores(entity, count, sentiment_sum, agg_events, lang_counts)
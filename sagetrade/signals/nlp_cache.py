@@ -0,0 +1,266 @@
+"""Per-item NLP result cache and incremental window aggregation.
+
+News items are re-read on every refresh but rarely change, so scoring is
+memoized by a hash of the item's cleaned text (`NLPResultCache`, a bounded
+LRU that can be persisted as JSONL, tagged with the lexicon version it was
+scored with). `NLPWindowAggregator` keeps running
+totals over a sliding time window: adding or evicting an item updates the
+sentiment sum, event counts and language counts in O(1), and `signals()`
+builds `NLPSignals` from those totals without touching the items again.
+Refresh cost therefore depends only on newly arrived news.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterable, Optional, Set, Tuple
+
+from sagetrade.signals.nlp import (
+    EVENT_KEYWORDS,
+    ItemScore,
+    NLPSignals,
+    item_text,
+    lexicon_version,
+    score_text,
+    summarize_scores,
+)
+from sagetrade.utils.clock import get_clock
+from sagetrade.utils.logging import get_logger
+
+
+def content_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class NLPResultCache:
+    """Bounded LRU of `ItemScore` keyed by the SHA1 of the cleaned item text.
+
+    With `path`, existing entries are loaded on construction and `save()`
+    writes the cache back (atomically, most recently used last). The file
+    starts with a header line carrying `lexicon_version()`; a file scored
+    with other lexicons (or without a header) is not loaded.
+    """
+
+    def __init__(self, max_items: int = 50_000, path: Optional[str] = None) -> None:
+        self.max_items = max(1, max_items)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, ItemScore]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._logger = get_logger(__name__)
+        if path:
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[ItemScore]:
+        with self._lock:
+            score = self._entries.get(key)
+            if score is not None:
+                self._entries.move_to_end(key)
+            return score
+
+    def put(self, key: str, score: ItemScore) -> None:
+        with self._lock:
+            self._entries[key] = score
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+
+    def score_text(self, text: str, key: Optional[str] = None) -> ItemScore:
+        """Cached `score_text`; `key` may be passed if the caller already hashed `text`."""
+        key = key or content_key(text)
+        score = self.get(key)
+        if score is not None:
+            self.hits += 1
+            return score
+        self.misses += 1
+        score = score_text(text)
+        self.put(key, score)
+        return score
+
+    def score_item(self, item: Dict[str, object]) -> Optional[Tuple[str, ItemScore]]:
+        """(key, score) for a news item, or None if it has no text."""
+        text = item_text(item)
+        if not text:
+            return None
+        key = content_key(text)
+        return key, self.score_text(text, key)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def load(self, path: Optional[str] = None) -> int:
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return 0
+        loaded = 0
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                header = json.loads(f.readline() or "{}")
+            except Exception:
+                header = {}
+            version = header.get("lexicon") if isinstance(header, dict) else None
+            if version != lexicon_version():
+                self._logger.warning(
+                    "event=nlp_cache_stale path=%s lexicon=%s expected=%s", path, version, lexicon_version()
+                )
+                return 0
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = json.loads(line)
+                    score = ItemScore(
+                        sentiment=float(rec["s"]),
+                        events=tuple(rec.get("e") or ()),
+                        language=str(rec.get("l") or "en"),
+                    )
+                    self.put(str(rec["k"]), score)
+                    loaded += 1
+                except Exception:
+                    continue
+        self._logger.info("event=nlp_cache_loaded path=%s entries=%d", path, loaded)
+        return loaded
+
+    def save(self, path: Optional[str] = None) -> int:
+        path = path or self.path
+        if not path:
+            return 0
+        with self._lock:
+            entries = list(self._entries.items())
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"lexicon": lexicon_version()}) + "\n")
+            for key, score in entries:
+                rec = {"k": key, "s": score.sentiment, "e": list(score.events), "l": score.language}
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        os.replace(tmp, path)
+        return len(entries)
+
+
+_DEFAULT_CACHE: Optional[NLPResultCache] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_default_cache() -> NLPResultCache:
+    """Process-wide cache used by `get_signals` (size from NLP_CACHE_SIZE)."""
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        with _DEFAULT_LOCK:
+            if _DEFAULT_CACHE is None:
+                _DEFAULT_CACHE = NLPResultCache(max_items=int(os.getenv("NLP_CACHE_SIZE", "50000")))
+    return _DEFAULT_CACHE
+
+
+class NLPWindowAggregator:
+    """Running NLP totals over the items of the last `window_sec` seconds.
+
+    Items are expected in roughly non-decreasing `ts` order (the order they
+    are collected in); eviction pops from the oldest end. Identical texts
+    are counted once while they are inside the window. `window_sec=None`
+    keeps items until `max_items` pushes them out (both None: keep all).
+    """
+
+    def __init__(
+        self,
+        entity: str = "market",
+        window_sec: Optional[float] = 24 * 3600.0,
+        max_items: Optional[int] = None,
+        cache: Optional[NLPResultCache] = None,
+    ) -> None:
+        self.entity = entity
+        self.window_sec = window_sec
+        self.max_items = max_items
+        self.cache = cache if cache is not None else get_default_cache()
+        self._items: Deque[Tuple[float, str, ItemScore]] = deque()
+        self._keys: Set[str] = set()
+        self._sentiment_sum = 0.0
+        self._event_counts: Dict[str, int] = {k: 0 for k in EVENT_KEYWORDS.keys()}
+        self._lang_counts: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _apply(self, score: ItemScore, sign: int) -> None:
+        self._sentiment_sum += sign * score.sentiment
+        self._lang_counts[score.language] = self._lang_counts.get(score.language, 0) + sign
+        for name in score.events:
+            self._event_counts[name] = self._event_counts.get(name, 0) + sign
+
+    def _pop_oldest(self) -> None:
+        _, key, score = self._items.popleft()
+        self._keys.discard(key)
+        self._apply(score, -1)
+
+    def add(self, item: Dict[str, object], ts: Optional[float] = None) -> bool:
+        """Add one item; False if it has no text or is already in the window."""
+        scored = self.cache.score_item(item)
+        if scored is None:
+            return False
+        key, score = scored
+        if key in self._keys:
+            return False
+        if ts is None:
+            raw_ts = item.get("ts")
+            ts = float(raw_ts) if isinstance(raw_ts, (int, float)) else get_clock().time()
+        self._items.append((ts, key, score))
+        self._keys.add(key)
+        self._apply(score, +1)
+        if self.max_items is not None:
+            while len(self._items) > self.max_items:
+                self._pop_oldest()
+        return True
+
+    def clear(self) -> None:
+        """Drop every item (e.g. when the source file rolls over to a new day)."""
+        self._items.clear()
+        self._keys.clear()
+        self._sentiment_sum = 0.0
+        self._event_counts = {k: 0 for k in EVENT_KEYWORDS.keys()}
+        self._lang_counts = {}
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Drop items older than `window_sec` before `now`; returns how many."""
+        if self.window_sec is None:
+            return 0
+        cutoff = (get_clock().time() if now is None else now) - self.window_sec
+        n = 0
+        while self._items and self._items[0][0] < cutoff:
+            self._pop_oldest()
+            n += 1
+        # Keep float drift from accumulating once the window empties.
+        if not self._items:
+            self._sentiment_sum = 0.0
+        return n
+
+    def update(self, items: Iterable[Dict[str, object]], now: Optional[float] = None) -> int:
+        """Add new items, then evict expired ones; returns the number added."""
+        added = sum(1 for item in items if self.add(item))
+        self.evict(now)
+        return added
+
+    def signals(self) -> NLPSignals:
+        return summarize_scores(
+            self.entity,
+            len(self._items),
+            self._sentiment_sum,
+            self._event_counts,
+            self._lang_counts,
+        )
+
+
+__all__ = [
+    "NLPResultCache",
+    "NLPWindowAggregator",
+    "content_key",
+    "get_default_cache",
+]
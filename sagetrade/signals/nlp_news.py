@@ -3,11 +3,14 @@ from __future__ import annotations
 """Compatibility wrapper for news/NLP signals.
 
 This module re-exports the existing NLPSignals dataclass from `nlp` and
-provides a neutral placeholder `compute_nlp_news_signals` helper so that
-documentation and code can converge on a single interface.
+provides `compute_nlp_news_signals`, which returns the signals of the
+installed streaming `NewsSignalAggregator` (neutral values when none is
+installed), so that documentation and code can converge on a single
+interface.
 """
 
 from sagetrade.signals.nlp import NLPSignals
+from sagetrade.signals.nlp_stream import get_news_aggregator
 from sagetrade.utils.logging import get_logger
 
 
@@ -15,12 +18,17 @@ logger = get_logger(__name__)
 
 
 def compute_nlp_news_signals(entity: str) -> NLPSignals:
-    """Return neutral NLP/news signals for the given entity.
+    """Return NLP/news signals for the given entity.
 
-    Real implementations can later call into `sagetrade.signals.nlp.get_signals`
-    with actual text items from ingestion. For now we keep the shape stable
-    and log debug information for observability.
+    If a streaming `NewsSignalAggregator` is installed (see
+    `sagetrade.signals.nlp_stream.set_news_aggregator`), its current
+    recency-weighted signals for `entity` are returned (market-wide ones
+    when nothing mentions the entity). Otherwise the values are neutral.
     """
+    aggregator = get_news_aggregator()
+    if aggregator is not None:
+        return aggregator.signals_for(entity)
+
     sentiment = 0.0
     impact_score = 0.0
     event_flags = {"earnings": False, "ma": False, "guidance": False}
@@ -0,0 +1,309 @@
+"""Streaming, exponentially time-decayed news signals per entity.
+
+`NewsSignalAggregator` consumes scored news items (from `news.*` queue
+topics or direct calls) and keeps, per entity, decayed sums of item weight,
+sentiment, event hits and language. Every sum is scaled by
+`0.5 ** (dt / half_life_sec)` when time moves on, so adding an item and
+reading the current signal are both O(1) and no history is kept:
+
+    sentiment = decayed_sentiment_sum / (decayed_weight + prior_weight)
+
+`prior_weight` acts as a neutral pseudo-count, so a single fresh +1 item
+gives 1 / (1 + prior_weight) (0.5 by default) rather than a saturated 1.0,
+and stale news fades towards 0 instead of holding its last average. An
+event flag is set while its decayed count is at least `event_threshold`.
+Impact uses the same formula as `get_signals`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sagetrade.messaging.queue import MessageQueue
+from sagetrade.signals.nlp import EVENT_KEYWORDS, ItemScore, NLPSignals
+from sagetrade.signals.nlp_cache import NLPResultCache, get_default_cache
+from sagetrade.utils.clock import Clock, get_clock
+from sagetrade.utils.logging import get_logger, log_event
+from sagetrade.utils.metrics import get_registry
+
+MARKET_ENTITY = "market"
+
+
+@dataclass
+class DecayedNLPState:
+    """Decayed sums for one entity, valid as of `ts`."""
+
+    ts: float = 0.0
+    weight: float = 0.0
+    sentiment_sum: float = 0.0
+    events: Dict[str, float] = field(default_factory=dict)
+    languages: Dict[str, float] = field(default_factory=dict)
+    items: int = 0  # undecayed count, for observability
+
+    def decay_to(self, ts: float, half_life_sec: float) -> None:
+        if ts <= self.ts:
+            return
+        if self.weight > 0.0:
+            f = 0.5 ** ((ts - self.ts) / half_life_sec)
+            self.weight *= f
+            self.sentiment_sum *= f
+            for k in self.events:
+                self.events[k] *= f
+            for k in self.languages:
+                self.languages[k] *= f
+        self.ts = ts
+
+    def add(self, score: ItemScore, ts: float, half_life_sec: float) -> None:
+        self.decay_to(ts, half_life_sec)
+        # A late item (older than the state) enters already decayed.
+        w = 0.5 ** ((self.ts - ts) / half_life_sec) if ts < self.ts else 1.0
+        self.weight += w
+        self.sentiment_sum += w * score.sentiment
+        for name in score.events:
+            self.events[name] = self.events.get(name, 0.0) + w
+        self.languages[score.language] = self.languages.get(score.language, 0.0) + w
+        self.items += 1
+
+
+class NewsSignalAggregator:
+    """Per-entity recency-weighted NLP signals, updated item by item.
+
+    Every item updates the `market` entity; with an `entity_index`
+    (`sagetrade.signals.entities.EntityIndex`) it also updates each symbol
+    the item mentions. Item timestamps default to the item's `ts` field.
+    """
+
+    def __init__(
+        self,
+        half_life_sec: float = 3600.0,
+        *,
+        prior_weight: float = 1.0,
+        event_threshold: float = 0.5,
+        entity_index: Optional[object] = None,
+        cache: Optional[NLPResultCache] = None,
+        clock: Optional[Clock] = None,
+        checkpoint_path: Optional[str] = None,
+    ) -> None:
+        if half_life_sec <= 0:
+            raise ValueError("half_life_sec must be > 0.")
+        self.half_life_sec = float(half_life_sec)
+        self.prior_weight = max(1e-9, float(prior_weight))
+        self.event_threshold = event_threshold
+        self.entity_index = entity_index
+        self.cache = cache if cache is not None else get_default_cache()
+        self.clock = clock
+        self.checkpoint_path = checkpoint_path
+        self.states: Dict[str, DecayedNLPState] = {}
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._logger = get_logger(__name__)
+        self._items_total = get_registry().counter("news_stream_items_total", "News items folded into decayed NLP state")
+
+    def _now(self) -> float:
+        return (self.clock or get_clock()).time()
+
+    # -- updates ----------------------------------------------------------
+
+    def on_item(self, item: Dict[str, object], ts: Optional[float] = None) -> List[str]:
+        """Fold one news item in; returns the entities it updated."""
+        scored = self.cache.score_item(item)
+        if scored is None:
+            return []
+        _key, score = scored
+        if ts is None:
+            raw_ts = item.get("ts")
+            ts = float(raw_ts) if isinstance(raw_ts, (int, float)) else self._now()
+        entities = [MARKET_ENTITY]
+        if self.entity_index is not None:
+            title = str(item.get("title", "") or "")
+            desc = str(item.get("description", "") or "")
+            entities.extend(sorted(self.entity_index.link(f"{title}. {desc}")))  # type: ignore[attr-defined]
+        with self._lock:
+            for entity in entities:
+                state = self.states.get(entity)
+                if state is None:
+                    state = DecayedNLPState(ts=ts)
+                    self.states[entity] = state
+                state.add(score, ts, self.half_life_sec)
+        self._items_total.inc()
+        return entities
+
+    def update(self, items: Iterable[Dict[str, object]]) -> int:
+        n = 0
+        for item in items:
+            if self.on_item(item):
+                n += 1
+        return n
+
+    # -- reads ------------------------------------------------------------
+
+    def signals(self, entity: str = MARKET_ENTITY, now: Optional[float] = None) -> NLPSignals:
+        """Decayed signals of `entity` at `now` (neutral if it has no news)."""
+        flags = {k: False for k in EVENT_KEYWORDS.keys()}
+        with self._lock:
+            state = self.states.get(entity)
+            if state is None or state.weight <= 0.0:
+                return NLPSignals(entity=entity, sentiment=0.0, event_flags=flags, impact_score=0.0, language=None)
+            now = self._now() if now is None else now
+            f = 0.5 ** ((now - state.ts) / self.half_life_sec) if now > state.ts else 1.0
+            weight = state.weight * f
+            sentiment = state.sentiment_sum * f / (weight + self.prior_weight)
+            for name, count in state.events.items():
+                if count * f >= self.event_threshold:
+                    flags[name] = True
+            language = max(state.languages.items(), key=lambda kv: kv[1])[0] if state.languages else None
+
+        impact = min(1.0, abs(sentiment) * 0.7 + (0.3 if any(flags.values()) else 0.0))
+        return NLPSignals(entity=entity, sentiment=sentiment, event_flags=flags, impact_score=impact, language=language)
+
+    def signals_for(self, symbol: str, now: Optional[float] = None) -> NLPSignals:
+        """Signals of `symbol` if any news mentioned it, else the market-wide ones."""
+        entity = symbol if symbol in self.states else MARKET_ENTITY
+        return self.signals(entity, now)
+
+    # -- checkpoints ------------------------------------------------------
+
+    def save(self, path: Optional[str] = None) -> int:
+        path = path or self.checkpoint_path
+        if not path:
+            return 0
+        with self._lock:
+            payload = {
+                "half_life_sec": self.half_life_sec,
+                "states": {
+                    entity: {
+                        "ts": s.ts,
+                        "weight": s.weight,
+                        "sentiment_sum": s.sentiment_sum,
+                        "events": s.events,
+                        "languages": s.languages,
+                        "items": s.items,
+                    }
+                    for entity, s in self.states.items()
+                },
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Unique per writer: the consumer thread and the caller may save at once.
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return len(payload["states"])
+
+    def load(self, path: Optional[str] = None) -> int:
+        path = path or self.checkpoint_path
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except Exception as exc:
+            self._logger.warning("event=news_stream_checkpoint_invalid path=%s error=%s", path, exc)
+            return 0
+        states = {}
+        for entity, raw in (payload.get("states") or {}).items():
+            states[entity] = DecayedNLPState(
+                ts=float(raw.get("ts", 0.0)),
+                weight=float(raw.get("weight", 0.0)),
+                sentiment_sum=float(raw.get("sentiment_sum", 0.0)),
+                events={k: float(v) for k, v in (raw.get("events") or {}).items()},
+                languages={k: float(v) for k, v in (raw.get("languages") or {}).items()},
+                items=int(raw.get("items", 0)),
+            )
+        with self._lock:
+            self.states = states
+        return len(states)
+
+    # -- queue consumption ------------------------------------------------
+
+    def run(
+        self,
+        queue: MessageQueue,
+        topics: Sequence[str] = ("news.rss",),
+        *,
+        batch_size: int = 100,
+        poll_ms: int = 200,
+        checkpoint_every_sec: float = 60.0,
+    ) -> int:
+        """Consume news topics until `stop()`; returns the number of items folded in.
+
+        Topics are polled round-robin with `consume_batch`; the state is
+        checkpointed every `checkpoint_every_sec` (if a path is set) and on exit.
+        """
+        if not topics:
+            raise ValueError("NewsSignalAggregator.run needs at least one topic.")
+        if self._thread is not threading.current_thread():
+            self._running = True  # direct call; `start` sets it before the thread exists
+        handled = 0
+        last_checkpoint = time.monotonic()
+        slice_ms = max(1, poll_ms // len(topics))
+        log_event("news_stream_started", topics=list(topics), half_life_sec=self.half_life_sec)
+        try:
+            while self._running:
+                for topic in topics:
+                    for msg in queue.consume_batch(topic, batch_size, slice_ms):
+                        try:
+                            if self.on_item(msg.data):
+                                handled += 1
+                        except Exception as exc:
+                            self._logger.exception(
+                                "news_stream_item_failed event=news_stream_item_failed topic=%s error=%s", topic, exc
+                            )
+                if self.checkpoint_path and time.monotonic() - last_checkpoint >= checkpoint_every_sec:
+                    self.save()
+                    last_checkpoint = time.monotonic()
+        finally:
+            self._running = False
+            if self.checkpoint_path:
+                self.save()
+            log_event("news_stream_stopped", topics=list(topics), handled=handled, entities=len(self.states))
+        return handled
+
+    def start(self, queue: MessageQueue, topics: Sequence[str] = ("news.rss",), **kwargs: float) -> threading.Thread:
+        """Run `run` in a daemon thread (the trading loop reads `signals_for`)."""
+        thread = threading.Thread(target=self.run, args=(queue, topics), kwargs=kwargs, daemon=True)
+        self._thread = thread
+        # Set here, not in `run`, so a `stop()` issued before the thread is
+        # scheduled is not overwritten.
+        self._running = True
+        thread.start()
+        return thread
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Stop consuming and wait for the `start` thread (it checkpoints on exit)."""
+        self._running = False
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+            if not thread.is_alive():
+                self._thread = None
+
+
+_AGGREGATOR: Optional[NewsSignalAggregator] = None
+
+
+def get_news_aggregator() -> Optional[NewsSignalAggregator]:
+    return _AGGREGATOR
+
+
+def set_news_aggregator(aggregator: Optional[NewsSignalAggregator]) -> Optional[NewsSignalAggregator]:
+    """Install the aggregator `compute_nlp_news_signals` reads from; returns the previous one."""
+    global _AGGREGATOR
+    previous = _AGGREGATOR
+    _AGGREGATOR = aggregator
+    return previous
+
+
+__all__ = [
+    "DecayedNLPState",
+    "MARKET_ENTITY",
+    "NewsSignalAggregator",
+    "get_news_aggregator",
+    "set_news_aggregator",
+]
@@ -1,5 +1,7 @@
+import math
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence
+from typing import Deque, Dict, Iterable, List, Optional, Sequence
 
 
 NumberSeq = Sequence[float]
@@ -79,8 +81,6 @@ def atr(highs: NumberSeq, lows: NumberSeq, closes: NumberSeq, window: int = 14)
 def volatility(closes: NumberSeq, window: int = 20) -> float:
     if window <= 1 or len(closes) < window:
         return float("nan")
-    import math
-
     window_vals = closes[-window:]
     mean = sum(window_vals) / float(window)
     var = sum((x - mean) ** 2 for x in window_vals) / float(window - 1)
@@ -157,3 +157,178 @@ def get_signals_from_bars(symbol: str, bars: Iterable[Dict[str, float]], window:
         volatility=vol,
         regime=regime,
     )
+
+
+class IncrementalQuantState:
+    """Streaming counterpart of `get_signals_from_bars` for a single symbol.
+
+    Bars are fed one at a time via `update`; running sums, rolling gain/loss
+    averages, a rolling Welford variance and a true-range accumulator are kept
+    so each update is O(1). The returned `QuantSignals` equal what
+    `get_signals_from_bars` returns for every bar seen so far (up to float
+    rounding; sums are re-synchronised from the buffers every `window` bars
+    so drift cannot accumulate).
+    """
+
+    def __init__(self, symbol: str, window: int = 20) -> None:
+        self.symbol = symbol
+        self.window = window
+        self.sub_window = min(14, max(2, window // 2))
+        self._alpha = 2.0 / (window + 1.0)
+        self.reset()
+
+    def reset(self) -> None:
+        w = max(self.window, 1)
+        self.count = 0
+        self._prev_close: Optional[float] = None
+        self._ema = float("nan")
+        # SMA + volatility over `window` closes.
+        self._closes: Deque[float] = deque(maxlen=w)
+        self._close_sum = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        # RSI over `sub_window` close-to-close changes.
+        self._gains: Deque[float] = deque(maxlen=self.sub_window)
+        self._losses: Deque[float] = deque(maxlen=self.sub_window)
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self._gain_nonzero = 0
+        self._loss_nonzero = 0
+        # ATR over `sub_window` true ranges.
+        self._trs: Deque[float] = deque(maxlen=self.sub_window)
+        self._tr_sum = 0.0
+        self._since_resync = 0
+        self._last: Optional[QuantSignals] = None
+
+    def update(self, bar: Dict[str, float]) -> QuantSignals:
+        close = float(bar["c"])
+        high = float(bar.get("h", bar["c"]))
+        low = float(bar.get("l", bar["c"]))
+        prev = self._prev_close
+
+        self._push_close(close)
+
+        if prev is None:
+            self._ema = close
+            tr = high - low
+        else:
+            self._ema = self._alpha * close + (1 - self._alpha) * self._ema
+            ch = close - prev
+            if ch > 0:
+                self._push_change(ch, 0.0)
+            else:
+                self._push_change(0.0, -ch)
+            tr = max(high - low, abs(high - prev), abs(low - prev))
+        self._push_tr(tr)
+
+        self._prev_close = close
+        self.count += 1
+        self._since_resync += 1
+        if self._since_resync >= max(self.window, self.sub_window):
+            self._resync()
+
+        self._last = self._build()
+        return self._last
+
+    def snapshot(self) -> QuantSignals:
+        """Return the signals for the last bar without consuming a new one."""
+        if self._last is None:
+            self._last = self._build()
+        return self._last
+
+    # Internal helpers -----------------------------------------------------
+
+    def _push_close(self, close: float) -> None:
+        closes = self._closes
+        if len(closes) == closes.maxlen:
+            old = closes[0]
+            closes.append(close)
+            self._close_sum += close - old
+            # Rolling Welford: replace `old` by `close` in a fixed-size window.
+            old_mean = self._mean
+            self._mean = old_mean + (close - old) / len(closes)
+            self._m2 += (close - old) * (close - self._mean + old - old_mean)
+        else:
+            closes.append(close)
+            self._close_sum += close
+            delta = close - self._mean
+            self._mean += delta / len(closes)
+            self._m2 += delta * (close - self._mean)
+
+    def _push_change(self, gain: float, loss: float) -> None:
+        if len(self._gains) == self._gains.maxlen:
+            old_gain = self._gains[0]
+            old_loss = self._losses[0]
+            self._gain_sum -= old_gain
+            self._loss_sum -= old_loss
+            self._gain_nonzero -= old_gain != 0.0
+            self._loss_nonzero -= old_loss != 0.0
+        self._gains.append(gain)
+        self._losses.append(loss)
+        self._gain_sum += gain
+        self._loss_sum += loss
+        self._gain_nonzero += gain != 0.0
+        self._loss_nonzero += loss != 0.0
+
+    def _push_tr(self, tr: float) -> None:
+        if len(self._trs) == self._trs.maxlen:
+            self._tr_sum -= self._trs[0]
+        self._trs.append(tr)
+        self._tr_sum += tr
+
+    def _resync(self) -> None:
+        self._since_resync = 0
+        n = len(self._closes)
+        self._close_sum = sum(self._closes)
+        self._mean = self._close_sum / n if n else 0.0
+        self._m2 = sum((x - self._mean) ** 2 for x in self._closes)
+        self._gain_sum = sum(self._gains)
+        self._loss_sum = sum(self._losses)
+        self._tr_sum = sum(self._trs)
+
+    def _build(self) -> QuantSignals:
+        w = self.window
+        sw = self.sub_window
+        n = self.count
+
+        if n == 0:
+            return QuantSignals(
+                symbol=self.symbol,
+                window=w,
+                sma=float("nan"),
+                ema=float("nan"),
+                rsi=float("nan"),
+                atr=float("nan"),
+                volatility=float("nan"),
+                regime="unknown",
+            )
+
+        s = self._close_sum / float(w) if 0 < w <= n else float("nan")
+        e = self._ema if w > 0 else float("nan")
+
+        r = float("nan")
+        if n > sw:
+            # Exact zero when no losses/gains are in the window, as in `rsi`.
+            avg_loss = self._loss_sum / float(sw) if self._loss_nonzero else 0.0
+            avg_gain = self._gain_sum / float(sw) if self._gain_nonzero else 0.0
+            if avg_loss == 0:
+                r = 100.0
+            else:
+                r = 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
+        a = self._tr_sum / float(sw) if n >= sw else float("nan")
+
+        vol = float("nan")
+        if w > 1 and n >= w:
+            vol = math.sqrt(max(self._m2 / float(w - 1), 0.0))
+
+        return QuantSignals(
+            symbol=self.symbol,
+            window=w,
+            sma=s,
+            ema=e,
+            rsi=r,
+            atr=a,
+            volatility=vol,
+            regime=classify_regime(vol),
+        )
@@ -0,0 +1,251 @@
+"""Vectorized (NumPy) counterparts of the scalar indicators in `quant`.
+
+`compute_indicator_frame` evaluates every indicator for every bar in one
+pass over contiguous float64 arrays. Row `i` of the frame equals what
+`get_signals_from_bars` returns for `bars[: i + 1]`, which lets backtests
+and parameter sweeps precompute all signals for a symbol up front.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterable, Tuple
+
+try:
+    import numpy as np
+except Exception as exc:  # pragma: no cover - import guard
+    raise ImportError("numpy package not installed. `pip install numpy`.") from exc
+
+from sagetrade.signals.quant import QuantSignals
+
+
+REGIME_UNKNOWN = 0
+REGIME_LOW_VOL = 1
+REGIME_NORMAL = 2
+REGIME_HIGH_VOL = 3
+
+REGIME_LABELS: Tuple[str, ...] = ("unknown", "low_vol", "normal", "high_vol")
+
+
+@dataclass
+class IndicatorFrame:
+    """Per-bar indicator columns for one symbol (NaN during warm-up)."""
+
+    window: int
+    sma: np.ndarray
+    ema: np.ndarray
+    rsi: np.ndarray
+    atr: np.ndarray
+    volatility: np.ndarray
+    regime: np.ndarray  # int8 codes, see REGIME_LABELS
+
+    def __len__(self) -> int:
+        return int(self.sma.shape[0])
+
+    def regime_label(self, i: int) -> str:
+        return REGIME_LABELS[int(self.regime[i])]
+
+    def row(self, i: int, symbol: str = "") -> QuantSignals:
+        """Materialize bar `i` as a `QuantSignals` object."""
+        return QuantSignals(
+            symbol=symbol,
+            window=self.window,
+            sma=float(self.sma[i]),
+            ema=float(self.ema[i]),
+            rsi=float(self.rsi[i]),
+            atr=float(self.atr[i]),
+            volatility=float(self.volatility[i]),
+            regime=self.regime_label(i),
+        )
+
+
+def bars_to_arrays(bars: Iterable[Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Extract (closes, highs, lows) float64 arrays from bar dicts.
+
+    Missing highs/lows fall back to the close, as in `get_signals_from_bars`.
+    """
+    closes = []
+    highs = []
+    lows = []
+    for bar in bars:
+        c = float(bar["c"])
+        closes.append(c)
+        highs.append(float(bar.get("h", c)))
+        lows.append(float(bar.get("l", c)))
+    return (
+        np.asarray(closes, dtype=np.float64),
+        np.asarray(highs, dtype=np.float64),
+        np.asarray(lows, dtype=np.float64),
+    )
+
+
+def _as_f64(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` values; NaN until the window is full."""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if window <= 0 or n < window:
+        return out
+    view = np.lib.stride_tricks.sliding_window_view(values, window)
+    out[window - 1 :] = view.sum(axis=1) / float(window)
+    return out
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sample standard deviation (ddof=1) over `window` values."""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if window <= 1 or n < window:
+        return out
+    view = np.lib.stride_tricks.sliding_window_view(values, window)
+    mean = view.sum(axis=1) / float(window)
+    var = ((view - mean[:, None]) ** 2).sum(axis=1) / float(window - 1)
+    out[window - 1 :] = np.sqrt(np.maximum(var, 0.0))
+    return out
+
+
+def ema_series(values: np.ndarray, window: int) -> np.ndarray:
+    """EMA seeded with the first value, evaluated for every prefix.
+
+    The recursion is solved in closed form over blocks short enough that the
+    decay powers stay well inside float64 range, so only one Python-level
+    iteration is needed per block rather than per bar.
+    """
+    n = values.shape[0]
+    if window <= 0 or n == 0:
+        return np.full(n, np.nan)
+    alpha = 2.0 / (window + 1.0)
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        return values.copy()
+
+    # Keep decay**-block <= 1e12.
+    block = max(1, int(12.0 * math.log(10.0) / -math.log(decay)))
+    out = np.empty(n)
+    out[0] = values[0]
+    prev = values[0]
+    start = 1
+    while start < n:
+        stop = min(n, start + block)
+        j = np.arange(1, stop - start + 1, dtype=np.float64)
+        pw = decay ** j
+        acc = np.cumsum(values[start:stop] / pw)
+        seg = pw * prev + alpha * pw * acc
+        out[start:stop] = seg
+        prev = seg[-1]
+        start = stop
+    return out
+
+
+def rsi_series(closes: np.ndarray, window: int = 14) -> np.ndarray:
+    """Per-bar `rsi` (simple average of the last `window` gains/losses)."""
+    n = closes.shape[0]
+    out = np.full(n, np.nan)
+    if window <= 0 or n <= window:
+        return out
+    ch = np.diff(closes)
+    gains = np.where(ch > 0, ch, 0.0)
+    losses = np.where(ch > 0, 0.0, -ch)
+    avg_gain = np.lib.stride_tricks.sliding_window_view(gains, window).sum(axis=1) / float(window)
+    avg_loss = np.lib.stride_tricks.sliding_window_view(losses, window).sum(axis=1) / float(window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vals = 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+    vals = np.where(avg_loss == 0, 100.0, vals)
+    out[window:] = vals
+    return out
+
+
+def true_range_series(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> np.ndarray:
+    tr = highs - lows
+    if tr.shape[0] > 1:
+        prev = closes[:-1]
+        tr[1:] = np.maximum(
+            tr[1:],
+            np.maximum(np.abs(highs[1:] - prev), np.abs(lows[1:] - prev)),
+        )
+    return tr
+
+
+def classify_regime_codes(vol: np.ndarray, low_thresh: float = 0.005, high_thresh: float = 0.02) -> np.ndarray:
+    """Vectorized `classify_regime` returning int8 codes (see REGIME_LABELS)."""
+    codes = np.full(vol.shape[0], REGIME_NORMAL, dtype=np.int8)
+    codes[vol < low_thresh] = REGIME_LOW_VOL
+    codes[vol > high_thresh] = REGIME_HIGH_VOL
+    codes[np.isnan(vol)] = REGIME_UNKNOWN
+    return codes
+
+
+def resample_ohlcv(ts, o, h, l, c, v, tf_sec: float) -> Tuple[np.ndarray, ...]:
+    """Batch counterpart of `BarResampler`: roll bars up into `tf_sec` buckets.
+
+    Inputs are ts-sorted 1-D arrays; returns (ts, o, h, l, c, v, n) for each
+    non-empty bucket, where ts is the bucket start and n the number of bars.
+    Every bucket is returned, including the last (possibly incomplete) one.
+    """
+    ts = _as_f64(ts)
+    n = ts.shape[0]
+    if n == 0:
+        empty = np.empty(0, dtype=np.float64)
+        return (empty,) * 6 + (np.empty(0, dtype=np.int64),)
+    if tf_sec <= 0:
+        raise ValueError("tf_sec must be > 0.")
+    bucket = ts - np.mod(ts, tf_sec)
+    starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+    ends = np.concatenate((starts[1:], [n])) - 1
+    return (
+        bucket[starts],
+        _as_f64(o)[starts],
+        np.maximum.reduceat(_as_f64(h), starts),
+        np.minimum.reduceat(_as_f64(l), starts),
+        _as_f64(c)[ends],
+        np.add.reduceat(_as_f64(v), starts),
+        ends - starts + 1,
+    )
+
+
+def compute_indicator_frame(closes, highs, lows, window: int = 20) -> IndicatorFrame:
+    """Compute all quant indicators for every bar in one vectorized pass.
+
+    Uses the same sub-window for RSI/ATR as `get_signals_from_bars`
+    (`min(14, max(2, window // 2))`).
+    """
+    c = _as_f64(closes)
+    h = _as_f64(highs)
+    lo = _as_f64(lows)
+    if not (c.shape == h.shape == lo.shape) or c.ndim != 1:
+        raise ValueError("closes, highs and lows must be 1-D arrays of equal length.")
+
+    sub = min(14, max(2, window // 2))
+    vol = rolling_std(c, window)
+    return IndicatorFrame(
+        window=window,
+        sma=rolling_mean(c, window),
+        ema=ema_series(c, window),
+        rsi=rsi_series(c, sub),
+        atr=rolling_mean(true_range_series(h, lo, c), sub),
+        volatility=vol,
+        regime=classify_regime_codes(vol),
+    )
+
+
+__all__ = [
+    "IndicatorFrame",
+    "REGIME_LABELS",
+    "REGIME_UNKNOWN",
+    "REGIME_LOW_VOL",
+    "REGIME_NORMAL",
+    "REGIME_HIGH_VOL",
+    "bars_to_arrays",
+    "classify_regime_codes",
+    "compute_indicator_frame",
+    "ema_series",
+    "resample_ohlcv",
+    "rolling_mean",
+    "rolling_std",
+    "rsi_series",
+    "true_range_series",
+]
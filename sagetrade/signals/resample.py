@@ -0,0 +1,181 @@
+"""Streaming multi-timeframe OHLCV resampling.
+
+`BarResampler` takes base bars (1-minute bars from `MarketStorage` files or
+the `market.bars` topic) and maintains, per symbol, one in-progress bar for
+each higher timeframe. A bar belongs to the bucket
+`floor(ts / tf_sec) * tf_sec`; when a bar of a later bucket arrives the
+previous bucket is emitted with open = first open, high = max high,
+low = min low, close = last close and volume = summed volume. `partial()`
+peeks at the bucket still being built.
+
+Completed bars also feed an `IncrementalQuantState` per (symbol,
+timeframe), so `quant(symbol, "15m")` is O(1) and strategies do not have
+to re-aggregate raw bars. `sagetrade.signals.quant_vector.resample_ohlcv`
+is the vectorized batch equivalent for backtests.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sagetrade.signals.quant import IncrementalQuantState, QuantSignals
+
+_TF_RE = re.compile(r"^(\d+)\s*([smhd])$")
+_TF_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_timeframe(tf: str) -> int:
+    """Timeframe string ("30s", "5m", "1h", "1d") -> seconds."""
+    m = _TF_RE.match(str(tf).strip().lower())
+    if not m or int(m.group(1)) <= 0:
+        raise ValueError(f"Invalid timeframe: {tf!r}")
+    return int(m.group(1)) * _TF_UNITS[m.group(2)]
+
+
+@dataclass
+class _Bucket:
+    start: float
+    o: float
+    h: float
+    l: float
+    c: float
+    v: float
+    n: int = 1
+
+    def add(self, o: float, h: float, l: float, c: float, v: float) -> None:
+        if h > self.h:
+            self.h = h
+        if l < self.l:
+            self.l = l
+        self.c = c
+        self.v += v
+        self.n += 1
+
+    def to_bar(self, symbol: str, tf: str, partial: bool = False) -> Dict[str, Any]:
+        bar: Dict[str, Any] = {
+            "ts": self.start,
+            "o": self.o,
+            "h": self.h,
+            "l": self.l,
+            "c": self.c,
+            "v": self.v,
+            "symbol": symbol,
+            "tf": tf,
+            "n": self.n,
+        }
+        if partial:
+            bar["partial"] = True
+        return bar
+
+
+class BarResampler:
+    """Roll base bars up into several timeframes at once, per symbol.
+
+    `update(bar)` returns the higher-timeframe bars completed by this bar
+    (oldest first). A bar older than the last bar accepted for its symbol
+    is counted in `late_bars` and ignored for every timeframe, so all
+    timeframes aggregate the same bars. Each (symbol, timeframe) keeps the
+    last `history` completed bars.
+    """
+
+    def __init__(
+        self,
+        timeframes: Sequence[str] = ("5m", "15m", "1h"),
+        *,
+        window: int = 20,
+        history: int = 500,
+    ) -> None:
+        if not timeframes:
+            raise ValueError("BarResampler needs at least one timeframe.")
+        self.timeframes: List[Tuple[str, int]] = sorted(
+            ((tf, parse_timeframe(tf)) for tf in timeframes), key=lambda kv: kv[1]
+        )
+        self.window = window
+        self.history = max(1, history)
+        self.late_bars = 0
+        self._open: Dict[Tuple[str, str], _Bucket] = {}
+        self._last_ts: Dict[str, float] = {}
+        self._done: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        self._quant: Dict[Tuple[str, str], IncrementalQuantState] = {}
+
+    def _complete(self, key: Tuple[str, str], bar: Dict[str, Any]) -> None:
+        done = self._done.get(key)
+        if done is None:
+            done = deque(maxlen=self.history)
+            self._done[key] = done
+            self._quant[key] = IncrementalQuantState(key[0], window=self.window)
+        done.append(bar)
+        self._quant[key].update(bar)
+
+    def update(self, bar: Dict[str, Any], symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        symbol = symbol or str(bar.get("symbol", ""))
+        ts = float(bar["ts"])
+        if ts < self._last_ts.get(symbol, float("-inf")):
+            self.late_bars += 1
+            return []
+        self._last_ts[symbol] = ts
+        c = float(bar["c"])
+        o = float(bar.get("o", c))
+        h = float(bar.get("h", c))
+        lo = float(bar.get("l", c))
+        v = float(bar.get("v", 0.0))
+
+        emitted: List[Dict[str, Any]] = []
+        for tf, sec in self.timeframes:
+            key = (symbol, tf)
+            start = ts - ts % sec
+            cur = self._open.get(key)
+            if cur is None:
+                self._open[key] = _Bucket(start, o, h, lo, c, v)
+            elif start == cur.start:
+                cur.add(o, h, lo, c, v)
+            else:
+                out = cur.to_bar(symbol, tf)
+                self._complete(key, out)
+                emitted.append(out)
+                self._open[key] = _Bucket(start, o, h, lo, c, v)
+        return emitted
+
+    def feed(self, bars: Iterable[Dict[str, Any]], symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """`update` every bar (e.g. a day read from `MarketStorage`); returns all completed bars."""
+        out: List[Dict[str, Any]] = []
+        for bar in bars:
+            out.extend(self.update(bar, symbol))
+        return out
+
+    def partial(self, symbol: str, tf: str) -> Optional[Dict[str, Any]]:
+        """The bar being built for (symbol, tf), marked `partial`; None before the first bar."""
+        cur = self._open.get((symbol, tf))
+        return cur.to_bar(symbol, tf, partial=True) if cur is not None else None
+
+    def flush(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Close every in-progress bucket (end of data); returns the bars closed."""
+        out: List[Dict[str, Any]] = []
+        for key in [k for k in self._open if symbol is None or k[0] == symbol]:
+            bar = self._open.pop(key).to_bar(key[0], key[1])
+            self._complete(key, bar)
+            out.append(bar)
+        return out
+
+    def bars(self, symbol: str, tf: str) -> List[Dict[str, Any]]:
+        """Completed bars for (symbol, tf), oldest first."""
+        return list(self._done.get((symbol, tf), ()))
+
+    def quant(self, symbol: str, tf: str) -> Optional[QuantSignals]:
+        """Quant signals over the completed bars of (symbol, tf); None before the first one."""
+        state = self._quant.get((symbol, tf))
+        return state.snapshot() if state is not None else None
+
+    def quant_all(self, symbol: str) -> Dict[str, QuantSignals]:
+        out: Dict[str, QuantSignals] = {}
+        for tf, _sec in self.timeframes:
+            q = self.quant(symbol, tf)
+            if q is not None:
+                out[tf] = q
+        return out
+
+
+__all__ = ["BarResampler", "parse_timeframe"]
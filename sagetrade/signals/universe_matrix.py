@@ -0,0 +1,248 @@
+"""Cross-sectional quant signals for a whole universe.
+
+`UniverseSignalMatrix` keeps aligned (symbols x time) ring buffers of
+close/high/low and, for each new bar time, evaluates every indicator of
+`get_signals_from_bars` for all symbols at once with NumPy, plus a price
+z-score ((close - sma) / volatility), the one-bar return and
+cross-sectional percentile ranks. Scanning N symbols per bar is one pass
+over (N x window) arrays instead of N Python calls.
+
+A symbol without a bar at some step (NaN close) does not advance; its
+buffers and indicators stay as of its last bar, so each row matches
+`get_signals_from_bars` over that symbol's own bars.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+try:
+    import numpy as np
+except Exception as exc:  # pragma: no cover - import guard
+    raise ImportError("numpy package not installed. `pip install numpy`.") from exc
+
+from sagetrade.signals.quant import QuantSignals
+from sagetrade.signals.quant_vector import REGIME_LABELS, classify_regime_codes
+
+
+def cross_sectional_rank(values: np.ndarray) -> np.ndarray:
+    """Percentile rank in [0, 1] of each value among the non-NaN ones (NaN stays NaN)."""
+    out = np.full(values.shape[0], np.nan)
+    valid = ~np.isnan(values)
+    n = int(valid.sum())
+    if n == 0:
+        return out
+    order = np.argsort(values[valid], kind="stable")
+    ranks = np.empty(n)
+    ranks[order] = np.arange(n, dtype=np.float64)
+    out[valid] = ranks / (n - 1) if n > 1 else 0.5
+    return out
+
+
+def cross_sectional_zscore(values: np.ndarray) -> np.ndarray:
+    """(x - mean) / std across the non-NaN values (NaN where undefined)."""
+    valid = ~np.isnan(values)
+    if valid.sum() < 2:
+        return np.full(values.shape[0], np.nan)
+    mean = values[valid].mean()
+    std = values[valid].std(ddof=1)
+    if std == 0:
+        return np.where(valid, 0.0, np.nan)
+    return (values - mean) / std
+
+
+@dataclass
+class UniverseSignals:
+    """Per-symbol indicator columns for one bar time (row i = symbols[i])."""
+
+    ts: Optional[float]
+    symbols: List[str]
+    window: int
+    close: np.ndarray
+    sma: np.ndarray
+    ema: np.ndarray
+    rsi: np.ndarray
+    atr: np.ndarray
+    volatility: np.ndarray
+    regime: np.ndarray  # int8 codes, see REGIME_LABELS
+    zscore: np.ndarray  # (close - sma) / volatility
+    ret: np.ndarray  # close / previous close - 1
+    count: np.ndarray  # bars seen per symbol
+
+    def rank(self, field: str) -> np.ndarray:
+        """Cross-sectional percentile rank of a column (e.g. "zscore", "ret", "rsi")."""
+        return cross_sectional_rank(getattr(self, field))
+
+    def xs_zscore(self, field: str) -> np.ndarray:
+        """Cross-sectional z-score of a column."""
+        return cross_sectional_zscore(getattr(self, field))
+
+    def row(self, i: int) -> QuantSignals:
+        return QuantSignals(
+            symbol=self.symbols[i],
+            window=self.window,
+            sma=float(self.sma[i]),
+            ema=float(self.ema[i]),
+            rsi=float(self.rsi[i]),
+            atr=float(self.atr[i]),
+            volatility=float(self.volatility[i]),
+            regime=REGIME_LABELS[int(self.regime[i])],
+        )
+
+    def quant_signals(self, active_only: bool = True) -> Dict[str, QuantSignals]:
+        """`QuantSignals` per symbol (skipping symbols without bars if `active_only`)."""
+        return {
+            sym: self.row(i) for i, sym in enumerate(self.symbols) if not active_only or self.count[i] > 0
+        }
+
+    def top(self, field: str, n: int = 10, ascending: bool = False) -> List[str]:
+        """Symbols with the highest (or lowest) values of a column, NaNs excluded."""
+        values = getattr(self, field)
+        idx = np.flatnonzero(~np.isnan(values))
+        order = idx[np.argsort(values[idx], kind="stable")]
+        if not ascending:
+            order = order[::-1]
+        return [self.symbols[i] for i in order[:n]]
+
+
+class UniverseSignalMatrix:
+    """Vectorized `IncrementalQuantState` for a fixed list of symbols.
+
+    `update` takes one bar per symbol (missing symbols are skipped for that
+    step) and returns a `UniverseSignals` snapshot for all of them.
+    """
+
+    def __init__(self, symbols: Iterable[str], window: int = 20) -> None:
+        self.symbols = list(symbols)
+        if not self.symbols:
+            raise ValueError("UniverseSignalMatrix needs at least one symbol.")
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        self.window = window
+        self.sub_window = min(14, max(2, window // 2))
+        self.length = max(window, self.sub_window + 1, 2)
+        self._alpha = 2.0 / (window + 1.0)
+        n = len(self.symbols)
+        self._c = np.full((n, self.length), np.nan)
+        self._h = np.full((n, self.length), np.nan)
+        self._l = np.full((n, self.length), np.nan)
+        self._ema = np.full(n, np.nan)
+        self.count = np.zeros(n, dtype=np.int64)
+        self._rows = np.arange(n)
+        self._last: Optional[UniverseSignals] = None
+
+    def update_arrays(
+        self,
+        closes: Any,
+        highs: Any = None,
+        lows: Any = None,
+        ts: Optional[float] = None,
+    ) -> UniverseSignals:
+        """Push one column of prices aligned with `symbols` (NaN = no bar)."""
+        c = np.asarray(closes, dtype=np.float64)
+        h = c if highs is None else np.where(np.isnan(highs), c, np.asarray(highs, dtype=np.float64))
+        lo = c if lows is None else np.where(np.isnan(lows), c, np.asarray(lows, dtype=np.float64))
+        if c.shape != (len(self.symbols),):
+            raise ValueError(f"Expected {len(self.symbols)} closes, got shape {c.shape}.")
+
+        rows = self._rows[~np.isnan(c)]
+        pos = self.count[rows] % self.length
+        self._c[rows, pos] = c[rows]
+        self._h[rows, pos] = h[rows]
+        self._l[rows, pos] = lo[rows]
+        first = self.count[rows] == 0
+        self._ema[rows] = np.where(
+            first, c[rows], self._alpha * c[rows] + (1.0 - self._alpha) * self._ema[rows]
+        )
+        self.count[rows] += 1
+        self._last = self._compute(ts)
+        return self._last
+
+    def update(self, bars: Mapping[str, Mapping[str, Any]], ts: Optional[float] = None) -> UniverseSignals:
+        """Push {symbol: bar} for one bar time; symbols outside the universe are ignored."""
+        n = len(self.symbols)
+        c = np.full(n, np.nan)
+        h = np.full(n, np.nan)
+        lo = np.full(n, np.nan)
+        for sym, bar in bars.items():
+            i = self.index.get(sym)
+            if i is None:
+                continue
+            c[i] = float(bar["c"])
+            h[i] = float(bar.get("h", bar["c"]))
+            lo[i] = float(bar.get("l", bar["c"]))
+            if ts is None and "ts" in bar:
+                ts = float(bar["ts"])
+        return self.update_arrays(c, h, lo, ts)
+
+    def snapshot(self) -> Optional[UniverseSignals]:
+        return self._last
+
+    def _ordered(self, buf: np.ndarray) -> np.ndarray:
+        """Ring buffers in chronological order (oldest -> newest).
+
+        Rows that have not filled their buffer yet come out NaN-padded on
+        the left, since slots are written in order and never wrap early.
+        """
+        idx = (self.count[:, None] + np.arange(self.length)[None, :]) % self.length
+        return np.take_along_axis(buf, idx, axis=1)
+
+    def _compute(self, ts: Optional[float]) -> UniverseSignals:
+        w = self.window
+        sw = self.sub_window
+        n_bars = self.count
+        c = self._ordered(self._c)
+        h = self._ordered(self._h)
+        lo = self._ordered(self._l)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            last_w = c[:, -w:]
+            sma = last_w.sum(axis=1) / float(w)
+            sma = np.where(n_bars >= w, sma, np.nan)
+            dev = last_w - sma[:, None]
+            vol = np.sqrt(np.maximum((dev * dev).sum(axis=1) / float(max(w - 1, 1)), 0.0))
+            vol = np.where((n_bars >= w) & (w > 1), vol, np.nan)
+
+            ch = np.diff(c[:, -(sw + 1) :], axis=1)
+            gains = np.where(ch > 0, ch, 0.0).sum(axis=1) / float(sw)
+            losses = np.where(ch > 0, 0.0, -ch).sum(axis=1) / float(sw)
+            rsi = np.where(losses == 0, 100.0, 100.0 - 100.0 / (1.0 + gains / losses))
+            rsi = np.where(n_bars > sw, rsi, np.nan)
+
+            prev = c[:, -(sw + 1) : -1]
+            hh = h[:, -sw:]
+            ll = lo[:, -sw:]
+            tr = np.where(
+                np.isnan(prev),
+                hh - ll,
+                np.maximum(hh - ll, np.maximum(np.abs(hh - prev), np.abs(ll - prev))),
+            )
+            atr = np.where(n_bars >= sw, tr.sum(axis=1) / float(sw), np.nan)
+
+            close = c[:, -1]
+            ret = np.where(n_bars >= 2, close / c[:, -2] - 1.0, np.nan)
+            zscore = np.where(vol > 0, (close - sma) / vol, np.nan)
+
+        return UniverseSignals(
+            ts=ts,
+            symbols=self.symbols,
+            window=w,
+            close=close,
+            sma=sma,
+            ema=self._ema.copy(),
+            rsi=rsi,
+            atr=atr,
+            volatility=vol,
+            regime=classify_regime_codes(vol),
+            zscore=zscore,
+            ret=ret,
+            count=n_bars.copy(),
+        )
+
+
+__all__ = [
+    "UniverseSignalMatrix",
+    "UniverseSignals",
+    "cross_sectional_rank",
+    "cross_sectional_zscore",
+]
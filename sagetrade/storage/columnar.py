@@ -0,0 +1,272 @@
+"""Memory-mapped columnar bar store.
+
+Layout: `<base_dir>/<YYYY-MM-DD>/<SYMBOL>/<column>.f64`, one raw little-endian
+float64 file per column (ts, o, h, l, c, v). Days are derived from each bar's
+own UTC timestamp. Appends write fixed-size rows to the end of each column
+file; reads map the files with `numpy.memmap`, so a range read is a binary
+search on `ts` plus array slicing, with no parsing.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except Exception as exc:  # pragma: no cover - import guard
+    raise ImportError("numpy package not installed. `pip install numpy`.") from exc
+
+
+COLUMNS: Tuple[str, ...] = ("ts", "o", "h", "l", "c", "v")
+DTYPE = np.dtype("<f8")
+_SUFFIX = ".f64"
+
+
+@dataclass
+class BarColumns:
+    """Column arrays for a contiguous run of bars (views when read from one day)."""
+
+    ts: np.ndarray
+    o: np.ndarray
+    h: np.ndarray
+    l: np.ndarray
+    c: np.ndarray
+    v: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.ts.shape[0])
+
+    @classmethod
+    def empty(cls) -> "BarColumns":
+        return cls(*(np.empty(0, dtype=DTYPE) for _ in COLUMNS))
+
+    @classmethod
+    def concat(cls, parts: Sequence["BarColumns"]) -> "BarColumns":
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        return cls(*(np.concatenate([getattr(p, col) for p in parts]) for col in COLUMNS))
+
+    def to_bars(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Materialize bar dicts in the JSONL shape (`ts`, `o`, `h`, `l`, `c`, `v`)."""
+        out: List[Dict[str, Any]] = []
+        for row in zip(*(getattr(self, col).tolist() for col in COLUMNS)):
+            bar: Dict[str, Any] = dict(zip(COLUMNS, row))
+            if symbol is not None:
+                bar["symbol"] = symbol
+            out.append(bar)
+        return out
+
+
+def _day_of(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _bar_row(bar: Dict[str, Any]) -> Tuple[float, ...]:
+    c = float(bar["c"])
+    return (
+        float(bar.get("ts", bar.get("timestamp", 0.0))),
+        float(bar.get("o", c)),
+        float(bar.get("h", c)),
+        float(bar.get("l", c)),
+        c,
+        float(bar.get("v", 0.0)),
+    )
+
+
+class ColumnarBarStore:
+    """Append-only, memory-mapped per-symbol/per-day bar columns.
+
+    Bars within a symbol-day are expected to be appended in `ts` order, which
+    is what `read_range` relies on for its binary search. Append handles
+    (one file per column) are kept per (day, symbol) in an LRU of at most
+    `max_open` symbol-days; opening a newer day closes the handles of older
+    days. A late bar for a closed symbol-day simply reopens its files.
+    """
+
+    def __init__(self, base_dir: str = "data/bars", max_open: int = 256) -> None:
+        self.base_dir = base_dir
+        self.max_open = max(1, max_open)
+        self._handles: "OrderedDict[Tuple[str, str], Dict[str, BinaryIO]]" = OrderedDict()
+        self._latest_day = ""
+
+    # Writing ---------------------------------------------------------------
+
+    def _dir(self, day: str, symbol: str) -> str:
+        return os.path.join(self.base_dir, day, symbol)
+
+    def _files(self, day: str, symbol: str) -> Dict[str, BinaryIO]:
+        key = (day, symbol)
+        files = self._handles.get(key)
+        if files is not None:
+            self._handles.move_to_end(key)
+            return files
+        if day > self._latest_day:
+            self._latest_day = day
+            for old in [k for k in self._handles if k[0] < day]:
+                self._close_files(self._handles.pop(old))
+        while len(self._handles) >= self.max_open:
+            _key, lru = self._handles.popitem(last=False)
+            self._close_files(lru)
+        d = self._dir(day, symbol)
+        os.makedirs(d, exist_ok=True)
+        self._truncate_partial_row(d)
+        files = {col: open(os.path.join(d, col + _SUFFIX), "ab") for col in COLUMNS}
+        self._handles[key] = files
+        return files
+
+    @staticmethod
+    def _close_files(files: Dict[str, BinaryIO]) -> None:
+        for f in files.values():
+            try:
+                f.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _truncate_partial_row(d: str) -> None:
+        """Cut every column back to the shortest one (a crash mid-append leaves them uneven)."""
+        sizes = []
+        for col in COLUMNS:
+            p = os.path.join(d, col + _SUFFIX)
+            sizes.append(os.path.getsize(p) if os.path.exists(p) else 0)
+        rows = min(sizes) // DTYPE.itemsize
+        for col, size in zip(COLUMNS, sizes):
+            if size != rows * DTYPE.itemsize:
+                with open(os.path.join(d, col + _SUFFIX), "ab") as f:
+                    f.truncate(rows * DTYPE.itemsize)
+
+    def append(self, symbol: str, bar: Dict[str, Any]) -> None:
+        """Append one bar dict (JSONL shape)."""
+        row = _bar_row(bar)
+        files = self._files(_day_of(row[0]), symbol)
+        for col, value in zip(COLUMNS, row):
+            files[col].write(DTYPE.type(value).tobytes())
+
+    def append_many(self, symbol: str, bars: Iterable[Dict[str, Any]]) -> int:
+        """Append bar dicts in bulk; returns the number of rows written."""
+        rows = [_bar_row(b) for b in bars]
+        if not rows:
+            return 0
+        arr = np.asarray(rows, dtype=DTYPE)
+        self.append_arrays(symbol, *(arr[:, i] for i in range(len(COLUMNS))))
+        return len(rows)
+
+    def append_arrays(
+        self,
+        symbol: str,
+        ts: np.ndarray,
+        o: np.ndarray,
+        h: np.ndarray,
+        l: np.ndarray,
+        c: np.ndarray,
+        v: np.ndarray,
+    ) -> None:
+        """Append equal-length column arrays, split by UTC day."""
+        cols = [np.ascontiguousarray(x, dtype=DTYPE) for x in (ts, o, h, l, c, v)]
+        n = cols[0].shape[0]
+        if any(x.shape[0] != n for x in cols):
+            raise ValueError("All columns must have the same length.")
+        start = 0
+        while start < n:
+            day = _day_of(float(cols[0][start]))
+            next_day = datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc) + timedelta(days=1)
+            stop = start + int(np.searchsorted(cols[0][start:], next_day.timestamp(), side="left"))
+            stop = max(stop, start + 1)
+            files = self._files(day, symbol)
+            for col, arr in zip(COLUMNS, cols):
+                files[col].write(arr[start:stop].tobytes())
+            start = stop
+
+    def flush(self) -> None:
+        for files in self._handles.values():
+            for f in files.values():
+                f.flush()
+
+    def close(self) -> None:
+        for files in self._handles.values():
+            self._close_files(files)
+        self._handles.clear()
+
+    def __enter__(self) -> "ColumnarBarStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # Reading ---------------------------------------------------------------
+
+    def days(self, symbol: Optional[str] = None) -> List[str]:
+        if not os.path.isdir(self.base_dir):
+            return []
+        out = []
+        for day in sorted(os.listdir(self.base_dir)):
+            if not os.path.isdir(os.path.join(self.base_dir, day)):
+                continue
+            if symbol is None or os.path.isdir(self._dir(day, symbol)):
+                out.append(day)
+        return out
+
+    def symbols(self, day: str) -> List[str]:
+        d = os.path.join(self.base_dir, day)
+        if not os.path.isdir(d):
+            return []
+        return sorted(name for name in os.listdir(d) if os.path.isdir(os.path.join(d, name)))
+
+    def read_day(self, symbol: str, day: str) -> BarColumns:
+        """Map one symbol-day; the returned arrays are read-only memmap views."""
+        handles = self._handles.get((day, symbol))
+        if handles is not None:
+            for f in handles.values():
+                f.flush()
+        d = self._dir(day, symbol)
+        sizes = []
+        for col in COLUMNS:
+            p = os.path.join(d, col + _SUFFIX)
+            sizes.append(os.path.getsize(p) if os.path.exists(p) else 0)
+        rows = min(sizes) // DTYPE.itemsize
+        if rows == 0:
+            return BarColumns.empty()
+        return BarColumns(
+            *(np.memmap(os.path.join(d, col + _SUFFIX), dtype=DTYPE, mode="r", shape=(rows,)) for col in COLUMNS)
+        )
+
+    def iter_range(self, symbol: str, start_ts: float, end_ts: float) -> Iterator[BarColumns]:
+        """Yield zero-copy per-day slices with start_ts <= ts < end_ts."""
+        if end_ts <= start_ts:
+            return
+        first = _day_of(start_ts)
+        last = _day_of(end_ts)
+        for day in self.days(symbol):
+            if day < first or day > last:
+                continue
+            cols = self.read_day(symbol, day)
+            if len(cols) == 0:
+                continue
+            lo = int(np.searchsorted(cols.ts, start_ts, side="left"))
+            hi = int(np.searchsorted(cols.ts, end_ts, side="left"))
+            if hi > lo:
+                yield BarColumns(*(getattr(cols, col)[lo:hi] for col in COLUMNS))
+
+    def read_range(self, symbol: str, start_ts: float, end_ts: float) -> BarColumns:
+        """Bars for `symbol` with start_ts <= ts < end_ts.
+
+        Ranges within one day are zero-copy memmap views; multi-day ranges
+        are concatenated into new arrays.
+        """
+        return BarColumns.concat(list(self.iter_range(symbol, start_ts, end_ts)))
+
+    def import_jsonl(self, symbol: str, path: str) -> int:
+        """Convert an existing `data/market/<day>/<SYMBOL>.jsonl` file into this store."""
+        from sagetrade.replay.replay_engine import read_jsonl
+
+        bars = sorted(read_jsonl(path), key=lambda b: float(b.get("ts", 0.0)))
+        return self.append_many(symbol, bars)
+
+
+__all__ = ["BarColumns", "COLUMNS", "ColumnarBarStore"]
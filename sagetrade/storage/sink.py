@@ -1,8 +1,16 @@
+import atexit
 import json
 import os
+import threading
 import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sagetrade.utils.logging import get_logger, log_event
+
+# Numeric bar fields; parquet parts always store them as float64 so a first
+# batch of integral prices (c=2) cannot fix an int64 schema for the file.
+BAR_FLOAT_FIELDS = ("ts", "o", "h", "l", "c", "v")
 
 
 def _ensure_dir(path: str) -> None:
@@ -22,11 +30,315 @@ def write_jsonl(path: str, record: Dict[str, Any]) -> None:
         f.write(json.dumps(record, ensure_ascii=False) + "\n")
 
 
+def _utc_day() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%d")
+
+
+class _WriteError(Exception):
+    """A batch write failed after its first `written` rows reached disk."""
+
+    def __init__(self, written: int) -> None:
+        super().__init__(f"write failed after {written} rows")
+        self.written = written
+
+
+class BatchingSink:
+    """Buffered, append-only writer for many (day, key) streams.
+
+    Records are buffered in memory per (UTC day, key) and written by a
+    background thread when a buffer reaches `max_rows` or every
+    `max_delay_ms`, whichever comes first. File handles stay open between
+    flushes and are closed once their day has rolled over.
+
+    Rows whose write fails are logged and put back in front of their buffer
+    for the next flush; rows already written by a partial JSONL write are
+    not re-queued. A stream that keeps failing gives up after `max_retries`
+    consecutive failures, and a re-queued buffer is capped at
+    `max_buffered_rows` (oldest rows go first); dropped rows are counted in
+    `dropped_rows` and logged.
+
+    fmt: "parquet" writes each flush as an Arrow record batch (one row
+    group) to `<base>/<day>/<key>.<part>.parquet`; "jsonl" appends to
+    `<base>/<day>/<key>.jsonl`; "auto" picks parquet when pyarrow is
+    installed. A parquet part is only readable once closed, so a part is
+    closed after `part_rows` rows (the next flush starts a new one), on
+    `flush()`/`close()` and on day rollover. Parts use the schema of their
+    first batch with `float_fields` forced to float64; later records are
+    cast to it (missing fields become null, extra fields are dropped).
+    The replay/paper readers only read JSONL.
+    """
+
+    def __init__(
+        self,
+        base_dir: str,
+        *,
+        fmt: str = "auto",
+        max_rows: int = 1000,
+        max_delay_ms: int = 1000,
+        part_rows: int = 100_000,
+        float_fields: Iterable[str] = (),
+        max_retries: int = 5,
+        max_buffered_rows: int = 100_000,
+    ) -> None:
+        if fmt == "auto":
+            try:
+                import pyarrow  # type: ignore  # noqa: F401
+
+                fmt = "parquet"
+            except Exception:
+                fmt = "jsonl"
+        if fmt not in ("parquet", "jsonl"):
+            raise ValueError(f"Unknown sink format: {fmt}")
+        self.base_dir = base_dir
+        self.fmt = fmt
+        self.max_rows = max(1, max_rows)
+        self.max_delay = max(1, max_delay_ms) / 1000.0
+        self.part_rows = max(1, part_rows)
+        self.float_fields = frozenset(float_fields)
+        self.max_retries = max(0, max_retries)
+        self.max_buffered_rows = max(1, max_buffered_rows)
+        self.dropped_rows = 0
+
+        self._buffers: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # serializes writers (background thread vs flush/close)
+        self._handles: Dict[Tuple[str, str], Any] = {}
+        self._handle_rows: Dict[Tuple[str, str], int] = {}
+        self._failures: Dict[Tuple[str, str], int] = {}  # consecutive failed writes per stream
+        self._logger = get_logger(__name__)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="batching-sink", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, key: str, record: Dict[str, Any]) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchingSink is closed.")
+            buf = self._buffers.setdefault((_utc_day(), key), [])
+            buf.append(record)
+            if len(buf) >= self.max_rows:
+                self._cond.notify()
+
+    def flush(self) -> None:
+        """Write out every buffered record now and close open parquet parts.
+
+        Raises RuntimeError if some rows could not be written; unless
+        dropped (see the class docstring) they stay buffered for the next
+        flush.
+        """
+        with self._cond:
+            pending = self._buffers
+            self._buffers = {}
+        failed = self._write(pending)
+        if self.fmt == "parquet":
+            with self._flush_lock:
+                for key in list(self._handles):
+                    self._close_handle(key)
+        if failed:
+            raise RuntimeError(f"BatchingSink: {failed} rows could not be written (kept buffered).")
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        atexit.unregister(self.close)
+        self._thread.join()
+        try:
+            self.flush()
+        except RuntimeError as exc:
+            self._logger.error("event=batching_sink_rows_lost base=%s error=%s", self.base_dir, exc)
+        with self._flush_lock:
+            for key in list(self._handles):
+                self._close_handle(key)
+
+    def __enter__(self) -> "BatchingSink":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # Background thread ----------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and not any(len(b) >= self.max_rows for b in self._buffers.values()):
+                    self._cond.wait(timeout=self.max_delay)
+                closed = self._closed
+                pending = self._buffers
+                self._buffers = {}
+            # Storage must not kill the ingestion process: failed rows are
+            # logged and re-queued by `_write`, and retried on the next pass.
+            self._write(pending)
+            if closed:
+                return
+
+    def _write(self, pending: Dict[Tuple[str, str], List[Dict[str, Any]]]) -> int:
+        """Write `pending`; unwritten rows go back to the buffers. Returns the failed row count."""
+        failed: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        with self._flush_lock:
+            for key, rows in pending.items():
+                if not rows:
+                    continue
+                try:
+                    self._write_rows(key, rows)
+                    self._failures.pop(key, None)
+                except _WriteError as err:
+                    self._close_handle(key)
+                    failures = self._failures.get(key, 0) + 1
+                    self._failures[key] = failures
+                    left = rows[err.written :]
+                    log_event(
+                        "batching_sink_write_failed",
+                        level="ERROR",
+                        day=key[0],
+                        key=key[1],
+                        rows=len(left),
+                        written=err.written,
+                        attempt=failures,
+                        error=str(err.__cause__),
+                    )
+                    if failures > self.max_retries:
+                        self._failures.pop(key, None)
+                        self._drop(key, len(left), "retries_exhausted")
+                    elif left:
+                        failed[key] = left
+            # Roll over: close handles that belong to past days.
+            today = _utc_day()
+            for key in [k for k in self._handles if k[0] != today]:
+                self._close_handle(key)
+        if failed:
+            with self._cond:
+                for key, rows in failed.items():
+                    merged = rows + self._buffers.get(key, [])
+                    excess = len(merged) - self.max_buffered_rows
+                    if excess > 0:
+                        merged = merged[excess:]
+                        self._drop(key, excess, "buffer_full")
+                    self._buffers[key] = merged
+        return sum(len(rows) for rows in failed.values())
+
+    def _drop(self, key: Tuple[str, str], n: int, reason: str) -> None:
+        self.dropped_rows += n
+        log_event("batching_sink_rows_dropped", level="ERROR", day=key[0], key=key[1], rows=n, reason=reason)
+
+    def _write_rows(self, key: Tuple[str, str], rows: List[Dict[str, Any]]) -> None:
+        """Write `rows`; raises `_WriteError` carrying how many leading rows made it to disk."""
+        try:
+            if self.fmt == "jsonl":
+                self._write_jsonl(key, rows)
+            else:
+                self._write_parquet(key, rows)
+        except _WriteError:
+            raise
+        except Exception as exc:
+            raise _WriteError(0) from exc
+
+    def _write_jsonl(self, key: Tuple[str, str], rows: List[Dict[str, Any]]) -> None:
+        day, name = key
+        handle = self._handles.get(key)
+        if handle is None:
+            day_dir = os.path.join(self.base_dir, day)
+            _ensure_dir(day_dir)
+            # Unbuffered, so a failed write tells exactly how many bytes reached the file.
+            handle = open(os.path.join(day_dir, f"{name}.jsonl"), "ab", buffering=0)
+            self._handles[key] = handle
+        lines = [(json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8") for r in rows]
+        data = memoryview(b"".join(lines))
+        done = 0
+        try:
+            while done < len(data):
+                n = handle.write(data[done:])
+                if not n:
+                    raise OSError("short write")
+                done += n
+        except Exception as exc:
+            written = 0
+            end = 0
+            for line in lines:
+                if end + len(line) > done:
+                    break
+                end += len(line)
+                written += 1
+            if end < done:
+                # Cut the torn line so the retry does not leave a broken record.
+                try:
+                    handle.truncate(handle.tell() - (done - end))
+                except Exception:
+                    pass
+            raise _WriteError(written) from exc
+
+    def _write_parquet(self, key: Tuple[str, str], rows: List[Dict[str, Any]]) -> None:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+
+        day, name = key
+        handle = self._handles.get(key)
+        if handle is None:
+            schema = pa.RecordBatch.from_pylist(rows).schema
+            if self.float_fields:
+                schema = pa.schema(
+                    [pa.field(f.name, pa.float64()) if f.name in self.float_fields else f for f in schema]
+                )
+            day_dir = os.path.join(self.base_dir, day)
+            _ensure_dir(day_dir)
+            part = 0
+            while os.path.exists(os.path.join(day_dir, f"{name}.{part:04d}.parquet")):
+                part += 1
+            handle = pq.ParquetWriter(os.path.join(day_dir, f"{name}.{part:04d}.parquet"), schema)
+            self._handles[key] = handle
+            self._handle_rows[key] = 0
+        batch = pa.RecordBatch.from_pylist(rows, schema=handle.schema)
+        handle.write_batch(batch)
+        self._handle_rows[key] += len(rows)
+        if self._handle_rows[key] >= self.part_rows:
+            self._close_handle(key)
+
+    def _close_handle(self, key: Tuple[str, str]) -> None:
+        self._handle_rows.pop(key, None)
+        handle = self._handles.pop(key, None)
+        if handle is not None:
+            try:
+                handle.close()
+            except Exception:
+                pass
+
+
 class MarketStorage:
-    """Stores market data daily under data/market/YYYY-MM-DD/*.jsonl or parquet if available."""
+    """Stores market data daily under data/market/YYYY-MM-DD/*.jsonl or parquet if available.
 
-    def __init__(self, base_dir: str = "data/market") -> None:
+    With `backend="columnar"` bars go to a memory-mapped `ColumnarBarStore`
+    under its own root `columnar_dir` instead (see
+    `sagetrade.storage.columnar`), so the JSONL day directories under
+    `base_dir` never mix with column directories; with
+    `backend="batched"` they are buffered by a `BatchingSink` (`batch_format`
+    "jsonl", "parquet" or "auto"). JSONL is the default batch format because
+    the replay, paper-trading and scan readers only read `*.jsonl` files;
+    parquet parts are for offline analysis.
+    """
+
+    def __init__(
+        self,
+        base_dir: str = "data/market",
+        backend: str = "jsonl",
+        batch_format: str = "jsonl",
+        columnar_dir: str = "data/bars",
+    ) -> None:
         self.base_dir = base_dir
+        self.backend = backend
+        self._columnar = None
+        self._batcher: Optional[BatchingSink] = None
+        if backend == "columnar":
+            from sagetrade.storage.columnar import ColumnarBarStore
+
+            self._columnar = ColumnarBarStore(columnar_dir)
+        elif backend == "batched":
+            self._batcher = BatchingSink(base_dir, fmt=batch_format, float_fields=BAR_FLOAT_FIELDS)
+        elif backend != "jsonl":
+            raise ValueError(f"Unknown market storage backend: {backend}")
         self._parquet_available = False
         try:
             import pyarrow  # type: ignore
@@ -35,6 +347,12 @@ class MarketStorage:
             self._parquet_available = False
 
     def write_bar(self, symbol: str, bar: Dict[str, Any]) -> None:
+        if self._columnar is not None:
+            self._columnar.append(symbol, bar)
+            return
+        if self._batcher is not None:
+            self._batcher.write(symbol, bar)
+            return
         day_dir = _today_dir(self.base_dir)
         if self._parquet_available:
             # Fallback to JSONL for now; parquet batching requires more handling.
@@ -44,15 +362,37 @@ class MarketStorage:
             path = os.path.join(day_dir, f"{symbol}.jsonl")
         write_jsonl(path, bar)
 
+    def close(self) -> None:
+        if self._columnar is not None:
+            self._columnar.close()
+        if self._batcher is not None:
+            self._batcher.close()
+
 
 class TextStorage:
-    """Stores raw text + metadata for news/social under data/text/YYYY-MM-DD/*.jsonl"""
+    """Stores raw text + metadata for news/social under data/text/YYYY-MM-DD/*.jsonl
+
+    `backend="batched"` buffers writes through a `BatchingSink`; JSONL is the
+    default batch format because text items do not share a fixed schema.
+    """
 
-    def __init__(self, base_dir: str = "data/text") -> None:
+    def __init__(self, base_dir: str = "data/text", backend: str = "jsonl", batch_format: str = "jsonl") -> None:
         self.base_dir = base_dir
+        self.backend = backend
+        self._batcher: Optional[BatchingSink] = None
+        if backend == "batched":
+            self._batcher = BatchingSink(base_dir, fmt=batch_format)
+        elif backend != "jsonl":
+            raise ValueError(f"Unknown text storage backend: {backend}")
 
     def write_item(self, source: str, item: Dict[str, Any]) -> None:
+        if self._batcher is not None:
+            self._batcher.write(source, item)
+            return
         day_dir = _today_dir(self.base_dir)
         path = os.path.join(day_dir, f"{source}.jsonl")
         write_jsonl(path, item)
 
+    def close(self) -> None:
+        if self._batcher is not None:
+            self._batcher.close()
@@ -4,6 +4,8 @@ import json
 import os
 from typing import Any, Dict, List
 
+from sagetrade.utils.jsonl import tail_jsonl
+
 
 TRADE_LOG_DIR = os.path.join("runtime", "trades")
 
@@ -34,6 +36,11 @@ def load_trades(account_id: str, limit: int = 100) -> List[Dict[str, Any]]:
     path = _account_path(account_id)
     if not os.path.exists(path):
         return []
+    if limit > 0:
+        try:
+            return tail_jsonl(path, limit)
+        except Exception:
+            return []
     rows: List[Dict[str, Any]] = []
     try:
         with open(path, "r", encoding="utf-8") as f:
@@ -47,7 +54,5 @@ def load_trades(account_id: str, limit: int = 100) -> List[Dict[str, Any]]:
                     continue
     except Exception:
         return []
-    if limit > 0:
-        return rows[-limit:]
     return rows
 
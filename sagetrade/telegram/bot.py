@@ -15,6 +15,7 @@ from sagetrade.signals.aggregator import aggregate
 from sagetrade.signals.nlp import get_signals as get_nlp_signals
 from sagetrade.signals.quant import get_signals_from_bars
 from sagetrade.storage.trade_log import load_trades
+from sagetrade.utils.jsonl import tail_jsonl
 
 
 try:
@@ -359,6 +360,8 @@ class TelegramBot:
         return "\n".join(parts)
 
     def _load_jsonl(self, path: str, limit: int = 0) -> List[Dict[str, object]]:
+        if limit > 0:
+            return tail_jsonl(path, limit)
         rows: List[Dict[str, object]] = []
         try:
             with open(path, "r", encoding="utf-8") as f:
@@ -372,8 +375,6 @@ class TelegramBot:
                         continue
         except FileNotFoundError:
             return []
-        if limit > 0:
-            return rows[-limit:]
         return rows
 
     def _latest_composite_signal(self, symbol: str) -> Optional[object]:
@@ -0,0 +1,87 @@
+"""Pluggable time source.
+
+Live code reads the time through a `Clock` instead of calling
+`time.time()` directly. `WallClock` is the default; a simulation driver
+(backtest, replay) installs or injects a `SimulatedClock` and moves it to
+each bar's timestamp, so order/position stamps, trade durations, risk
+session times and log timestamps follow data time, not wall time.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class Clock:
+    def time(self) -> float:
+        """Current time as epoch seconds."""
+        raise NotImplementedError
+
+    def sleep(self, seconds: float) -> None:
+        raise NotImplementedError
+
+
+class WallClock(Clock):
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class SimulatedClock(Clock):
+    """Clock moved explicitly by a driver; `sleep` advances it instantly.
+
+    Time never goes backwards: `set` with an earlier timestamp is ignored.
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._now = float(start)
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        return self._now
+
+    def set(self, ts: float) -> None:
+        with self._lock:
+            if ts > self._now:
+                self._now = float(ts)
+
+    def advance(self, seconds: float) -> None:
+        with self._lock:
+            self._now += max(0.0, float(seconds))
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+
+
+_CLOCK: Clock = WallClock()
+
+
+def get_clock() -> Clock:
+    """Process-wide default clock (used where no clock was injected)."""
+    return _CLOCK
+
+
+def set_clock(clock: Optional[Clock]) -> Clock:
+    """Install `clock` as the default (None restores the wall clock); returns the previous one."""
+    global _CLOCK
+    previous = _CLOCK
+    _CLOCK = clock or WallClock()
+    return previous
+
+
+@contextmanager
+def use_clock(clock: Clock) -> Iterator[Clock]:
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
+
+
+__all__ = ["Clock", "SimulatedClock", "WallClock", "get_clock", "set_clock", "use_clock"]
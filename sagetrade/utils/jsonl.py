@@ -0,0 +1,154 @@
+"""Cheap reads of append-only JSONL files.
+
+`tail_jsonl` decodes only the last N rows by scanning backwards from EOF in
+fixed-size blocks. `JsonlFollower` remembers a byte offset so repeated polls
+of a growing file only parse the rows appended since the previous poll.
+
+Blank and malformed lines are skipped (and do not count towards N), matching
+the `load_jsonl` helpers this replaces. A trailing line without a newline is
+treated as still being written: `tail_jsonl` tries to decode it, the follower
+leaves it for the next poll.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+BLOCK_SIZE = 64 * 1024
+
+
+def _decode(line: bytes) -> Optional[Dict[str, Any]]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return json.loads(line)
+    except Exception:
+        return None
+
+
+def _reverse_lines(f: Any, end: int, block_size: int) -> Iterator[bytes]:
+    """Yield raw lines of `f[:end]` from last to first."""
+    pos = end
+    tail = b""
+    while pos > 0:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        chunk = f.read(step) + tail
+        lines = chunk.split(b"\n")
+        # The first piece may continue in the previous block.
+        tail = lines[0]
+        for line in reversed(lines[1:]):
+            yield line
+    yield tail
+
+
+def tail_jsonl(path: str | Path, n: int, block_size: int = BLOCK_SIZE) -> List[Dict[str, Any]]:
+    """Return the last `n` decodable rows of a JSONL file (oldest first).
+
+    Only the blocks holding those rows are read. A missing file yields [].
+    """
+    if n <= 0:
+        return []
+    rows: List[Dict[str, Any]] = []
+    try:
+        with open(path, "rb") as f:
+            end = f.seek(0, os.SEEK_END)
+            for line in _reverse_lines(f, end, block_size):
+                row = _decode(line)
+                if row is None:
+                    continue
+                rows.append(row)
+                if len(rows) >= n:
+                    break
+    except FileNotFoundError:
+        return []
+    rows.reverse()
+    return rows
+
+
+class JsonlFollower:
+    """Incrementally read rows appended to a JSONL file.
+
+    `poll()` returns rows completed since the last call. If the file shrinks
+    (truncated or replaced by a rotation) the follower starts over from the
+    beginning.
+    """
+
+    def __init__(self, path: str | Path, from_end: bool = False) -> None:
+        self.path = str(path)
+        self.offset = 0
+        if from_end:
+            try:
+                self.offset = self._complete_end(os.path.getsize(self.path))
+            except OSError:
+                self.offset = 0
+
+    def _complete_end(self, size: int) -> int:
+        """Byte offset just past the last newline at or before `size`."""
+        with open(self.path, "rb") as f:
+            pos = size
+            while pos > 0:
+                step = min(BLOCK_SIZE, pos)
+                pos -= step
+                f.seek(pos)
+                idx = f.read(step).rfind(b"\n")
+                if idx >= 0:
+                    return pos + idx + 1
+        return 0
+
+    def read_tail(self, n: int) -> List[Dict[str, Any]]:
+        """Return the last `n` complete rows (all of them if n <= 0) and continue following from there."""
+        if n <= 0:
+            self.offset = 0
+            return self.poll()
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            self.offset = 0
+            return []
+        end = self._complete_end(size)
+        rows: List[Dict[str, Any]] = []
+        if n > 0 and end > 0:
+            with open(self.path, "rb") as f:
+                for line in _reverse_lines(f, end, BLOCK_SIZE):
+                    row = _decode(line)
+                    if row is None:
+                        continue
+                    rows.append(row)
+                    if len(rows) >= n:
+                        break
+            rows.reverse()
+        self.offset = end
+        return rows
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Return rows appended since the previous call (complete lines only)."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return []
+        if size < self.offset:
+            self.offset = 0
+        if size == self.offset:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            return []
+        self.offset += cut + 1
+        rows: List[Dict[str, Any]] = []
+        for line in data[:cut].split(b"\n"):
+            row = _decode(line)
+            if row is not None:
+                rows.append(row)
+        return rows
+
+
+__all__ = ["JsonlFollower", "tail_jsonl"]
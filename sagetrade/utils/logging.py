@@ -8,11 +8,20 @@ from logging import Logger
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from sagetrade.utils.clock import WallClock, get_clock
 from sagetrade.utils.config import get_settings
 
 
 def _now_iso() -> str:
-    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(get_clock().time()))
+
+
+def _clock_converter(secs: Optional[float] = None) -> time.struct_time:
+    """`logging.Formatter.converter` that follows a simulated clock when one is installed."""
+    clock = get_clock()
+    if isinstance(clock, WallClock) and secs is not None:
+        return time.gmtime(secs)
+    return time.gmtime(clock.time())
 
 
 def setup_logging(level: int = logging.INFO, *, log_to_file: bool = True) -> None:
@@ -31,13 +40,16 @@ def setup_logging(level: int = logging.INFO, *, log_to_file: bool = True) -> Non
 
     handlers: list[logging.Handler] = []
 
+    formatter = logging.Formatter(fmt=fmt, datefmt=datefmt)
+    formatter.converter = _clock_converter  # type: ignore[assignment]
+
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter(fmt=fmt, datefmt=datefmt))
+    console_handler.setFormatter(formatter)
     handlers.append(console_handler)
 
     if log_to_file:
         file_handler = logging.FileHandler(logs_dir / "sagesmarttrade.log", encoding="utf-8")
-        file_handler.setFormatter(logging.Formatter(fmt=fmt, datefmt=datefmt))
+        file_handler.setFormatter(formatter)
         handlers.append(file_handler)
 
     logging.basicConfig(level=level, handlers=handlers)
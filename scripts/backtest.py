@@ -2,16 +2,12 @@
 import argparse
 import sys
 from pathlib import Path
-from typing import List
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from sagetrade.backtest.data_loader import load_jsonl
-from sagetrade.backtest.report import compute_metrics, summarize_by_strategy, summarize_by_symbol
-from sagetrade.backtest.runner import run_backtest
-from sagetrade.backtest.trade_log import TradeLog
+from sagetrade.backtest.universe import run_universe_backtest
 from sagetrade.utils.logging import setup_logging
 
 
@@ -23,6 +19,18 @@ def main() -> int:
     parser.add_argument("--market-dir", default="data/market", help="Base directory for market data.")
     parser.add_argument("--text-file", default=None, help="Path to news/text JSONL (optional).")
     parser.add_argument("--out-dir", default="reports", help="Output directory for reports.")
+    parser.add_argument(
+        "--engine",
+        choices=["loop", "vector"],
+        default="loop",
+        help="Backtest engine: per-bar loop (run_backtest) or columnar VectorBacktestEngine.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for multi-symbol runs (default: CPU count, 1 = in-process).",
+    )
     args = parser.parse_args()
 
     setup_logging()
@@ -34,36 +42,27 @@ def main() -> int:
     if not base.exists():
         raise SystemExit(f"Market dir not found: {base}")
 
-    news_items = []
-    if args.text_file:
-        news_items = load_jsonl(args.text_file, limit=None)
-
-    combined_log = TradeLog()
-
-    for sym in symbols:
-        day_dirs: List[Path] = sorted([p for p in base.glob("*") if p.is_dir()])
-        if not day_dirs:
-            print(f"[{sym}] no day dirs under {base}")
-            continue
-        latest = day_dirs[-1]
-        market_path = latest / f"{sym}.jsonl"
-        bars = load_jsonl(market_path, limit=None)
-        if not bars:
-            print(f"[{sym}] no bars at {market_path}")
-            continue
-
-        log = run_backtest(sym, bars, news_items, initial_equity=args.initial_equity, window=args.window)
-        for t in log.trades:
-            combined_log.add_trade(t)
-
+    result = run_universe_backtest(
+        symbols,
+        market_dir=base,
+        text_file=args.text_file,
+        initial_equity=args.initial_equity,
+        window=args.window,
+        engine=args.engine,
+        max_workers=args.workers,
+    )
+    for sym, err in result.errors.items():
+        print(f"[{sym}] skipped: {err}")
+
+    combined_log = result.trade_log
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
     trades_csv = out_dir / "trades.csv"
     combined_log.to_csv(trades_csv)
 
-    metrics = compute_metrics(combined_log.trades, args.initial_equity)
-    strat_summary = summarize_by_strategy(combined_log.trades)
-    sym_summary = summarize_by_symbol(combined_log.trades)
+    metrics = result.metrics
+    strat_summary = result.by_strategy
+    sym_summary = result.by_symbol
 
     # Write simple summaries
     with (out_dir / "summary.txt").open("w", encoding="utf-8") as f:
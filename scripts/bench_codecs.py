@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Compare message codecs: encode/decode time per message and payload size."""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sagetrade.messaging.codec import available_codecs, get_codec
+
+
+SAMPLES = {
+    "bar": {
+        "symbol": "BTCUSD",
+        "ts": 1735689600.0,
+        "o": 42011.25,
+        "h": 42050.5,
+        "l": 41990.0,
+        "c": 42033.75,
+        "v": 12.3456,
+    },
+    "news": {
+        "source": "rss",
+        "ts": 1735689600.0,
+        "title": "Central bank holds rates steady, signals cuts later this year",
+        "summary": "Policy makers kept the benchmark rate unchanged and pointed to easing inflation. " * 3,
+        "url": "https://example.com/markets/central-bank-holds-rates",
+        "lang": "en",
+    },
+}
+
+
+def bench(codec_name: str, payload: dict, n: int) -> dict:
+    codec = get_codec(codec_name)
+    encoded = codec.encode(payload)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        codec.encode(payload)
+    t1 = time.perf_counter()
+    for _ in range(n):
+        codec.decode(encoded)
+    t2 = time.perf_counter()
+    return {
+        "encode_us": (t1 - t0) / n * 1e6,
+        "decode_us": (t2 - t1) / n * 1e6,
+        "bytes": len(encoded),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=100_000, help="Iterations per codec and sample.")
+    args = parser.parse_args()
+
+    codecs = available_codecs()
+    print(f"codecs available: {', '.join(codecs)}")
+    print(f"{'sample':<6} {'codec':<8} {'encode us':>10} {'decode us':>10} {'bytes':>6}")
+    for sample, payload in SAMPLES.items():
+        for name in codecs:
+            r = bench(name, payload, args.n)
+            print(f"{sample:<6} {name:<8} {r['encode_us']:>10.3f} {r['decode_us']:>10.3f} {r['bytes']:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
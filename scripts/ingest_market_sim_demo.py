@@ -19,18 +19,30 @@ def main():
     parser.add_argument("--interval", type=float, default=0.05, help="seconds between bars")
     parser.add_argument("--publish", action="store_true")
     parser.add_argument("--store", action="store_true")
+    parser.add_argument(
+        "--storage-backend",
+        choices=["jsonl", "columnar"],
+        default="jsonl",
+        help="MarketStorage backend used with --store.",
+    )
     args = parser.parse_args()
 
     fetcher = SimulatedMarketFetcher(symbol=args.symbol)
     q = build_queue_from_env() if args.publish else None
-    storage = MarketStorage() if args.store else None
-
-    for bar in fetcher.stream(interval_sec=args.interval):
-        if q:
-            q.publish("market.bars", bar)
+    storage = MarketStorage(backend=args.storage_backend) if args.store else None
+
+    try:
+        for bar in fetcher.stream(interval_sec=args.interval):
+            if q:
+                q.publish("market.bars", bar)
+            if storage:
+                storage.write_bar(args.symbol, bar)
+            print("bar", bar["symbol"], bar["c"])  # brief output
+    except KeyboardInterrupt:
+        pass
+    finally:
         if storage:
-            storage.write_bar(args.symbol, bar)
-        print("bar", bar["symbol"], bar["c"])  # brief output
+            storage.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sagetrade.backtest.param_search import run_param_search_for_strategy
+from sagetrade.utils.logging import setup_logging
+
+
+DEFAULT_GRIDS = {
+    "news_quick_trade": {
+        "min_impact_score": [0.2, 0.3, 0.4],
+        "min_abs_sentiment": [0.15, 0.2, 0.25],
+        "min_confidence": [0.2, 0.3],
+        "require_high_vol_regime": [True, False],
+    },
+    "trend_follow": {
+        "rsi_long_min": [45.0, 50.0, 55.0],
+        "rsi_long_max": [65.0, 70.0, 75.0],
+        "rsi_short_min": [25.0, 30.0, 35.0],
+        "rsi_short_max": [45.0, 50.0, 55.0],
+        "min_confidence": [0.05, 0.1, 0.2],
+    },
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Grid-search strategy parameters over stored JSONL bars.")
+    parser.add_argument("--strategy", default="trend_follow", choices=sorted(DEFAULT_GRIDS.keys()))
+    parser.add_argument("--symbols", default="BTCUSD", help="Comma-separated list of symbols.")
+    parser.add_argument("--grid", default=None, help="JSON file with {param: [values]} (defaults to a built-in grid).")
+    parser.add_argument("--window", type=int, default=20, help="Window size for quant signals.")
+    parser.add_argument("--initial-equity", type=float, default=10_000.0, help="Starting equity.")
+    parser.add_argument("--market-dir", default="data/market", help="Base directory for market data.")
+    parser.add_argument("--day", default=None, help="Day directory (YYYY-MM-DD); defaults to the latest.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--out", default=None, help="Output table (.csv or .parquet).")
+    args = parser.parse_args()
+
+    # Per-decision INFO logs from thousands of backtests dominate runtime; keep warnings only.
+    setup_logging(logging.WARNING)
+    symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
+    if not symbols:
+        raise SystemExit("No symbols provided.")
+
+    grid = DEFAULT_GRIDS[args.strategy]
+    if args.grid:
+        grid = json.loads(Path(args.grid).read_text(encoding="utf-8"))
+
+    out = args.out or f"reports/optimize/{args.strategy}_results.csv"
+    results = run_param_search_for_strategy(
+        args.strategy,
+        grid,
+        symbols,
+        market_dir=args.market_dir,
+        day=args.day,
+        initial_equity=args.initial_equity,
+        window=args.window,
+        out_path=out,
+        max_workers=args.workers,
+    )
+
+    print(f"Parameter search finished. Combinations: {len(results)}")
+    print(f"- results: {out}")
+    if not results.empty:
+        print("Top 5:")
+        print(results.head(5).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
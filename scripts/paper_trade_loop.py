@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import argparse
 import glob
-import json
 import os
 import sys
 import time
@@ -12,33 +11,20 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from sagetool.kill_switch import is_enabled as kill_switch_enabled
 from sagetrade.execution.broker_factory import build_broker
+from sagetrade.execution.paper_engine import BarOutcome, PaperTradingEngine
+from sagetrade.messaging.partition import assign_partitions
+from sagetrade.messaging.queue import build_queue_from_env
 from sagetrade.risk.manager import RiskManager
-from sagetrade.signals.aggregator import aggregate
-from sagetrade.signals.nlp import get_signals as get_nlp_signals
-from sagetrade.signals.quant import get_signals_from_bars
+from sagetrade.signals.entities import EntityIndex
+from sagetrade.signals.nlp_cache import NLPWindowAggregator
+from sagetrade.signals.nlp_stream import NewsSignalAggregator
 from sagetrade.strategy.registry import StrategyManager
+from sagetrade.utils.jsonl import JsonlFollower
 from sagetrade.utils.logging import log_event
 
-
-def load_jsonl(path: str, limit: int = 0) -> List[dict]:
-    rows: List[dict] = []
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    rows.append(json.loads(line))
-                except Exception:
-                    continue
-    except FileNotFoundError:
-        return []
-    if limit > 0:
-        return rows[-limit:]
-    return rows
+# Upper bound on news items held for the market-wide NLP signal.
+NEWS_MAX_ITEMS = 50_000
 
 
 def find_latest_day_dir(base: str) -> str:
@@ -58,7 +44,7 @@ def main() -> int:
         "--sleep-sec",
         type=float,
         default=5.0,
-        help="Seconds to sleep between iterations.",
+        help="Seconds between file polls (--source files).",
     )
     parser.add_argument(
         "--account-id",
@@ -69,8 +55,58 @@ def main() -> int:
         "--bars-limit",
         type=int,
         default=500,
-        help="Max number of recent bars to use per symbol.",
+        help="Max number of recent bars to use per symbol; 0 = every bar of the current file.",
+    )
+    parser.add_argument(
+        "--source",
+        choices=["files", "queue"],
+        default="files",
+        help="Bar source: follow data/market JSONL files, or subscribe to the message queue (MSG_BACKEND).",
+    )
+    parser.add_argument("--topic", default="market.bars", help="Queue topic for --source queue.")
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        default=0,
+        help="Partition count of --topic (as in MSG_PARTITIONS); 0 = unpartitioned.",
+    )
+    parser.add_argument(
+        "--news-window-sec",
+        type=float,
+        default=0.0,
+        help=(
+            "Sliding window for NLP signals in seconds; 0 = the items of the current day's text file only "
+            "(reset when the text file rolls over to a new day)."
+        ),
+    )
+    parser.add_argument(
+        "--per-symbol-news",
+        action="store_true",
+        help=(
+            "Link news to symbols and use each symbol's own NLP signal. Company names come from the `name` "
+            "fields of config/universe.json, written by scripts/update_universe_from_alpaca.py; until that "
+            "has been rerun only tickers and cashtags match."
+        ),
     )
+    parser.add_argument(
+        "--news-half-life-sec",
+        type=float,
+        default=0.0,
+        help="If > 0, also consume --news-topic from the queue into time-decayed per-symbol NLP state.",
+    )
+    parser.add_argument("--news-topic", default="news.rss", help="Queue topic with news items.")
+    parser.add_argument(
+        "--news-checkpoint",
+        default="runtime/news_state.json",
+        help="Checkpoint file for the decayed news state.",
+    )
+    parser.add_argument(
+        "--timeframes",
+        default="",
+        help="Comma-separated higher timeframes to resample bars into (e.g. 5m,15m,1h).",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Number of workers sharing the partitions.")
+    parser.add_argument("--worker-index", type=int, default=0, help="This worker's index in [0, --workers).")
     args = parser.parse_args()
 
     symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
@@ -88,109 +124,124 @@ def main() -> int:
     if not os.path.exists(text_path):
         raise SystemExit(f"Missing text file: {text_path}")
 
-    news_items = load_jsonl(text_path)
+    # NLP signals are kept incrementally: items are scored once (cached by
+    # content hash) and only newly appended news is processed on refresh.
+    news_follower = JsonlFollower(text_path)
+    nlp_agg = NLPWindowAggregator("market", window_sec=args.news_window_sec or None, max_items=NEWS_MAX_ITEMS)
+    news_items = news_follower.poll()
     if not news_items:
         raise SystemExit(f"No news items found in {text_path}")
-
-    # NLP signals remain relatively stable over the recent window; compute once.
-    nlp_sig = get_nlp_signals("market", news_items)
+    entity_index = EntityIndex.from_universe(symbols=symbols) if args.per_symbol_news else None
 
     risk = RiskManager()
     broker = build_broker()
     manager = StrategyManager()
-
-    log_event(
-        "paper_trade_loop_started",
+    engine = PaperTradingEngine(
+        broker,
+        risk,
+        manager,
         symbols=symbols,
-        account_id=args.account_id,
         window=args.window,
+        bars_limit=args.bars_limit,
+        timeframes=[tf.strip() for tf in args.timeframes.split(",") if tf.strip()] or None,
     )
-    print(f"Paper-trade loop started for symbols={symbols}, account_id={args.account_id}. Press Ctrl+C to stop.")
 
-    try:
-        while True:
-            if kill_switch_enabled():
-                print("Kill-switch ENABLED: skipping new trades this iteration.")
-            market_day_dir = find_latest_day_dir(os.path.join("data", "market"))
-            if not market_day_dir:
-                print("No market day directory found under data/market; sleeping...")
-                time.sleep(args.sleep_sec)
-                continue
-
-            price_by_symbol: Dict[str, float] = {}
-
-            for symbol in symbols:
-                market_path = os.path.join(market_day_dir, f"{symbol}.jsonl")
-                bars = load_jsonl(market_path, limit=args.bars_limit)
-                if not bars:
-                    print(f"[{symbol}] no bars found at {market_path}; skipping.")
-                    continue
-
-                current_price = float(bars[-1]["c"])
-                price_by_symbol[symbol] = current_price
-
-                if len(bars) < args.window:
-                    print(f"[{symbol}] not enough bars for window={args.window}; got={len(bars)}.")
-                    continue
-
-                # Do not open new trades if there is already open exposure for this symbol.
-                if risk.state.open_notional_by_symbol.get(symbol, 0.0) > 0.0:
-                    print(f"[{symbol}] open exposure exists, skipping new entries this iteration.")
-                    continue
-
-                q_sig = get_signals_from_bars(symbol, bars, window=args.window)
-                comp = aggregate(symbol, q_sig, nlp_sig)
-
-                print(f"[{symbol}] Composite signal: {comp}")
-
-                if kill_switch_enabled():
-                    continue
-
-                strategies = manager.select_for_signal(comp)
-                print(f"[{symbol}] Active strategies:", [s.name for s in strategies])
-
-                for strat in strategies:
-                    decision = strat.on_new_signal(comp)
-                    if decision is None:
-                        print(f"[{symbol}] {strat.name}: no trade decision.")
-                        continue
-
-                    allowed, reason = risk.can_open(decision, current_price)
-                    if not allowed:
-                        print(f"[{symbol}] {strat.name}: BLOCKED by risk manager ({reason}).")
-                        continue
-
-                    order, position = broker.execute_decision(decision, current_price)
-                    risk.on_open(decision, current_price)
-                    print(f"[{symbol}] {strat.name}: ORDER -> {order}")
-                    print(f"[{symbol}] {strat.name}: POSITION -> {position}")
-
-            # Evaluate TP/SL across all symbols using current prices.
-            if price_by_symbol:
-                closed_map = broker.check_tp_sl(price_by_symbol)
-                for pos_id, (closed, notional) in closed_map.items():
-                    risk.on_close(closed.symbol, notional, closed.realized_pnl)
-                    print(f"[CLOSE] {pos_id}: {closed}")
-
-            if hasattr(broker, "summary"):
-                summary = broker.summary()
-                # Synchronize risk state with broker account summary for equity/PnL.
-                risk.state.equity = summary.get("equity", risk.state.equity)
-                risk.state.realized_pnl = summary.get("realized_pnl", risk.state.realized_pnl)
-            else:
-                summary = {"equity": risk.state.equity, "realized_pnl": risk.state.realized_pnl}
-
-            print("Risk state:", risk.state)
-            print("Broker summary:", summary)
+    def refresh_nlp(new_items: List[dict]) -> None:
+        nlp_agg.update(new_items)
+        engine.set_nlp(nlp_agg.signals())
+        if entity_index is not None:
+            # Only symbols mentioned by the new items are recomputed.
+            for sym in entity_index.update(new_items) & set(symbols):
+                engine.set_nlp(entity_index.signals(sym), symbol=sym)
+
+    refresh_nlp(news_items)
+
+    news_stream = None
+    if args.news_half_life_sec > 0:
+        news_stream = NewsSignalAggregator(
+            args.news_half_life_sec,
+            entity_index=entity_index or EntityIndex.from_universe(symbols=symbols),
+            checkpoint_path=args.news_checkpoint,
+        )
+        if not news_stream.load():
+            news_stream.update(news_items)
+        news_stream.start(build_queue_from_env(), [args.news_topic])
+        engine.news = news_stream
+
+    def report(out: BarOutcome) -> None:
+        for pos_id, (closed, _notional) in (out.closed or {}).items():
+            print(f"[CLOSE] {pos_id}: {closed}")
+        if out.signal is not None:
+            print(f"[{out.symbol}] Composite signal: {out.signal}")
+        for name, order, position in out.opened or []:
+            print(f"[{out.symbol}] {name}: ORDER -> {order}")
+            print(f"[{out.symbol}] {name}: POSITION -> {position}")
+        if out.closed or out.opened:
             log_event(
                 "paper_trade_loop_iteration",
                 account_id=args.account_id,
                 equity=risk.state.equity,
                 realized_pnl=risk.state.realized_pnl,
                 open_trades=risk.state.open_trades,
+                latency_ms=out.latency_ms,
             )
-            time.sleep(args.sleep_sec)
+
+    log_event(
+        "paper_trade_loop_started",
+        symbols=symbols,
+        account_id=args.account_id,
+        window=args.window,
+        source=args.source,
+    )
+    print(f"Paper-trade loop started for symbols={symbols}, account_id={args.account_id}. Press Ctrl+C to stop.")
+
+    try:
+        if args.source == "queue":
+            # Event-driven: every bar published on market.bars is handled as it arrives.
+            claimed = None
+            if args.partitions > 1:
+                claimed = assign_partitions(args.worker_index, args.workers, args.partitions)
+                print(f"Claimed partitions {claimed} of {args.topic}.")
+            engine.run(build_queue_from_env(), topic=args.topic, on_outcome=report, partitions=claimed)
+        else:
+            # Follow the JSONL files written by the ingestors; only newly appended
+            # bars are parsed and each one is handed to the engine.
+            followers: Dict[str, JsonlFollower] = {}
+            while True:
+                market_day_dir = find_latest_day_dir(os.path.join("data", "market"))
+                if not market_day_dir:
+                    print("No market day directory found under data/market; sleeping...")
+                    time.sleep(args.sleep_sec)
+                    continue
+                text_day_dir = find_latest_day_dir(os.path.join("data", "text")) or text_day_dir
+                text_path = os.path.join(text_day_dir, "rss.jsonl")
+                if text_path != news_follower.path:
+                    news_follower = JsonlFollower(text_path)
+                    if not args.news_window_sec:
+                        nlp_agg.clear()
+                refresh_nlp(news_follower.poll())
+                for symbol in symbols:
+                    market_path = os.path.join(market_day_dir, f"{symbol}.jsonl")
+                    follower = followers.get(symbol)
+                    if follower is None or follower.path != market_path:
+                        follower = JsonlFollower(market_path)
+                        followers[symbol] = follower
+                        history = follower.read_tail(args.bars_limit)
+                        if not history:
+                            print(f"[{symbol}] no bars found at {market_path}; waiting.")
+                            continue
+                        engine.warmup(symbol, history[:-1])
+                        new_bars = history[-1:]
+                    else:
+                        new_bars = follower.poll()
+                    for bar in new_bars:
+                        out = engine.on_bar(bar, symbol=symbol)
+                        if out is not None:
+                            report(out)
+                time.sleep(args.sleep_sec)
     except KeyboardInterrupt:
+        if news_stream is not None:
+            news_stream.stop()  # joins the consumer thread, which checkpoints on exit
         print("\nPaper-trade loop stopped by user.")
         log_event("paper_trade_loop_stopped", account_id=args.account_id)
     return 0
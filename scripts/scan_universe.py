@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+from itertools import groupby
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sagetrade.replay.replay_engine import iter_merged, list_day_dirs
+from sagetrade.signals.universe_matrix import UniverseSignalMatrix
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cross-sectional quant scan over stored market bars.")
+    parser.add_argument("--market-dir", default="data/market", help="Base directory for market data.")
+    parser.add_argument("--day", default=None, help="Day to scan (YYYY-MM-DD, default: latest).")
+    parser.add_argument("--window", type=int, default=20)
+    parser.add_argument("--top", type=int, default=10, help="Symbols to list per ranking.")
+    args = parser.parse_args()
+
+    day_dirs = list_day_dirs(args.market_dir, args.day, args.day)
+    if not day_dirs:
+        raise SystemExit(f"No day directories under {args.market_dir}.")
+    day_dir = day_dirs[-1]
+    symbols = sorted(os.path.splitext(f)[0] for f in os.listdir(day_dir) if f.endswith(".jsonl"))
+    if not symbols:
+        raise SystemExit(f"No symbol files in {day_dir}.")
+
+    matrix = UniverseSignalMatrix(symbols, window=args.window)
+    steps = 0
+    for ts, group in groupby(iter_merged([day_dir]), key=lambda item: item[0]):
+        matrix.update({rec["symbol"]: rec for _ts, rec in group}, ts=ts)
+        steps += 1
+
+    snap = matrix.snapshot()
+    if snap is None:
+        raise SystemExit(f"No bars in {day_dir}.")
+    print(f"Scanned {len(symbols)} symbols over {steps} bar times from {day_dir}.")
+    print(f"Most stretched above SMA (zscore): {snap.top('zscore', args.top)}")
+    print(f"Most stretched below SMA (zscore): {snap.top('zscore', args.top, ascending=True)}")
+    print(f"Highest RSI: {snap.top('rsi', args.top)}")
+    print(f"Best last-bar return: {snap.top('ret', args.top)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -53,6 +53,8 @@ def main() -> None:
             "min_qty": min_qty,
             "max_leverage": max_leverage,
             "exchange": a.exchange,
+            # Used by the news entity index to match company names in headlines.
+            "name": a.name,
         }
 
     universe = {"symbols": symbols}
@@ -0,0 +1,79 @@
+"""Parity of the vectorized indicator frame with the scalar `quant` indicators."""
+
+import math
+
+import numpy as np
+import pytest
+
+from sagetrade.signals.quant import atr, ema, get_signals_from_bars, rsi, sma, volatility
+from sagetrade.signals.quant_vector import compute_indicator_frame
+
+
+def _random_bars(n, seed):
+    rng = np.random.default_rng(seed)
+    closes = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    highs = closes * (1.0 + rng.uniform(0.0, 0.01, n))
+    lows = closes * (1.0 - rng.uniform(0.0, 0.01, n))
+    return closes, highs, lows
+
+
+def _same(a, b):
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+
+
+@pytest.mark.parametrize("window", [2, 5, 20, 40])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_columns_match_scalar_indicators(window, seed):
+    closes, highs, lows = _random_bars(120, seed)
+    frame = compute_indicator_frame(closes, highs, lows, window=window)
+    sub = min(14, max(2, window // 2))
+    c, h, lo = closes.tolist(), highs.tolist(), lows.tolist()
+
+    for i in range(len(c)):
+        k = i + 1
+        assert _same(frame.sma[i], sma(c[:k], window)), ("sma", i)
+        assert _same(frame.ema[i], ema(c[:k], window)), ("ema", i)
+        assert _same(frame.rsi[i], rsi(c[:k], sub)), ("rsi", i)
+        assert _same(frame.atr[i], atr(h[:k], lo[:k], c[:k], sub)), ("atr", i)
+        assert _same(frame.volatility[i], volatility(c[:k], window)), ("volatility", i)
+
+
+@pytest.mark.parametrize("window", [5, 20])
+def test_rows_match_get_signals_from_bars(window):
+    closes, highs, lows = _random_bars(80, 7)
+    bars = [{"c": c, "h": h, "l": lo} for c, h, lo in zip(closes, highs, lows)]
+    frame = compute_indicator_frame(closes, highs, lows, window=window)
+
+    for i in range(len(bars)):
+        expected = get_signals_from_bars("X", bars[: i + 1], window=window)
+        row = frame.row(i, "X")
+        for name in ("sma", "ema", "rsi", "atr", "volatility"):
+            assert _same(getattr(row, name), getattr(expected, name)), (name, i)
+        assert row.regime == expected.regime, i
+
+
+def test_warmup_region_is_nan():
+    window = 20
+    sub = min(14, max(2, window // 2))
+    closes, highs, lows = _random_bars(50, 3)
+    frame = compute_indicator_frame(closes, highs, lows, window=window)
+
+    assert np.isnan(frame.sma[: window - 1]).all()
+    assert not np.isnan(frame.sma[window - 1 :]).any()
+    assert np.isnan(frame.volatility[: window - 1]).all()
+    assert np.isnan(frame.rsi[:sub]).all()
+    assert not np.isnan(frame.rsi[sub:]).any()
+    assert np.isnan(frame.atr[: sub - 1]).all()
+    assert not np.isnan(frame.ema).any()
+    assert all(frame.regime_label(i) == "unknown" for i in range(window - 1))
+
+
+def test_flat_series_rsi_is_100():
+    closes = np.full(30, 50.0)
+    frame = compute_indicator_frame(closes, closes, closes, window=10)
+    for i in range(len(closes)):
+        assert _same(frame.rsi[i], rsi(closes[: i + 1].tolist(), 5)), i
+    assert frame.rsi[-1] == 100.0
+    assert frame.volatility[-1] == 0.0
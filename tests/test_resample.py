@@ -0,0 +1,53 @@
+"""Streaming `BarResampler` against the batch `resample_ohlcv`."""
+
+import numpy as np
+import pytest
+
+from sagetrade.signals.quant_vector import resample_ohlcv
+from sagetrade.signals.resample import BarResampler, parse_timeframe
+
+
+def _random_bars(n, seed, step=60.0):
+    rng = np.random.default_rng(seed)
+    closes = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    opens = np.concatenate(([100.0], closes[:-1]))
+    highs = np.maximum(opens, closes) * (1.0 + rng.uniform(0.0, 0.01, n))
+    lows = np.minimum(opens, closes) * (1.0 - rng.uniform(0.0, 0.01, n))
+    vols = rng.integers(1, 100, n).astype(float)
+    # Start mid-bucket and leave a gap so buckets are uneven.
+    ts = 1_700_000_123.0 + step * np.arange(n)
+    ts[n // 2 :] += 7 * step
+    return ts, opens, highs, lows, closes, vols
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_streaming_matches_batch(seed):
+    ts, o, h, lo, c, v = _random_bars(500, seed)
+    timeframes = ("5m", "15m", "1h")
+    rs = BarResampler(timeframes, history=1000)
+    for row in zip(ts, o, h, lo, c, v):
+        rs.update(dict(zip(("ts", "o", "h", "l", "c", "v"), row)), "X")
+    rs.flush()
+
+    for tf in timeframes:
+        expected = resample_ohlcv(ts, o, h, lo, c, v, parse_timeframe(tf))
+        bars = rs.bars("X", tf)
+        assert len(bars) == len(expected[0]), tf
+        for field, col in zip(("ts", "o", "h", "l", "c", "v", "n"), expected):
+            np.testing.assert_allclose([b[field] for b in bars], col, err_msg=f"{tf} {field}")
+
+
+def test_late_bar_is_skipped_for_every_timeframe():
+    rs = BarResampler(("5m", "1h"))
+    for ts, c in ((0, 1.0), (60, 2.0), (360, 3.0), (120, 9.0)):
+        rs.update({"ts": ts, "o": c, "h": c, "l": c, "c": c, "v": 1.0}, "X")
+    assert rs.late_bars == 1
+    rs.flush()
+
+    five = rs.bars("X", "5m")
+    hour = rs.bars("X", "1h")
+    assert [b["v"] for b in five] == [2.0, 1.0]
+    assert len(hour) == 1
+    assert hour[0]["v"] == sum(b["v"] for b in five)
+    assert hour[0]["c"] == 3.0
+    assert hour[0]["h"] == 3.0